@@ -1,9 +1,12 @@
 """Base adapter class with safe copy logic."""
 
+import itertools
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Iterable
 from abc import ABC, abstractmethod
 
+from ask.utils.frontmatter import FENCE, read_frontmatter
+
 
 class BaseAdapter(ABC):
     """Base class for all agent adapters with safe copy behavior."""
@@ -50,23 +53,29 @@ class BaseAdapter(ABC):
         return installed
 
     def _parse_skill_version(self, skill_file: Path) -> str:
-        """Parse version from SKILL.md frontmatter."""
+        """Parse version from SKILL.md frontmatter (the body is never read)."""
+        header = read_frontmatter(skill_file)
+        if header is not None:
+            return self._version_from_lines(header.lines)
+        # No closing fence within MAX_FRONTMATTER_BYTES (or at all): stream the
+        # rest of the file instead, so an oversized or unclosed header still
+        # yields the version a full read would have found.
         try:
-            content = skill_file.read_text(encoding="utf-8")
-            lines = content.splitlines()
-            # Frontmatter must start on the first line
-            if not lines or lines[0].strip() != "---":
-                return "0.0.0"
-                
-            for line in lines[1:]:
-                stripped = line.strip()
-                if stripped == "---":
-                    # End of frontmatter
-                    break
-                if stripped.startswith("version:"):
-                    return stripped.split(":", 1)[1].strip()
-        except Exception:
-            pass
+            with open(skill_file, encoding="utf-8") as f:
+                if f.readline().strip() != FENCE:
+                    return "0.0.0"
+                return self._version_from_lines(
+                    itertools.takewhile(lambda line: line.strip() != FENCE, f)
+                )
+        except (OSError, UnicodeDecodeError):
+            return "0.0.0"
+
+    @staticmethod
+    def _version_from_lines(lines: Iterable[str]) -> str:
+        for line in lines:
+            stripped = line.strip()
+            if stripped.startswith("version:"):
+                return stripped.split(":", 1)[1].strip()
         return "0.0.0"
 
     def install_resources(self, skill: Dict, target_dir: Path, dry_run: bool = False, force: bool = False) -> Dict[str, bool]:
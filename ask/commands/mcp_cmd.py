@@ -9,6 +9,7 @@ import json
 import click
 from rich.console import Console
 
+from ask.utils.eval.scorers import SCORERS
 from ask.utils.provider import search_skills_payload
 
 console = Console()
@@ -78,9 +79,13 @@ def tools(as_json):
 @mcp.command(name="probe")
 @click.argument("query")
 @click.option("--limit", default=5, show_default=True)
-def probe(query, limit):
+@click.option(
+    "--scorer", type=click.Choice(SCORERS), default="tfidf", show_default=True,
+    help="Ranking backend to preview.",
+)
+def probe(query, limit, scorer):
     """Dry-run search_skills locally (no server) to preview what an agent sees."""
-    results = search_skills_payload(query, limit=limit)
+    results = search_skills_payload(query, limit=limit, scorer=scorer)
     if not results:
         console.print("[dim]No matches.[/dim]")
         return
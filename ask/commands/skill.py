@@ -1,14 +1,36 @@
 """Skill management commands - lint, profile, compile."""
 
+import os
+
 import click
 from pathlib import Path
 from rich.console import Console
+from rich.markup import escape
 from rich.table import Table
 
+from ask.utils.eval.index_artifact import corpus_hash, default_index_path, save_index
+from ask.utils.eval.trigger_scorer import build_index
 from ask.utils.filesystem import get_skills_dir
 from ask.utils.skill_registry import get_all_skills
 
 console = Console()
+err_console = Console(stderr=True)
+
+
+def _check_vocab_dir(explicit: bool) -> None:
+    """Fail on an unusable `--vocab-dir`; warn on an unusable configured one."""
+    from ask.utils.token_analyzer import vocab_dir_problem
+
+    problem = vocab_dir_problem()
+    if problem is None:
+        return
+    if explicit:
+        console.print(f"[red]Error:[/red] {escape(problem)}")
+        raise SystemExit(1)
+    err_console.print(
+        f"[yellow]Warning:[/yellow] {escape(problem)}; "
+        "token counts are estimated (~4 characters per token)."
+    )
 
 
 @click.group()
@@ -19,8 +41,21 @@ def skill():
 
 @skill.command()
 @click.option("--strict", is_flag=True, help="Treat warnings as errors")
+@click.option(
+    "--vocab-dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    help="tiktoken cache directory holding the cl100k_base ranks (for offline use).",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=0),
+    default=1,
+    show_default=True,
+    help="Read, tokenize and check skills concurrently (0 = one per CPU core).",
+)
 @click.argument("skill_name", required=False)
-def lint(strict: bool, skill_name: str):
+def lint(strict: bool, vocab_dir: Path, jobs: int, skill_name: str):
     """
     Lint skill files for schema compliance and token limits.
     
@@ -33,12 +68,23 @@ def lint(strict: bool, skill_name: str):
         ask skill lint                    # Lint all skills
         ask skill lint ask-fastapi        # Lint specific skill
         ask skill lint --strict           # Fail on warnings
+        ask skill lint --jobs 0           # Use every CPU core
     """
     try:
-        from ask.utils.token_analyzer import lint_skill, analyze_skill
+        from ask.utils.token_analyzer import (
+            analyze_skills,
+            lint_skill,
+            set_vocab_dir,
+            shared_token_cache,
+        )
     except ImportError:
         console.print("[yellow]Warning:[/yellow] tiktoken not installed. Run: pip install tiktoken")
         return
+    if vocab_dir:
+        set_vocab_dir(vocab_dir)
+    _check_vocab_dir(explicit=bool(vocab_dir))
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
 
     skills_dir = get_skills_dir()
 
@@ -68,23 +114,27 @@ def lint(strict: bool, skill_name: str):
         total = 0
         failed = 0
         
-        for skill_md in sorted(skills_dir.rglob("SKILL.md")):
+        # Each SKILL.md is analyzed once, and only re-tokenized if it changed
+        # since the last lint or profile run.
+        skill_mds = sorted(skills_dir.rglob("SKILL.md"))
+        with shared_token_cache():
+            analyses = analyze_skills(skill_mds, jobs)
+
+        for skill_md, analysis in zip(skill_mds, analyses):
             total += 1
-            passed, messages = lint_skill(skill_md, strict=strict)
-            
+            passed, messages = lint_skill(skill_md, strict=strict, analysis=analysis)
+
             if not passed:
                 all_passed = False
                 failed += 1
                 console.print(f"  [red]✗[/red] {skill_md.parent.name}")
                 for msg in messages:
                     console.print(f"    [dim]{msg}[/dim]")
-            else:
+            elif analysis.get("issues") or analysis.get("status") == "warning":
                 # Only show passing if verbose or has warnings
-                analysis = analyze_skill(skill_md)
-                if analysis.get("issues") or analysis.get("status") == "warning":
-                    console.print(f"  [yellow]–[/yellow] {skill_md.parent.name}")
-                    for msg in messages:
-                        console.print(f"    [dim]{msg}[/dim]")
+                console.print(f"  [yellow]–[/yellow] {skill_md.parent.name}")
+                for msg in messages:
+                    console.print(f"    [dim]{msg}[/dim]")
 
         console.print(f"\n[dim]{total - failed}/{total} passed[/dim]")
 
@@ -96,28 +146,61 @@ def lint(strict: bool, skill_name: str):
 
 @skill.command()
 @click.option("--json", "as_json", is_flag=True, help="Output as JSON")
-def profile(as_json: bool):
+@click.option(
+    "--vocab-dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    help="tiktoken cache directory holding the cl100k_base ranks (for offline use).",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=0),
+    default=1,
+    show_default=True,
+    help="Read, tokenize and check skills concurrently (0 = one per CPU core).",
+)
+@click.argument("skill_name", required=False)
+def profile(as_json: bool, vocab_dir: Path, jobs: int, skill_name: str):
     """
     Generate token usage report for all skills.
     
     Shows token count, status, and distribution across all skills.
-    Useful for identifying optimization targets.
+    Useful for identifying optimization targets. With SKILL_NAME, breaks
+    that skill down by section and code block instead, with the cumulative
+    cost of reading up to each one and the sections that exceed the budget.
     
     Examples:
         ask skill profile
         ask skill profile --json
+        ask skill profile --jobs 0
+        ask skill profile ask-fastapi    # Per-section budget of one skill
     """
     try:
-        from ask.utils.token_analyzer import generate_report
+        from ask.utils.token_analyzer import generate_report, set_vocab_dir
     except ImportError:
         console.print("[yellow]Warning:[/yellow] tiktoken not installed. Run: pip install tiktoken")
         return
+    if vocab_dir:
+        set_vocab_dir(vocab_dir)
+    _check_vocab_dir(explicit=bool(vocab_dir))
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
 
     skills_dir = get_skills_dir()
 
+    if skill_name:
+        skill_md = next(
+            (p for p in skills_dir.rglob("SKILL.md") if p.parent.name == skill_name), None
+        )
+        if skill_md is None:
+            console.print(f"[red]Error:[/red] skill not found: {skill_name}")
+            raise SystemExit(1)
+        _profile_sections(skill_md, as_json)
+        return
+
     console.print("[bold]Token Usage Report[/bold]\n")
     
-    report, summary = generate_report(skills_dir)
+    report, summary = generate_report(skills_dir, workers=jobs)
     
     if as_json:
         import json
@@ -146,6 +229,63 @@ def profile(as_json: bool):
         console.print(f"[dim][green]✓[/green] {summary['ok_count']} ok  [yellow]–[/yellow] {summary['warning_count']} warning  [red]✗[/red] {summary['error_count']} error[/dim]")
 
 
+def _profile_sections(skill_md: Path, as_json: bool):
+    from ask.utils.section_budget import analyze_sections
+    from ask.utils.token_analyzer import _token_limits
+
+    sections = analyze_sections(skill_md)
+    limit_ok, limit_warn = _token_limits(skill_md.parent.name)
+    total = sections[-1].cumulative if sections else 0
+
+    if as_json:
+        import json
+        from dataclasses import asdict
+
+        payload = {
+            "name": skill_md.parent.name,
+            "path": str(skill_md),
+            "limits": {"recommended": limit_ok, "max": limit_warn},
+            "tokens": total,
+            "sections": [asdict(section) for section in sections],
+        }
+        # Raw text: no wrapping of long paths, no markup in section titles.
+        console.print(json.dumps(payload, indent=2), soft_wrap=True, markup=False)
+        return
+
+    console.print(f"[bold]Section Budget[/bold] [dim]{skill_md.parent.name}[/dim]\n")
+    table = Table(show_header=True, header_style="bold", box=None)
+    table.add_column("Line", justify="right", style="dim", width=5)
+    table.add_column("Section", width=36, overflow="fold")
+    table.add_column("Tokens", justify="right", width=7)
+    table.add_column("Cumulative", justify="right", width=10)
+    table.add_column("Status", width=8)
+
+    previous = "ok"
+    for section in sections:
+        title = escape(section.title)
+        if section.kind == "code":
+            title = f"  [dim]code ({title})[/dim]"
+        style = {"ok": "green", "warning": "yellow", "error": "red"}[section.status]
+        mark = {"ok": "✓", "warning": "–", "error": "✗"}[section.status]
+        # Flag the section that pushed the running total over a limit.
+        if section.status != previous:
+            mark += " over"
+            previous = section.status
+        table.add_row(
+            str(section.line),
+            title,
+            str(section.tokens),
+            str(section.cumulative),
+            f"[{style}]{mark}[/{style}]",
+        )
+
+    console.print(table)
+    console.print(
+        f"\n[dim]{total} tokens across {len(sections)} sections · "
+        f"budget {limit_ok} (max {limit_warn})[/dim]"
+    )
+
+
 @skill.command()
 @click.option("--output", "-o", default="skills/manifest.json", help="Output path")
 def compile(output: str):
@@ -153,7 +293,9 @@ def compile(output: str):
     Compile skill metadata into manifest.json for routing.
     
     Generates a lightweight JSON file containing skill names,
-    descriptions, and triggers for orchestrator routing.
+    descriptions, and triggers for orchestrator routing, plus the compiled
+    TF-IDF index (trigger_index.bin, always in the skills directory) used by
+    search and `ask test`.
     
     Examples:
         ask skill compile
@@ -194,4 +336,12 @@ def compile(output: str):
     with open(output_path, "w", encoding="utf-8") as f:
         json.dump(manifest, f, indent=2)
     
+    # The search/audit index goes where `build_index` looks for it (the
+    # skills directory), whatever -o says, so consumers load it instead of
+    # re-tokenizing the library.
+    index_path = default_index_path()
+    index = build_index(skills, use_artifact=False)
+    save_index(index, index_path, corpus_hash(skills))
+    
     console.print(f"[green]✓[/green] Compiled {len(skills)} skills [dim]→ {output_path}[/dim]")
+    console.print(f"[green]✓[/green] Trigger index [dim]→ {index_path}[/dim]")
@@ -8,16 +8,32 @@ Layer 2 — `--behavior` (planned): runs each skill against a live model with an
     LLM-as-judge for real trigger accuracy and output correctness.
 """
 
+import os
+
 import click
 from rich.console import Console
+from rich.markup import escape
 from rich.table import Table
 
+from ask.utils.filesystem import get_skills_dir
 from ask.utils.skill_registry import get_all_skills
-from ask.utils.eval import load_evals, run_trigger_audit
-from ask.utils.eval.trigger_scorer import DEFAULT_COLLISION_MARGIN
+from ask.utils.eval import build_index, load_evals, run_trigger_audit
+from ask.utils.eval.trigger_scorer import (
+    AUDIT_ENGINES,
+    DEFAULT_COLLISION_MARGIN,
+    shared_evals_cache,
+)
+from ask.utils.eval.scorers import SCORERS
 
 console = Console()
 
+# How each --scorer backend is named in the audit banner.
+_SCORER_LABELS = {
+    "tfidf": "TF-IDF",
+    "bm25": "BM25",
+    "trigram": "character-trigram TF-IDF",
+}
+
 
 def _verdict(result) -> str:
     if not result.is_hit:
@@ -27,37 +43,60 @@ def _verdict(result) -> str:
     return "[green]✓ clear[/green]"
 
 
-def _run_trigger_audit(skill_name, margin, as_json):
+def _audit(skills, margin, engine, jobs, changed_since, scorer):
+    if not changed_since:
+        report = run_trigger_audit(
+            skills, margin=margin, engine=engine, workers=jobs, scorer=scorer
+        )
+        return report, None
+    if scorer != "tfidf":
+        raise ValueError("--changed-since only supports the tfidf scorer.")
+    from ask.utils.eval.incremental import run_incremental_audit
+
+    outcome = run_incremental_audit(
+        skills, get_skills_dir(), changed_since, margin=margin, engine=engine, workers=jobs
+    )
+    return outcome.report, outcome
+
+
+def _run_trigger_audit(
+    skill_name, margin, as_json, engine="auto", jobs=1, changed_since=None, scorer="tfidf"
+):
     skills = get_all_skills()
-    if skill_name:
-        skills_with_evals = [s for s in skills if s.get("name") == skill_name]
-        if not skills_with_evals:
-            console.print(f"[red]Error:[/red] skill not found: {skill_name}")
-            raise SystemExit(1)
-        # Score against the WHOLE library so collisions are detected, but only
-        # report prompts owned by the requested skill.
-        report = run_trigger_audit(skills, margin=margin)
-        report.results = [r for r in report.results if r.skill == skill_name]
-    else:
-        report = run_trigger_audit(skills, margin=margin)
-
-    # A tally of un-audited skills is only meaningful for a whole-library run;
-    # in single-skill mode it would just count unrelated skills as noise.
-    if skill_name:
-        uncovered = []
-    else:
-        covered = {r.skill for r in report.results}
-        uncovered = [
-            s["name"]
-            for s in skills
-            if s.get("name") and s["name"] not in covered and not load_evals(s)
-        ]
+    # One evals cache for the audit and the coverage tally below, so each
+    # evals.yaml is parsed at most once (and not at all when unchanged since
+    # the last run).
+    with shared_evals_cache():
+        if skill_name:
+            skills_with_evals = [s for s in skills if s.get("name") == skill_name]
+            if not skills_with_evals:
+                console.print(f"[red]Error:[/red] skill not found: {skill_name}")
+                raise SystemExit(1)
+            # Score against the WHOLE library so collisions are detected, but only
+            # report prompts owned by the requested skill.
+            report, incremental = _audit(skills, margin, engine, jobs, changed_since, scorer)
+            report.results = [r for r in report.results if r.skill == skill_name]
+        else:
+            report, incremental = _audit(skills, margin, engine, jobs, changed_since, scorer)
+
+        # A tally of un-audited skills is only meaningful for a whole-library run;
+        # in single-skill mode it would just count unrelated skills as noise.
+        if skill_name:
+            uncovered = []
+        else:
+            covered = {r.skill for r in report.results}
+            uncovered = [
+                s["name"]
+                for s in skills
+                if s.get("name") and s["name"] not in covered and not load_evals(s)
+            ]
 
     if as_json:
         import json
 
         payload = {
             "kind": "trigger_audit_lexical_prescreen",
+            "scorer": scorer,
             "margin": report.margin,
             "total_prompts": report.total_prompts,
             "clean": len(report.clean),
@@ -65,6 +104,15 @@ def _run_trigger_audit(skill_name, margin, as_json):
             "misses": len(report.misses),
             "collisions": len(report.collisions),
             "uncovered_skills": uncovered,
+            "incremental": None
+            if incremental is None
+            else {
+                "full": incremental.full,
+                "reason": incremental.reason,
+                "changed_skills": incremental.changed_skills,
+                "rescored": incremental.rescored,
+                "reused": incremental.reused,
+            },
             "results": [
                 {
                     "skill": r.skill,
@@ -91,6 +139,17 @@ def _run_trigger_audit(skill_name, margin, as_json):
         console.print(json.dumps(payload, indent=2))
         return report
 
+    if incremental is not None:
+        if incremental.full:
+            console.print(f"[dim]Full audit ({incremental.reason}).[/dim]\n")
+        else:
+            console.print(
+                f"[dim]Incremental audit since {escape(changed_since)}: "
+                f"{len(incremental.changed_skills)} changed skills, "
+                f"{incremental.rescored} prompts re-scored, "
+                f"{incremental.reused} reused.[/dim]\n"
+            )
+
     if report.total_prompts == 0:
         console.print(
             "[yellow]No evals found.[/yellow] Add a "
@@ -101,8 +160,9 @@ def _run_trigger_audit(skill_name, margin, as_json):
 
     console.print("[bold]Trigger Audit[/bold] [dim](Layer 1)[/dim]\n")
     console.print(
-        "[dim]Lexical pre-screen (TF-IDF) — flags skills competing for the same "
-        "prompts.\nThis is a vocabulary proxy, not how a real agent routes. "
+        f"[dim]Lexical pre-screen ({_SCORER_LABELS[scorer]}) — flags skills "
+        "competing for the same prompts.\n"
+        "This is a vocabulary proxy, not how a real agent routes. "
         "Run [cyan]ask test --behavior[/cyan] for live trigger accuracy.[/dim]\n"
     )
 
@@ -144,6 +204,54 @@ def _run_trigger_audit(skill_name, margin, as_json):
     return report
 
 
+# What the --matrix score is for each scorer: always a cosine between skill
+# document vectors, weighted by that scorer.
+_MATRIX_MEASURES = {
+    "tfidf": "TF-IDF cosine between skill documents",
+    "bm25": "cosine between BM25-weighted skill documents",
+    "trigram": "character-trigram TF-IDF cosine between skill documents",
+}
+
+
+def _run_similarity_matrix(skill_name, top, as_json, scorer="tfidf"):
+    from ask.utils.eval.similarity_matrix import EXACT_MAX_SKILLS, top_similar_pairs
+
+    skills = get_all_skills()
+    index = build_index(skills, scorer=scorer)
+    if skill_name and skill_name not in index:
+        console.print(f"[red]Error:[/red] skill not found: {skill_name}")
+        raise SystemExit(1)
+    pairs = top_similar_pairs(index, k=top, skill=skill_name or None)
+    method = "exact" if skill_name or len(index) <= EXACT_MAX_SKILLS else "lsh"
+
+    if as_json:
+        import json
+
+        payload = {
+            "kind": "skill_similarity_matrix",
+            "scorer": scorer,
+            "skills": len(index),
+            "method": method,
+            "pairs": [{"skills": [p.a, p.b], "score": round(p.score, 4)} for p in pairs],
+        }
+        console.print(json.dumps(payload, indent=2))
+        return
+
+    console.print(f"[bold]Skill Similarity[/bold] [dim]({_MATRIX_MEASURES[scorer]})[/dim]\n")
+    if not pairs:
+        console.print("[dim]No overlapping skills found.[/dim]")
+        return
+    table = Table(show_header=True, header_style="bold", box=None)
+    table.add_column("Skill", style="cyan", width=32)
+    table.add_column("Skill", style="cyan", width=32)
+    table.add_column("Similarity", justify="right", width=10)
+    for p in pairs:
+        color = "red" if p.score >= 0.5 else "yellow" if p.score >= 0.25 else "dim"
+        table.add_row(p.a, p.b, f"[{color}]{p.score:.2f}[/{color}]")
+    console.print(table)
+    console.print(f"\n[dim]{len(index)} skills · top {len(pairs)} pairs · {method}[/dim]")
+
+
 @click.command(name="test")
 @click.argument("skill_name", required=False)
 @click.option(
@@ -166,12 +274,68 @@ def _run_trigger_audit(skill_name, margin, as_json):
     help="Cosine margin within which a competing skill counts as a collision.",
 )
 @click.option("--json", "as_json", is_flag=True, help="Emit machine-readable JSON.")
+@click.option(
+    "--engine",
+    type=click.Choice(AUDIT_ENGINES),
+    default="auto",
+    show_default=True,
+    help="Scoring engine: per-prompt Python loop, or batched sparse matrices "
+    "(needs the `audit` extra); auto picks sparse for large audits.",
+)
+@click.option(
+    "--scorer",
+    type=click.Choice(SCORERS),
+    default="tfidf",
+    show_default=True,
+    help="Ranking backend: TF-IDF cosine, BM25, or character-trigram TF-IDF "
+    "(tolerates plurals and typos).",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=0),
+    default=1,
+    show_default=True,
+    help="Worker processes for large audits (0 = one per CPU core).",
+)
+@click.option(
+    "--changed-since",
+    metavar="REF",
+    help="Re-score only prompts affected by skill changes since git REF, "
+    "reusing the previous audit's results for the rest.",
+)
+@click.option(
+    "--matrix",
+    is_flag=True,
+    help="Rank skill pairs by document similarity instead of auditing evals "
+    "(exact for small libraries, MinHash/LSH for large ones).",
+)
+@click.option(
+    "--top",
+    type=click.IntRange(min=1),
+    default=20,
+    show_default=True,
+    help="Number of pairs to report with --matrix.",
+)
 @click.option(
     "--strict",
     is_flag=True,
     help="Exit non-zero if any collision or miss is found (for CI).",
 )
-def test(skill_name, mode_triggers, mode_behavior, margin, as_json, strict):
+def test(
+    skill_name,
+    mode_triggers,
+    mode_behavior,
+    margin,
+    as_json,
+    engine,
+    scorer,
+    jobs,
+    changed_since,
+    matrix,
+    top,
+    strict,
+):
     """
     Evaluate skills.
 
@@ -190,6 +354,10 @@ def test(skill_name, mode_triggers, mode_behavior, margin, as_json, strict):
         ask test ask-laravel-architect # audit one skill
         ask test --strict              # fail CI on collisions/misses
         ask test --json                # machine-readable output
+        ask test --jobs 0              # shard a big audit across all cores
+        ask test --changed-since main  # re-score only what a branch touched
+        ask test --matrix --top 50     # most similar skill pairs, evals or not
+        ask test --scorer bm25         # rank with BM25 instead of TF-IDF
     """
     if mode_behavior:
         console.print(
@@ -199,7 +367,19 @@ def test(skill_name, mode_triggers, mode_behavior, margin, as_json, strict):
         )
         raise SystemExit(2)
 
-    report = _run_trigger_audit(skill_name, margin, as_json)
+    if matrix:
+        _run_similarity_matrix(skill_name, top, as_json, scorer)
+        return
+
+    try:
+        if jobs == 0:
+            jobs = os.cpu_count() or 1
+        report = _run_trigger_audit(
+            skill_name, margin, as_json, engine, jobs, changed_since, scorer
+        )
+    except (ImportError, RuntimeError, ValueError) as exc:
+        console.print(f"[red]Error:[/red] {escape(str(exc))}")
+        raise SystemExit(1)
 
     if strict and (report.collisions or report.misses):
         raise SystemExit(1)
@@ -9,6 +9,7 @@ Tools:
     list_skills()        -> full catalog (metadata only)
     search_skills(query) -> top lexical matches with relevance scores
     get_skill(name)      -> a skill's full instruction body for inline use
+    cache_stats()        -> hit/miss counters of the query caches
 
 The `mcp` SDK is an optional dependency (`pip install "agent-skill-kit[mcp]"`).
 """
@@ -18,6 +19,8 @@ from __future__ import annotations
 from typing import List, Dict, Optional
 
 from ask.utils.provider import (
+    cache_stats_payload,
+    enable_live_catalog,
     list_skills_payload,
     search_skills_payload,
     get_skill_payload,
@@ -30,6 +33,7 @@ TOOL_SPECS = [
     {"name": "list_skills", "args": [], "summary": "Full skill catalog (metadata only)."},
     {"name": "search_skills", "args": ["query", "limit=5"], "summary": "Top lexical matches with scores."},
     {"name": "get_skill", "args": ["name"], "summary": "A skill's full instruction body."},
+    {"name": "cache_stats", "args": [], "summary": "Hit/miss counters of the query caches."},
 ]
 
 
@@ -71,9 +75,23 @@ def build_server(name: str = "agent-skill-kit"):
         """
         return get_skill_payload(name)
 
+    @server.tool()
+    def cache_stats() -> Dict:
+        """Report hit/miss counters and sizes of the server's query caches.
+
+        Diagnostic only; agents do not need it to find or use skills.
+        """
+        return cache_stats_payload()
+
     return server
 
 
 def serve(transport: str = "stdio") -> None:
-    """Run the MCP server (blocking). Defaults to stdio transport."""
-    build_server().run(transport=transport)
+    """Run the MCP server (blocking). Defaults to stdio transport.
+
+    The server is long-lived, so it reads through a live catalog that tracks
+    skill edits incrementally instead of rescanning the library per call.
+    """
+    server = build_server()
+    enable_live_catalog()
+    server.run(transport=transport)
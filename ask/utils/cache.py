@@ -0,0 +1,329 @@
+"""On-disk caches shared by the CLI and the MCP server.
+
+Everything lives under `~/.agents/cache/` (next to the `remotes/` checkouts
+from `ask install`). Caches are pure accelerators: a missing, corrupt or
+version-mismatched file is silently treated as empty, and every writer goes
+through an atomic rename so a crashed run can never leave a half-written file
+behind for the next one.
+
+Set `ASK_CACHE_DIR` to relocate the cache, or `ASK_NO_CACHE=1` to bypass it.
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+CATALOG_CACHE_VERSION = 3
+
+# Files modified this recently are not persisted: a second write within the
+# filesystem's timestamp granularity could leave mtime/size unchanged, so the
+# stamp would vouch for stale content ("racy" entries, as git calls them).
+RACY_WINDOW_NS = 2_000_000_000
+
+
+def get_ask_cache_dir() -> Path:
+    """Get the root cache directory (honours ASK_CACHE_DIR)."""
+    override = os.environ.get("ASK_CACHE_DIR")
+    if override:
+        return Path(override)
+    return Path.home() / ".agents" / "cache"
+
+
+def cache_enabled() -> bool:
+    """False when the user opted out with ASK_NO_CACHE."""
+    return os.environ.get("ASK_NO_CACHE", "").strip().lower() in ("", "0", "false", "no")
+
+
+def file_stamp(st: Optional[os.stat_result]) -> Optional[List[int]]:
+    """Reduce a stat result to the fields that invalidate a cache entry."""
+    if st is None:
+        return None
+    return [st.st_mtime_ns, st.st_size, st.st_ino]
+
+
+def stat_or_none(path: Path) -> Optional[os.stat_result]:
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+
+def read_json(path: Path) -> Optional[Any]:
+    """Load a JSON cache file, or None if it is missing or unreadable."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_json_atomic(path: Path, data: Any) -> None:
+    """Write JSON via a temp file + rename. Failures are swallowed (cache only)."""
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp, path)
+    except (OSError, TypeError, ValueError):
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+
+
+def _round_trips(value: Any) -> bool:
+    """True if `value` survives JSON unchanged (YAML dates or int keys do not)."""
+    try:
+        return json.loads(json.dumps(value)) == value
+    except (TypeError, ValueError):
+        return False
+
+
+def _catalog_key(skills_dir: Path) -> str:
+    return hashlib.sha1(str(Path(skills_dir).resolve()).encode("utf-8")).hexdigest()[:16]
+
+
+def name_index_path(skills_dir: Path) -> Path:
+    """Where the name -> skill path index for `skills_dir` is persisted."""
+    return get_ask_cache_dir() / "catalog" / f"{_catalog_key(skills_dir)}.index.json"
+
+
+def load_name_index(skills_dir: Path) -> Dict[str, str]:
+    """Load the persisted name -> skill path index (empty if absent/disabled)."""
+    if not cache_enabled():
+        return {}
+    data = read_json(name_index_path(skills_dir))
+    if (
+        isinstance(data, dict)
+        and data.get("version") == CATALOG_CACHE_VERSION
+        and isinstance(data.get("names"), dict)
+    ):
+        return data["names"]
+    return {}
+
+
+def save_name_index(skills_dir: Path, names: Dict[str, str]) -> None:
+    if not cache_enabled():
+        return
+    write_json_atomic(
+        name_index_path(skills_dir),
+        {"version": CATALOG_CACHE_VERSION, "names": names},
+    )
+
+
+class CatalogCache:
+    """Parsed skill metadata for one skills directory, keyed by skill path.
+
+    Each entry stores a stamp of everything the parsed record depends on
+    (stat stamps of `skill.yaml` and `SKILL.md` plus which sidecars exist)
+    next to the record. A lookup only hits when the stamp still matches.
+    """
+
+    def __init__(self, skills_dir: Path, enabled: Optional[bool] = None):
+        self.skills_dir = Path(skills_dir)
+        self.enabled = cache_enabled() if enabled is None else enabled
+        self.entries: Dict[str, Dict] = {}
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        self._seen: set = set()
+        if self.enabled:
+            self._load()
+
+    @property
+    def path(self) -> Path:
+        return get_ask_cache_dir() / "catalog" / f"{_catalog_key(self.skills_dir)}.json"
+
+    def _load(self) -> None:
+        data = read_json(self.path)
+        if (
+            isinstance(data, dict)
+            and data.get("version") == CATALOG_CACHE_VERSION
+            and isinstance(data.get("entries"), dict)
+        ):
+            self.entries = data["entries"]
+
+    def get(self, skill_path: str, stamp: List) -> Optional[Dict]:
+        """Return the cached record for `skill_path` if `stamp` still matches.
+
+        Returns a dict with a "skill" key (the record, or None for a directory
+        that failed to parse), or None on a miss.
+        """
+        self._seen.add(skill_path)
+        if not self.enabled:
+            return None
+        entry = self.entries.get(skill_path)
+        if entry is not None and entry.get("stamp") == stamp:
+            self.hits += 1
+            return entry
+        self.misses += 1
+        return None
+
+    def put(self, skill_path: str, stamp: List, skill: Optional[Dict]) -> None:
+        self._seen.add(skill_path)
+        if not self.enabled:
+            return
+        newest = max((s[0] for s in stamp if isinstance(s, list)), default=0)
+        if time.time_ns() - newest < RACY_WINDOW_NS or not _round_trips(skill):
+            self.entries.pop(skill_path, None)
+        else:
+            self.entries[skill_path] = {"stamp": stamp, "skill": skill}
+        self._dirty = True
+
+    def save(self) -> None:
+        """Persist the cache, dropping entries for skills that were not seen."""
+        if not self.enabled:
+            return
+        stale = [p for p in self.entries if p not in self._seen]
+        for p in stale:
+            del self.entries[p]
+        if not (self._dirty or stale):
+            return
+        write_json_atomic(
+            self.path,
+            {
+                "version": CATALOG_CACHE_VERSION,
+                "root": str(self.skills_dir),
+                "entries": self.entries,
+            },
+        )
+        self._dirty = False
+
+
+EVALS_CACHE_VERSION = 1
+# Entries not used by the current run are kept too (other libraries share the
+# file), but the file is capped at this many, current run's entries first.
+EVALS_CACHE_MAX_ENTRIES = 4096
+
+
+class EvalsCache:
+    """Parsed `tests/evals.yaml` documents, keyed by the sha256 of their bytes.
+
+    Content-hash keys need no stamps (and have no racy window): identical
+    bytes always parse to the same data, wherever the file lives. One instance
+    also memoizes lookups for the duration of a run, so the audit and the
+    coverage report share the work.
+    """
+
+    def __init__(self, enabled: Optional[bool] = None):
+        self.enabled = cache_enabled() if enabled is None else enabled
+        self.entries: Dict[str, Dict] = {}
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        self._seen: set = set()
+        if self.enabled:
+            self._load()
+
+    @property
+    def path(self) -> Path:
+        return get_ask_cache_dir() / "catalog" / "evals.json"
+
+    def _load(self) -> None:
+        data = read_json(self.path)
+        if (
+            isinstance(data, dict)
+            and data.get("version") == EVALS_CACHE_VERSION
+            and isinstance(data.get("entries"), dict)
+        ):
+            self.entries = data["entries"]
+
+    def get(self, digest: str) -> Optional[Dict]:
+        """Return `{"evals": ...}` for `digest`, or None on a miss."""
+        entry = self.entries.get(digest)
+        if entry is not None:
+            self._seen.add(digest)
+            self.hits += 1
+            return entry
+        self.misses += 1
+        return None
+
+    def put(self, digest: str, evals: Optional[Dict]) -> None:
+        # Memoized for this run either way; only JSON-safe data is persisted.
+        self.entries[digest] = {"evals": evals, "persist": _round_trips(evals)}
+        self._seen.add(digest)
+        self._dirty = True
+
+    def save(self) -> None:
+        if not (self.enabled and self._dirty):
+            return
+        keep = [d for d in self.entries if d in self._seen]
+        keep += [d for d in self.entries if d not in self._seen]
+        entries = {
+            d: {"evals": self.entries[d]["evals"]}
+            for d in keep
+            if self.entries[d].get("persist", True)
+        }
+        entries = dict(list(entries.items())[:EVALS_CACHE_MAX_ENTRIES])
+        write_json_atomic(
+            self.path, {"version": EVALS_CACHE_VERSION, "entries": entries}
+        )
+        self._dirty = False
+
+
+TOKEN_CACHE_VERSION = 1
+TOKEN_CACHE_MAX_ENTRIES = 16384
+
+
+class TokenCountCache:
+    """Token counts keyed by (encoding name, sha256 of the text).
+
+    Like `EvalsCache`, content-hash keys need no stamps: the same bytes
+    always encode to the same count under the same encoding, so `ask skill
+    lint` and `ask skill profile` never re-tokenize an unchanged SKILL.md.
+    """
+
+    def __init__(self, enabled: Optional[bool] = None):
+        self.enabled = cache_enabled() if enabled is None else enabled
+        self.entries: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        self._seen: set = set()
+        if self.enabled:
+            self._load()
+
+    @property
+    def path(self) -> Path:
+        return get_ask_cache_dir() / "tokens.json"
+
+    @staticmethod
+    def key(encoding: str, text: str) -> str:
+        return f"{encoding}:{hashlib.sha256(text.encode('utf-8')).hexdigest()}"
+
+    def _load(self) -> None:
+        data = read_json(self.path)
+        if (
+            isinstance(data, dict)
+            and data.get("version") == TOKEN_CACHE_VERSION
+            and isinstance(data.get("entries"), dict)
+        ):
+            self.entries = data["entries"]
+
+    def get(self, key: str) -> Optional[int]:
+        count = self.entries.get(key)
+        if isinstance(count, int):
+            self._seen.add(key)
+            self.hits += 1
+            return count
+        self.misses += 1
+        return None
+
+    def put(self, key: str, count: int) -> None:
+        self.entries[key] = count
+        self._seen.add(key)
+        self._dirty = True
+
+    def save(self) -> None:
+        if not (self.enabled and self._dirty):
+            return
+        # Entries used by this run first, then older ones, up to the cap.
+        keep = [k for k in self.entries if k in self._seen]
+        keep += [k for k in self.entries if k not in self._seen]
+        entries = {k: self.entries[k] for k in keep[:TOKEN_CACHE_MAX_ENTRIES]}
+        write_json_atomic(self.path, {"version": TOKEN_CACHE_VERSION, "entries": entries})
+        self._dirty = False
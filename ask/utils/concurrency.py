@@ -0,0 +1,27 @@
+"""Ordered parallel map shared by skill discovery and the token report."""
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pickle import PicklingError
+from typing import Callable, List
+
+
+def parallel_map(fn: Callable, items: List, workers: int, use_processes: bool = False) -> List:
+    """
+    Ordered map over `items` (results line up with inputs, like `map`).
+
+    Runs inline when `workers` <= 1 or there is at most one item. Process
+    pools are only worth their start-up cost for big CPU-bound batches and
+    may be unavailable (sandboxes, frozen apps), so any failure to start one
+    degrades to threads.
+    """
+    if workers <= 1 or len(items) < 2:
+        return [fn(item) for item in items]
+    if use_processes:
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                return list(pool.map(fn, items, chunksize=max(len(items) // (workers * 4), 1)))
+        except (OSError, BrokenProcessPool, PicklingError):
+            pass
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(fn, items))
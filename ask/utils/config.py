@@ -1,7 +1,8 @@
-import yaml
 from pathlib import Path
 from typing import Dict, Any
 
+from ask.utils.yaml_loader import safe_load
+
 CONFIG_PATH = Path.home() / ".askconfig.yaml"
 
 def load_config() -> Dict[str, Any]:
@@ -16,7 +17,7 @@ def load_config() -> Dict[str, Any]:
         
     try:
         with open(CONFIG_PATH, "r", encoding="utf-8") as f:
-            config = yaml.safe_load(f)
+            config = safe_load(f)
             return config or {}
     except Exception:
         return {}
@@ -0,0 +1,264 @@
+"""Incremental trigger audit (`ask test --changed-since <ref>`).
+
+A full audit scores every eval prompt against the whole library. After a
+small edit almost all of those scores are provably unchanged, so this module
+keeps the previous audit (results, per-skill document and evals hashes, IDF
+table) in the cache directory and re-scores only the prompts whose results
+could differ:
+
+* prompts of skills whose evals changed (or that are new);
+* prompts sharing a token with a skill whose vector changed — a skill whose
+  description/triggers changed, or that contains a token whose IDF drifted;
+* prompts containing a drifted token (their own weights and norm moved).
+
+Every other prompt shares no token with any changed vector, so all of its
+cosines, and therefore its verdict and collisions, are exactly as stored.
+When the set of skill names changes (a skill was added, removed or renamed)
+every IDF shifts, so the audit falls back to a full run.
+
+The git ref scopes change detection: if the stored state was taken at that
+commit with a clean skills tree, only skills touched by `git diff <ref>` (or
+untracked) are hash-checked; otherwise every skill is.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import subprocess
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from ask.utils.cache import _catalog_key, get_ask_cache_dir, read_json, write_json_atomic
+from ask.utils.eval.trigger_scorer import (
+    DEFAULT_COLLISION_MARGIN,
+    AuditReport,
+    PromptResult,
+    _audit_prompts,
+    _score_prompts,
+    _skill_document,
+    _tokenize,
+    build_index,
+    shared_evals_cache,
+)
+
+AUDIT_STATE_VERSION = 1
+
+
+@dataclass
+class IncrementalAudit:
+    report: AuditReport
+    full: bool
+    reason: str = ""
+    changed_skills: List[str] = field(default_factory=list)
+    rescored: int = 0
+    reused: int = 0
+
+
+def audit_state_path(skills_dir: Path) -> Path:
+    return get_ask_cache_dir() / "catalog" / f"{_catalog_key(skills_dir)}.audit.json"
+
+
+def _git(args: List[str], cwd: Path) -> str:
+    try:
+        proc = subprocess.run(
+            ["git", *args], cwd=str(cwd), capture_output=True, text=True, check=True
+        )
+    except FileNotFoundError as exc:
+        raise RuntimeError("git is not installed") from exc
+    except subprocess.CalledProcessError as exc:
+        raise RuntimeError(exc.stderr.strip() or f"git {' '.join(args)} failed") from exc
+    return proc.stdout
+
+
+def resolve_ref(skills_dir: Path, ref: str) -> str:
+    """Resolve `ref` to a commit sha (RuntimeError if it is not one)."""
+    if ref.startswith("-"):
+        raise RuntimeError(f"Invalid git ref: {ref}")
+    try:
+        return _git(["rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}"], skills_dir).strip()
+    except RuntimeError as exc:
+        raise RuntimeError(f"Unknown git ref {ref!r} in {skills_dir}") from exc
+
+
+def git_changed_paths(skills_dir: Path, ref: str) -> Set[Path]:
+    """Files under `skills_dir` that differ from `ref` (including untracked)."""
+    top = Path(_git(["rev-parse", "--show-toplevel"], skills_dir).strip())
+    changed = _git(["diff", "--name-only", ref, "--", "."], skills_dir).splitlines()
+    untracked = _git(["ls-files", "--others", "--exclude-standard", "--full-name", "--", "."], skills_dir)
+    return {(top / line).resolve() for line in changed + untracked.splitlines() if line}
+
+
+def _head_if_clean(skills_dir: Path) -> Optional[str]:
+    """HEAD's sha if the skills tree has no uncommitted changes, else None."""
+    try:
+        if _git(["status", "--porcelain", "--", "."], skills_dir).strip():
+            return None
+        return _git(["rev-parse", "HEAD"], skills_dir).strip()
+    except RuntimeError:
+        return None
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def _result_key(result: PromptResult) -> Tuple[str, str]:
+    return (result.skill, result.prompt)
+
+
+def _decode_result(data: Dict) -> PromptResult:
+    data = dict(data)
+    data["collisions"] = [tuple(pair) for pair in data["collisions"]]
+    return PromptResult(**data)
+
+
+def _load_state(skills_dir: Path) -> Optional[Dict]:
+    data = read_json(audit_state_path(skills_dir))
+    if isinstance(data, dict) and data.get("version") == AUDIT_STATE_VERSION:
+        return data
+    return None
+
+
+def run_incremental_audit(
+    skills: List[Dict],
+    skills_dir: Path,
+    ref: str,
+    margin: float = DEFAULT_COLLISION_MARGIN,
+    engine: str = "auto",
+    workers: Optional[int] = None,
+) -> IncrementalAudit:
+    """Audit `skills`, re-scoring only what changed since the stored state.
+
+    Raises RuntimeError if `ref` is not a commit in the skills repository.
+    """
+    skills_dir = Path(skills_dir)
+    ref_sha = resolve_ref(skills_dir, ref)
+    touched = git_changed_paths(skills_dir, ref)
+
+    index = build_index(skills)
+    with shared_evals_cache():
+        prompts = _audit_prompts(skills)
+
+    documents: Dict[str, str] = {}
+    paths: Dict[str, Path] = {}
+    for skill in skills:
+        name = skill.get("name")
+        if name:
+            documents[name] = _digest(_skill_document(skill))
+            if skill.get("_path"):
+                paths[name] = Path(skill["_path"]).resolve()
+    by_skill: Dict[str, List[str]] = {}
+    for name, prompt in prompts:
+        by_skill.setdefault(name, []).append(prompt)
+    evals = {name: _digest(json.dumps(p)) for name, p in by_skill.items()}
+    idf = index.idf
+
+    state = _load_state(skills_dir)
+    reason = ""
+    if state is None:
+        reason = "no previous audit state"
+    elif state.get("margin") != margin:
+        reason = "margin changed"
+    elif set(state.get("documents", {})) != set(documents):
+        reason = "skills were added, removed or renamed"
+
+    if reason:
+        results = _score_prompts(index, prompts, margin, engine, workers)
+        outcome = IncrementalAudit(
+            AuditReport(results=results, margin=margin), full=True, reason=reason,
+            rescored=len(results),
+        )
+    else:
+        outcome = _rescore_affected(
+            index, prompts, margin, engine, workers, state, documents, evals, idf,
+            _candidates(state, ref_sha, touched, documents, paths),
+        )
+
+    write_json_atomic(
+        audit_state_path(skills_dir),
+        {
+            "version": AUDIT_STATE_VERSION,
+            "commit": _head_if_clean(skills_dir),
+            "margin": margin,
+            "documents": documents,
+            "evals": evals,
+            "idf": idf,
+            "results": [asdict(r) for r in outcome.report.results],
+        },
+    )
+    return outcome
+
+
+def _candidates(
+    state: Dict,
+    ref_sha: str,
+    touched: Set[Path],
+    documents: Dict[str, str],
+    paths: Dict[str, Path],
+) -> Set[str]:
+    """Skills whose hashes need checking against the stored state."""
+    if state.get("commit") != ref_sha:
+        # The state does not describe `ref` exactly; trust only the hashes.
+        return set(documents)
+    candidates = set()
+    for name, path in paths.items():
+        if any(p == path or path in p.parents for p in touched):
+            candidates.add(name)
+    return candidates
+
+
+def _rescore_affected(
+    index, prompts, margin, engine, workers, state, documents, evals, idf, candidates
+) -> IncrementalAudit:
+    old_docs, old_evals, old_idf = state["documents"], state.get("evals", {}), state.get("idf", {})
+    changed_docs = {n for n in candidates if old_docs.get(n) != documents[n]}
+    changed_evals = {
+        n for n in set(evals) | set(old_evals)
+        if (n in candidates or n not in old_evals or n not in evals)
+        and old_evals.get(n) != evals.get(n)
+    }
+    drift = {t for t in set(idf) | set(old_idf) if idf.get(t) != old_idf.get(t)}
+
+    # Skills whose vectors changed: edited ones plus any containing a drifted
+    # token. A prompt is affected iff it shares a token with one of them or
+    # contains a drifted token itself.
+    token_ids = index._token_ids
+    moved_vectors = set(changed_docs)
+    for tok in drift:
+        tok_id = token_ids.get(tok)
+        if tok_id is not None:
+            moved_vectors.update(index._postings[tok_id])
+    hot_tokens = set(drift)
+    for name in moved_vectors:
+        hot_tokens.update(index._tokens[t] for t in index._term_counts[name])
+
+    stored = {}
+    for data in state.get("results", []):
+        result = _decode_result(data)
+        stored.setdefault(_result_key(result), result)
+
+    plan: List[Optional[PromptResult]] = []
+    to_score: List[Tuple[str, str]] = []
+    for name, prompt in prompts:
+        previous = stored.get((name, prompt))
+        if (
+            previous is None
+            or name in changed_evals
+            or not hot_tokens.isdisjoint(_tokenize(prompt))
+        ):
+            plan.append(None)
+            to_score.append((name, prompt))
+        else:
+            plan.append(previous)
+
+    fresh = iter(_score_prompts(index, to_score, margin, engine, workers))
+    results = [r if r is not None else next(fresh) for r in plan]
+    return IncrementalAudit(
+        AuditReport(results=results, margin=margin),
+        full=False,
+        changed_skills=sorted(changed_docs | changed_evals),
+        rescored=len(to_score),
+        reused=len(results) - len(to_score),
+    )
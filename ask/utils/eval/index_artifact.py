@@ -0,0 +1,229 @@
+"""Compiled TF-IDF index artifact (`trigger_index.bin`).
+
+`ask skill compile` writes this to `default_index_path()` in the skills
+directory, whatever `-o` says for the manifest, so consumers (`ask test`,
+`search_skills`, `ask mcp probe`) can skip tokenizing and weighting the
+library. `build_index` uses it only when the content hash of the skills it
+was asked to index matches the one recorded in the file; anything else
+(stale library, other format version, other byte order, a truncated or
+corrupt file) silently falls back to a fresh build.
+
+Loading is not zero-copy: the file is read through a read-only mmap, each
+section is copied out into arrays and dicts, and the mapping is closed
+before `load_index` returns. What the format saves is the tokenizing and
+weighting, not the copy.
+
+Layout (native byte order, recorded in the header; sections 8-byte aligned):
+
+    header    magic, format version, byte-order mark, counts, sha256 of inputs
+    tokens    "\\n"-joined vocabulary, id order
+    doc_freq  uint32[n_tokens]
+    idf       float64[n_tokens]
+    names     JSON list of skill names, index order
+    offsets   uint64[n_docs + 1]      slice of the packed arrays per skill
+    ids       uint32[nnz]             sorted token ids per skill
+    counts    uint32[nnz]             raw term counts (for incremental updates)
+    weights   float64[nnz]
+    norms     float64[n_docs]
+    p_offsets uint64[n_tokens + 1]    the same weights transposed: postings
+    p_docs    uint32[nnz]             per token, as indexes into `names`
+    p_weights float64[nnz]
+
+Storing both layouts lets loading build every dict with C-level `zip`
+instead of a Python loop over all nonzeros.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from ask.utils.eval.trigger_scorer import (
+    PackedVector,
+    TriggerIndex,
+    _TOKEN_RE,
+    _skill_document,
+)
+
+INDEX_FILENAME = "trigger_index.bin"
+INDEX_FORMAT_VERSION = 1
+
+_MAGIC = b"ASKTIDX\0"
+_BOM = 0x01020304
+# magic, version, byte-order mark, n_tokens, n_docs, nnz, sha256 digest
+_HEADER = struct.Struct("=8sIIIIQ32s")
+
+
+def default_index_path() -> Path:
+    from ask.utils import filesystem
+
+    return filesystem.get_skills_dir() / INDEX_FILENAME
+
+
+def corpus_hash(skills: List[Dict]) -> bytes:
+    """sha256 over everything that determines the index for `skills`."""
+    documents: Dict[str, str] = {}
+    for skill in skills:
+        name = skill.get("name")
+        if name:
+            documents[name] = _skill_document(skill)
+    h = hashlib.sha256()
+    h.update(f"{INDEX_FORMAT_VERSION}:{_TOKEN_RE.pattern}\n".encode())
+    h.update(json.dumps(list(documents.items()), ensure_ascii=False).encode("utf-8"))
+    return h.digest()
+
+
+def _pad(buf: bytearray) -> None:
+    buf.extend(b"\0" * (-len(buf) % 8))
+
+
+def save_index(index: TriggerIndex, path: Path, content_hash: bytes) -> None:
+    """Write `index` to `path` atomically."""
+    vectors = index.packed_vectors()
+    names = list(vectors)
+    offsets = array("Q", [0])
+    ids, counts, weights = array("I"), array("I"), array("d")
+    for name in names:
+        vec = vectors[name]
+        term_counts = index._term_counts[name]
+        ids.extend(vec.ids)
+        counts.extend(term_counts[tok_id] for tok_id in vec.ids)
+        weights.extend(vec.weights)
+        offsets.append(len(ids))
+    position = {name: i for i, name in enumerate(names)}
+    p_offsets, p_docs, p_weights = array("Q", [0]), array("I"), array("d")
+    for posting in index._postings:
+        p_docs.extend(position[name] for name in posting)
+        p_weights.extend(posting.values())
+        p_offsets.append(len(p_docs))
+
+    buf = bytearray(
+        _HEADER.pack(
+            _MAGIC, INDEX_FORMAT_VERSION, _BOM,
+            len(index._tokens), len(names), len(ids), content_hash,
+        )
+    )
+    _pad(buf)
+    for blob in (
+        "\n".join(index._tokens).encode("utf-8"),
+        array("I", index._doc_freq).tobytes(),
+        array("d", index._idf).tobytes(),
+        json.dumps(names, ensure_ascii=False).encode("utf-8"),
+        offsets.tobytes(),
+        ids.tobytes(),
+        counts.tobytes(),
+        weights.tobytes(),
+        array("d", [vectors[name].norm for name in names]).tobytes(),
+        p_offsets.tobytes(),
+        p_docs.tobytes(),
+        p_weights.tobytes(),
+    ):
+        buf.extend(struct.pack("=Q", len(blob)))
+        buf.extend(blob)
+        _pad(buf)
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(buf)
+        # mkstemp creates 0600; this is a shareable build artifact.
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+class _Reader:
+    def __init__(self, view: memoryview, offset: int):
+        self.view = view
+        self.offset = offset
+
+    def section(self) -> memoryview:
+        (size,) = struct.unpack_from("=Q", self.view, self.offset)
+        start = self.offset + 8
+        end = start + size
+        if end > len(self.view):
+            raise ValueError("truncated index artifact")
+        self.offset = end + (-end % 8)
+        return self.view[start:end]
+
+    def array(self, typecode: str, expected: int) -> array:
+        out = array(typecode)
+        out.frombytes(self.section())
+        if len(out) != expected:
+            raise ValueError("index artifact section has the wrong length")
+        return out
+
+
+def load_index(path: Path, content_hash: bytes) -> Optional[TriggerIndex]:
+    """Load the artifact at `path` if it was compiled from the same inputs."""
+    try:
+        with open(path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                view = memoryview(mm)
+                try:
+                    return _decode(view, content_hash)
+                finally:
+                    view.release()
+    except (OSError, ValueError, struct.error, UnicodeDecodeError, IndexError, TypeError):
+        # A corrupted body behind an intact header (names out of range, a
+        # non-list names section, ...) means "rebuild", not a crash.
+        return None
+
+
+def _decode(view: memoryview, content_hash: bytes) -> Optional[TriggerIndex]:
+    if len(view) < _HEADER.size:
+        return None
+    magic, version, bom, n_tokens, n_docs, nnz, digest = _HEADER.unpack_from(view, 0)
+    if magic != _MAGIC or version != INDEX_FORMAT_VERSION or bom != _BOM:
+        return None
+    if digest != content_hash:
+        return None
+
+    reader = _Reader(view, _HEADER.size + (-_HEADER.size % 8))
+    token_blob = bytes(reader.section()).decode("utf-8")
+    tokens = token_blob.split("\n") if n_tokens else []
+    doc_freq = reader.array("I", n_tokens)
+    idf = reader.array("d", n_tokens)
+    names = json.loads(bytes(reader.section()).decode("utf-8"))
+    offsets = reader.array("Q", n_docs + 1)
+    ids = reader.array("I", nnz)
+    counts = reader.array("I", nnz)
+    weights = reader.array("d", nnz)
+    norms = reader.array("d", n_docs)
+    p_offsets = reader.array("Q", n_tokens + 1)
+    p_docs = reader.array("I", nnz)
+    p_weights = reader.array("d", nnz)
+    if len(tokens) != n_tokens or len(names) != n_docs:
+        return None
+
+    index = TriggerIndex()
+    index._tokens = tokens
+    index._token_ids = {tok: i for i, tok in enumerate(tokens)}
+    index._doc_freq = doc_freq.tolist()
+    index._idf = idf.tolist()
+    for i, name in enumerate(names):
+        lo, hi = offsets[i], offsets[i + 1]
+        doc_ids = ids[lo:hi]
+        index._term_counts[name] = dict(zip(doc_ids, counts[lo:hi]))
+        index._vectors[name] = PackedVector(doc_ids, weights[lo:hi], norms[i])
+    doc_names = [names[i] for i in p_docs]
+    index._postings = [
+        dict(zip(doc_names[p_offsets[t]:p_offsets[t + 1]], p_weights[p_offsets[t]:p_offsets[t + 1]]))
+        for t in range(n_tokens)
+    ]
+    index._n_weighted = n_docs
+    return index
@@ -0,0 +1,118 @@
+"""Alternative ranking backends for the trigger audit and `search_skills`.
+
+Every backend is a `TriggerIndex` subclass, so it keeps the same interned
+postings, incremental add/update/remove and `score`/`score_top_k` API; only
+the tokenizer or the term weighting changes.
+
+    tfidf    smoothed TF-IDF cosine over `[a-z0-9]+` words (the default)
+    bm25     Okapi BM25 over the same words, normalized to [0, 1] per query
+    trigram  TF-IDF cosine over padded character trigrams, which tolerates
+             plurals, compounds and typos ("dockerfile" vs "docker file")
+
+Select one with `ask test --scorer` or `search_skills_payload(scorer=...)`.
+"""
+
+from __future__ import annotations
+
+import math
+from array import array
+from typing import Dict, List, Tuple, Type
+
+from ask.utils.eval.trigger_scorer import _TOKEN_RE, PackedVector, TriggerIndex
+
+SCORERS = ("tfidf", "bm25", "trigram")
+
+
+def _char_trigrams(text: str) -> List[str]:
+    grams: List[str] = []
+    for word in _TOKEN_RE.findall(text.lower()):
+        padded = f" {word} "
+        grams.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class TrigramIndex(TriggerIndex):
+    """TF-IDF cosine over character trigrams of each word."""
+
+    tokenize = staticmethod(_char_trigrams)
+
+
+class BM25Index(TriggerIndex):
+    """Okapi BM25 with the usual k1/b defaults.
+
+    Posting weights hold each term's full BM25 contribution, so scoring a
+    prompt is the same postings walk as TF-IDF with unit query weights. The
+    sum is divided by the query's upper bound (every term saturated:
+    idf * (k1 + 1)) so scores are comparable across prompts and the audit's
+    collision margin keeps its meaning.
+
+    BM25 weights depend on the average document length, so any mutation
+    reweights the whole library on the next read (arithmetic only; nothing is
+    re-tokenized).
+    """
+
+    K1 = 1.2
+    B = 0.75
+    cosine = False
+
+    def _refresh(self) -> None:
+        n_docs = len(self._term_counts)
+        if not (self._stale_tokens or self._stale_docs or n_docs != self._n_weighted):
+            return
+        self._n_weighted = n_docs
+        idf, doc_freq = self._idf, self._doc_freq
+        for tok_id, freq in enumerate(doc_freq):
+            idf[tok_id] = math.log(1.0 + (n_docs - freq + 0.5) / (freq + 0.5)) if freq else 0.0
+        lengths = {name: sum(counts.values()) for name, counts in self._term_counts.items()}
+        avg_length = (sum(lengths.values()) / n_docs if n_docs else 0.0) or 1.0
+        k1, b = self.K1, self.B
+        postings = self._postings
+        for name, counts in self._term_counts.items():
+            saturation = k1 * (1.0 - b + b * lengths[name] / avg_length)
+            ids = array("I", sorted(counts))
+            weights = array(
+                "d",
+                [
+                    idf[tok_id] * counts[tok_id] * (k1 + 1.0) / (counts[tok_id] + saturation)
+                    for tok_id in ids
+                ],
+            )
+            norm = math.sqrt(sum(w * w for w in weights))
+            self._vectors[name] = PackedVector(ids, weights, norm)
+            for tok_id, weight in zip(ids, weights):
+                postings[tok_id][name] = weight
+        self._stale_tokens.clear()
+        self._stale_docs.clear()
+
+    def _prompt_vector(self, prompt: str) -> Dict[int, float]:
+        """Unit weight per distinct known token (BM25 ignores query tf)."""
+        self._refresh()
+        token_ids, idf = self._token_ids, self._idf
+        vec: Dict[int, float] = {}
+        for tok in self.tokenize(prompt):
+            tok_id = token_ids.get(tok)
+            if tok_id is not None and idf[tok_id]:
+                vec[tok_id] = 1.0
+        return vec
+
+    def _query(self, prompt: str) -> Tuple[Dict[int, float], float]:
+        prompt_vec = self._prompt_vector(prompt)
+        bound = (self.K1 + 1.0) * sum(self._idf[tok_id] for tok_id in prompt_vec)
+        return prompt_vec, bound
+
+    def _doc_divisor(self, name: str) -> float:
+        return 1.0
+
+
+_INDEX_CLASSES: Dict[str, Type[TriggerIndex]] = {
+    "tfidf": TriggerIndex,
+    "bm25": BM25Index,
+    "trigram": TrigramIndex,
+}
+
+
+def index_class(scorer: str) -> Type[TriggerIndex]:
+    try:
+        return _INDEX_CLASSES[scorer]
+    except KeyError:
+        raise ValueError(f"Unknown scorer {scorer!r}; expected one of {SCORERS}") from None
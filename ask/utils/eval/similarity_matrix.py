@@ -0,0 +1,217 @@
+"""Skill-vs-skill similarity matrix (`ask test --matrix`).
+
+The prompt audit only sees collisions between skills that ship evals. This
+module compares the skill documents themselves and reports the most similar
+pairs, by the same TF-IDF cosine `TriggerIndex.similarity` computes.
+
+Two strategies, neither of which materializes the N x N matrix:
+
+* exact — for each skill, accumulate dot products with every later skill
+  over the postings of its tokens (one sparse row at a time), keeping only the
+  top pairs in a bounded heap. Memory is O(N + k); time grows with the number
+  of skill pairs sharing a token, which is fine for a single library.
+* lsh — MinHash signatures over each skill's distinctive tokens, bucketed by
+  band (one band in memory at a time). Only pairs that share a bucket are
+  scored exactly, so libraries aggregated from many remotes stay tractable.
+  Memory is O(N x MINHASH_PERMUTATIONS); pairs with little token overlap
+  may be missed, which is the point: they are not collisions. So may pairs
+  that only meet in buckets of more than LSH_MAX_BUCKET skills, which keeps
+  the number of scored pairs near-linear.
+"""
+
+from __future__ import annotations
+
+import heapq
+import random
+from array import array
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from ask.utils.eval.trigger_scorer import TriggerIndex
+
+# Above this many skills `method="auto"` switches from exact products to LSH.
+EXACT_MAX_SKILLS = 1000
+MATRIX_METHODS = ("auto", "exact", "lsh")
+
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 16  # 4 rows per band: pairs with Jaccard >= ~0.5 almost surely meet
+# Tokens in more than this fraction of skills ("and", "code") are left out of
+# signatures: they carry little TF-IDF weight but would put everything in the
+# same buckets.
+LSH_MAX_DOC_FRACTION = 0.05
+# Band buckets holding more skills than this are not scored: a bucket that
+# crowded comes from shared common vocabulary, and would cost O(members^2).
+LSH_MAX_BUCKET = 64
+_MINHASH_SEED = 0x5EED
+_MERSENNE_PRIME = (1 << 61) - 1
+_MASK64 = (1 << 64) - 1
+
+
+@dataclass(frozen=True)
+class SkillPair:
+    a: str
+    b: str
+    score: float
+
+
+class _TopPairs:
+    """Bounded min-heap of the `k` best pairs (ties broken by name order)."""
+
+    def __init__(self, k: int, min_score: float):
+        self.k = k
+        self.min_score = min_score
+        self._heap: List[Tuple[float, int, int]] = []
+
+    def push(self, score: float, i: int, j: int) -> None:
+        if score <= self.min_score:
+            return
+        # Among equal scores the pair with the larger positions is evicted.
+        item = (score, -i, -j)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, item)
+        elif item > self._heap[0]:
+            heapq.heapreplace(self._heap, item)
+
+    def pairs(self, names: List[str]) -> List[SkillPair]:
+        ranked = sorted(self._heap, reverse=True)
+        return [SkillPair(names[-neg_i], names[-neg_j], score) for score, neg_i, neg_j in ranked]
+
+
+def top_similar_pairs(
+    index: TriggerIndex,
+    k: int = 20,
+    method: str = "auto",
+    min_score: float = 0.0,
+    skill: Optional[str] = None,
+) -> List[SkillPair]:
+    """The `k` most similar skill pairs in `index`, highest cosine first.
+
+    With `skill`, only pairs involving that skill are considered (always
+    exact: it is a single sparse row). Pairs scoring `min_score` or less are
+    never reported.
+    """
+    if method not in MATRIX_METHODS:
+        raise ValueError(f"unknown matrix method {method!r}; expected one of {MATRIX_METHODS}")
+    if k <= 0:
+        return []
+    vectors = index.packed_vectors()
+    names = sorted(vectors)
+    top = _TopPairs(k, min_score)
+    if skill is not None:
+        if skill not in vectors:
+            raise KeyError(skill)
+        position = {name: i for i, name in enumerate(names)}
+        me = position[skill]
+        for other, score in _row(index, skill).items():
+            i, j = sorted((me, position[other]))
+            top.push(score, i, j)
+    elif method == "exact" or (method == "auto" and len(names) <= EXACT_MAX_SKILLS):
+        _exact_pairs(index, names, top)
+    else:
+        _lsh_pairs(index, names, top)
+    return top.pairs(names)
+
+
+def _row(
+    index: TriggerIndex,
+    name: str,
+    position: Optional[Dict[str, int]] = None,
+    after: int = -1,
+) -> Dict[str, float]:
+    """Cosines of `name` against every skill it shares a token with.
+
+    With `position` (name -> index in sorted order), only skills positioned
+    after `after`, so each pair is produced once.
+    """
+    vectors = index._vectors
+    vec = vectors[name]
+    if not vec.norm:
+        return {}
+    postings = index._postings
+    dots: Dict[str, float] = {}
+    for tok_id, weight in zip(vec.ids, vec.weights):
+        for other, other_weight in postings[tok_id].items():
+            if other == name or (position is not None and position[other] <= after):
+                continue
+            dots[other] = dots.get(other, 0.0) + weight * other_weight
+    return {
+        other: dot / (vec.norm * vectors[other].norm)
+        for other, dot in dots.items()
+        if dot and vectors[other].norm
+    }
+
+
+def _exact_pairs(index: TriggerIndex, names: List[str], top: _TopPairs) -> None:
+    position = {name: i for i, name in enumerate(names)}
+    for i, name in enumerate(names):
+        for other, score in _row(index, name, position, i).items():
+            top.push(score, i, position[other])
+
+
+def _minhash_signatures(index: TriggerIndex, names: List[str]) -> List[Optional[array]]:
+    # One independent universal hash `(a*x + b) mod p` per "permutation", so
+    # the fraction of equal signature slots estimates the Jaccard index. Token
+    # ids are interned in order, so a skill's tokens are often consecutive;
+    # they are scrambled first, as a linear hash of a run of consecutive
+    # integers is far from min-wise.
+    rng = random.Random(_MINHASH_SEED)
+    params = [
+        (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+        for _ in range(MINHASH_PERMUTATIONS)
+    ]
+    max_freq = max(2, int(LSH_MAX_DOC_FRACTION * len(names)))
+    doc_freq = index._doc_freq
+    token_hashes: Dict[int, array] = {}
+
+    def hashes(tok_id: int) -> array:
+        h = token_hashes.get(tok_id)
+        if h is None:
+            x = _mix64(tok_id)
+            h = token_hashes[tok_id] = array("Q", [(a * x + b) % _MERSENNE_PRIME for a, b in params])
+        return h
+
+    signatures: List[Optional[array]] = []
+    for name in names:
+        ids = index._vectors[name].ids
+        if not ids:
+            signatures.append(None)
+            continue
+        # Skills made only of common tokens fall back to all of them; the
+        # crowded buckets that produces are capped in `_lsh_pairs`.
+        rare = [t for t in ids if doc_freq[t] <= max_freq] or list(ids)
+        signatures.append(array("Q", map(min, zip(*(hashes(t) for t in rare)))))
+    return signatures
+
+
+def _mix64(x: int) -> int:
+    """The splitmix64 finalizer: a bijective scramble of a 64-bit integer."""
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return x ^ (x >> 31)
+
+
+def _lsh_pairs(index: TriggerIndex, names: List[str], top: _TopPairs) -> None:
+    signatures = _minhash_signatures(index, names)
+    rows = MINHASH_PERMUTATIONS // LSH_BANDS
+    for band in range(LSH_BANDS):
+        lo = band * rows
+        buckets: Dict[Tuple[int, ...], List[int]] = {}
+        for i, sig in enumerate(signatures):
+            if sig is not None:
+                buckets.setdefault(tuple(sig[lo:lo + rows]), []).append(i)
+        for members in buckets.values():
+            if len(members) > LSH_MAX_BUCKET:
+                # Shared by too many skills to mean a collision (common
+                # vocabulary), and quadratic to score.
+                continue
+            for pos, i in enumerate(members):
+                for j in members[pos + 1:]:
+                    # Score each pair once: in the first band it shares.
+                    if _shared_earlier(signatures[i], signatures[j], lo):
+                        continue
+                    top.push(index.similarity(names[i], names[j]), i, j)
+
+
+def _shared_earlier(a: array, b: array, lo: int) -> bool:
+    rows = MINHASH_PERMUTATIONS // LSH_BANDS
+    return any(a[s:s + rows] == b[s:s + rows] for s in range(0, lo, rows))
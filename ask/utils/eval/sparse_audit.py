@@ -0,0 +1,120 @@
+"""Batch scoring for the trigger audit with NumPy/SciPy sparse matrices.
+
+`run_trigger_audit` scores prompts one at a time, which is fine for a single
+library but dominates CI runs that audit tens of thousands of prompts. This
+engine instead builds a prompts x terms matrix and a skills x terms matrix
+(L2-normalized TF-IDF rows over the `TriggerIndex` token ids), gets every
+cosine from one sparse product, and finds the top skill, the runner-up and the
+collisions of a whole block of prompts with array operations.
+
+Results match the pure-Python engine up to floating-point rounding. Skills are
+laid out in name order so `argmax` ties resolve to the smallest name, the
+same tie-break `TriggerIndex.score` uses.
+
+Optional: install with `pip install "agent-skill-kit[audit]"`.
+"""
+
+from __future__ import annotations
+
+from typing import List, Sequence, Tuple
+
+try:
+    import numpy as np
+    from scipy import sparse
+
+    HAS_SPARSE = True
+except ImportError:  # optional `audit` extra not installed
+    np = None
+    sparse = None
+    HAS_SPARSE = False
+
+from ask.utils.eval.trigger_scorer import PromptResult, TriggerIndex
+
+# Dense similarity cells materialized per block (~32 MB of float64).
+BLOCK_CELLS = 1 << 22
+
+
+def _normalized_rows(rows: List[Tuple[Sequence[int], Sequence[float]]], width: int):
+    """CSR matrix with one L2-normalized row per (token ids, weights) pair."""
+    indptr = [0]
+    indices: List[int] = []
+    data: List[float] = []
+    for ids, weights in rows:
+        indices.extend(ids)
+        data.extend(weights)
+        indptr.append(len(indices))
+    matrix = sparse.csr_matrix(
+        (np.asarray(data, dtype=np.float64), np.asarray(indices, dtype=np.int64), indptr),
+        shape=(len(rows), max(width, 1)),
+    )
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    inv = np.divide(1.0, norms, out=np.zeros_like(norms), where=norms > 0)
+    return sparse.diags(inv) @ matrix
+
+
+def score_prompts(
+    index: TriggerIndex,
+    prompts: List[Tuple[str, str]],
+    margin: float,
+) -> List[PromptResult]:
+    """Score `(owning skill, prompt)` pairs against `index` in bulk."""
+    if not prompts:
+        return []
+    vectors = index.packed_vectors()
+    names = sorted(vectors)
+    if not names:
+        return []
+    column = {name: i for i, name in enumerate(names)}
+    width = index.vocabulary_size
+
+    skills_matrix = _normalized_rows(
+        [(vectors[name].ids, vectors[name].weights) for name in names], width
+    )
+    prompt_rows = []
+    for _, prompt in prompts:
+        vec = index._prompt_vector(prompt)
+        prompt_rows.append((list(vec), list(vec.values())))
+    prompt_matrix = _normalized_rows(prompt_rows, width)
+    similarities = (prompt_matrix @ skills_matrix.T).tocsr()
+    targets = np.array([column.get(name, -1) for name, _ in prompts], dtype=np.int64)
+
+    n_skills = len(names)
+    block_rows = max(1, BLOCK_CELLS // n_skills)
+    results: List[PromptResult] = []
+    for start in range(0, len(prompts), block_rows):
+        block = similarities[start:start + block_rows].toarray()
+        rows = np.arange(block.shape[0])
+        block_targets = targets[start:start + block_rows]
+        known = block_targets >= 0
+        target_scores = np.zeros(block.shape[0])
+        target_scores[known] = block[rows[known], block_targets[known]]
+
+        top = block.argmax(axis=1)
+        top_scores = block[rows, top]
+        if n_skills > 1:
+            without_top = block.copy()
+            without_top[rows, top] = -np.inf
+            runner_up = without_top.argmax(axis=1)
+            runner_up_scores = block[rows, runner_up]
+
+        competing = block >= (target_scores - margin)[:, None]
+        competing[rows[known], block_targets[known]] = False
+
+        for row in rows:
+            name, prompt = prompts[start + row]
+            cols = np.flatnonzero(competing[row])
+            scores = block[row, cols]
+            order = np.lexsort((cols, -scores))
+            results.append(
+                PromptResult(
+                    skill=name,
+                    prompt=prompt,
+                    target_score=float(target_scores[row]),
+                    top_skill=names[top[row]],
+                    top_score=float(top_scores[row]),
+                    runner_up_skill=names[runner_up[row]] if n_skills > 1 else None,
+                    runner_up_score=float(runner_up_scores[row]) if n_skills > 1 else 0.0,
+                    collisions=[(names[c], float(s)) for c, s in zip(cols[order], scores[order])],
+                )
+            )
+    return results
@@ -15,13 +15,24 @@ WHAT THIS IS NOT
 
 from __future__ import annotations
 
+import hashlib
+import heapq
 import math
+import multiprocessing
+import os
 import re
-from dataclasses import dataclass, field
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from concurrent.futures.process import BrokenProcessPool
+from array import array
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from pickle import PicklingError
+from typing import Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
 
-import yaml
+from ask.utils.cache import EvalsCache
+from ask.utils.yaml_loader import safe_load
 
 # A non-target skill scoring within this cosine distance of the target on the
 # target's own prompt is treated as a collision (a lexical false-positive risk).
@@ -41,69 +52,427 @@ def _skill_document(skill: Dict) -> str:
     return " ".join(parts)
 
 
-@dataclass
+class PackedVector(NamedTuple):
+    """A sparse vector as parallel arrays sorted by token id."""
+
+    ids: array
+    weights: array
+    norm: float
+
+
+def _merge_dot(a: PackedVector, b: PackedVector) -> float:
+    """Dot product of two packed vectors by merge-joining their sorted ids."""
+    a_ids, a_w, b_ids, b_w = a.ids, a.weights, b.ids, b.weights
+    i = j = 0
+    len_a, len_b = len(a_ids), len(b_ids)
+    total = 0.0
+    while i < len_a and j < len_b:
+        x, y = a_ids[i], b_ids[j]
+        if x == y:
+            total += a_w[i] * b_w[j]
+            i += 1
+            j += 1
+        elif x < y:
+            i += 1
+        else:
+            j += 1
+    return total
+
+
 class TriggerIndex:
-    """An in-memory TF-IDF index over the skill library."""
+    """An in-memory TF-IDF index over the skill library.
+
+    Tokens are interned into integer ids on first sight. The index keeps raw
+    term counts per skill and document frequencies per token id, so single
+    skills can be added, updated or removed without re-tokenizing the rest of
+    the library. IDF weights, packed skill vectors and their norms are derived
+    state: each mutation only marks what it invalidated, and the next read
+    recomputes just that (everything when the document count changed, since
+    every IDF depends on it).
+
+    Scoring walks an inverted index (token id -> {skill: weight}) so a prompt
+    only touches skills that share one of its tokens; every other skill
+    scores exactly 0. Skill-to-skill similarity merge-joins two packed
+    vectors with precomputed norms.
+
+    Subclasses in `ask.utils.eval.scorers` swap the tokenizer or the weighting
+    (see `SCORERS`); everything else, postings included, is shared.
+    """
 
-    idf: Dict[str, float] = field(default_factory=dict)
-    skill_vectors: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    # Splits skill documents and prompts into index terms.
+    tokenize = staticmethod(_tokenize)
+    # True when scores are cosines of the packed vectors, which is what the
+    # sparse audit engine computes.
+    cosine = True
+
+    def __init__(self):
+        self._token_ids: Dict[str, int] = {}
+        self._tokens: List[str] = []
+        self._term_counts: Dict[str, Dict[int, int]] = {}
+        # Indexed by token id; ids are never reused.
+        self._doc_freq: List[int] = []
+        self._idf: List[float] = []
+        # token id -> {skill name: tf-idf weight of the token in that skill}
+        self._postings: List[Dict[str, float]] = []
+        self._vectors: Dict[str, PackedVector] = {}
+        self._n_weighted = 0
+        self._stale_tokens: Set[int] = set()
+        self._stale_docs: Set[str] = set()
+        # Derived per-token score bounds for score_top_k; None when stale.
+        self._bounds: Optional[List[float]] = None
+
+    def __len__(self) -> int:
+        return len(self._term_counts)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._term_counts
 
-    def _vectorize(self, tokens: List[str]) -> Dict[str, float]:
-        tf: Dict[str, int] = {}
-        for tok in tokens:
-            tf[tok] = tf.get(tok, 0) + 1
-        return {tok: count * self.idf.get(tok, 0.0) for tok, count in tf.items()}
+    @property
+    def vocabulary_size(self) -> int:
+        """Number of token ids ever assigned (the width of packed vectors)."""
+        return len(self._tokens)
+
+    # -- mutation ------------------------------------------------------------
+
+    def _intern(self, token: str) -> int:
+        tok_id = self._token_ids.get(token)
+        if tok_id is None:
+            tok_id = len(self._tokens)
+            self._token_ids[token] = tok_id
+            self._tokens.append(token)
+            self._doc_freq.append(0)
+            self._idf.append(0.0)
+            self._postings.append({})
+        return tok_id
+
+    def add(self, skill: Dict) -> bool:
+        """Index `skill`, replacing any document already indexed under its name.
+
+        Returns False (and does nothing) for a skill without a name.
+        """
+        name = skill.get("name")
+        if not name:
+            return False
+        counts: Dict[int, int] = {}
+        for tok in self.tokenize(_skill_document(skill)):
+            tok_id = self._intern(tok)
+            counts[tok_id] = counts.get(tok_id, 0) + 1
+        old = self._term_counts.get(name)
+        if old is not None:
+            if old == counts:
+                return True
+            self._unlink(name, old)
+        self._term_counts[name] = counts
+        for tok_id in counts:
+            self._doc_freq[tok_id] += 1
+            # Weight is filled in by the next _refresh (the doc is stale).
+            self._postings[tok_id][name] = 0.0
+            self._stale_tokens.add(tok_id)
+        self._stale_docs.add(name)
+        self._bounds = None
+        return True
+
+    update = add
+
+    def remove(self, name: str) -> bool:
+        """Drop the document indexed under `name`. Returns False if absent."""
+        counts = self._term_counts.pop(name, None)
+        if counts is None:
+            return False
+        self._unlink(name, counts)
+        self._vectors.pop(name, None)
+        self._stale_docs.discard(name)
+        self._bounds = None
+        return True
+
+    def _unlink(self, name: str, counts: Dict[int, int]) -> None:
+        for tok_id in counts:
+            self._doc_freq[tok_id] -= 1
+            del self._postings[tok_id][name]
+            self._stale_tokens.add(tok_id)
+
+    # -- derived weights -----------------------------------------------------
+
+    def _refresh(self) -> None:
+        n_docs = len(self._term_counts)
+        idf, doc_freq = self._idf, self._doc_freq
+        if n_docs != self._n_weighted:
+            # Every IDF depends on the document count: recompute them all
+            # (arithmetic only; nothing is re-tokenized).
+            self._n_weighted = n_docs
+            for tok_id, freq in enumerate(doc_freq):
+                idf[tok_id] = self._idf_for(freq, n_docs) if freq else 0.0
+            docs = self._term_counts.keys()
+        elif self._stale_tokens or self._stale_docs:
+            docs = set(self._stale_docs)
+            for tok_id in self._stale_tokens:
+                freq = doc_freq[tok_id]
+                weight = self._idf_for(freq, n_docs) if freq else 0.0
+                if idf[tok_id] != weight:
+                    idf[tok_id] = weight
+                    docs.update(self._postings[tok_id])
+        else:
+            return
+        postings = self._postings
+        for name in docs:
+            counts = self._term_counts[name]
+            ids = array("I", sorted(counts))
+            weights = array("d", [counts[tok_id] * idf[tok_id] for tok_id in ids])
+            norm = math.sqrt(sum(w * w for w in weights))
+            self._vectors[name] = PackedVector(ids, weights, norm)
+            for tok_id, weight in zip(ids, weights):
+                postings[tok_id][name] = weight
+        self._stale_tokens.clear()
+        self._stale_docs.clear()
 
     @staticmethod
-    def _cosine(a: Dict[str, float], b: Dict[str, float]) -> float:
-        if not a or not b:
-            return 0.0
-        common = set(a) & set(b)
-        numerator = sum(a[t] * b[t] for t in common)
-        norm_a = math.sqrt(sum(v * v for v in a.values()))
-        norm_b = math.sqrt(sum(v * v for v in b.values()))
-        if norm_a == 0 or norm_b == 0:
+    def _idf_for(freq: int, n_docs: int) -> float:
+        # Smoothed IDF keeps common filler words ("the", "code") from dominating.
+        return math.log(n_docs / (1 + freq)) + 1.0
+
+    @property
+    def idf(self) -> Dict[str, float]:
+        """IDF weight per token currently in the library."""
+        self._refresh()
+        return {
+            self._tokens[tok_id]: weight
+            for tok_id, weight in enumerate(self._idf)
+            if self._doc_freq[tok_id]
+        }
+
+    @property
+    def skill_vectors(self) -> Dict[str, Dict[str, float]]:
+        """Each skill's TF-IDF vector keyed by token string (a copy)."""
+        self._refresh()
+        tokens = self._tokens
+        return {
+            name: {tokens[t]: w for t, w in zip(vec.ids, vec.weights)}
+            for name, vec in ((n, self._vectors[n]) for n in self._term_counts)
+        }
+
+    def packed_vectors(self) -> Dict[str, PackedVector]:
+        """Each skill's packed vector (shared, do not mutate)."""
+        self._refresh()
+        return {name: self._vectors[name] for name in self._term_counts}
+
+    def _prompt_vector(self, prompt: str) -> Dict[int, float]:
+        """TF-IDF weights of the prompt's known tokens, keyed by token id.
+
+        Unknown tokens weigh 0 and are left out; they would not change the
+        prompt's norm or any dot product.
+        """
+        self._refresh()
+        token_ids, idf = self._token_ids, self._idf
+        tf: Dict[int, int] = {}
+        for tok in self.tokenize(prompt):
+            tok_id = token_ids.get(tok)
+            if tok_id is not None:
+                tf[tok_id] = tf.get(tok_id, 0) + 1
+        return {tok_id: count * idf[tok_id] for tok_id, count in tf.items() if idf[tok_id]}
+
+    def _query(self, prompt: str) -> Tuple[Dict[int, float], float]:
+        """The prompt's weights and its share of the score divisor.
+
+        A skill scores dot(prompt, skill) / (query divisor * `_doc_divisor`):
+        the two vector norms, for a cosine.
+        """
+        prompt_vec = self._prompt_vector(prompt)
+        return prompt_vec, math.sqrt(sum(w * w for w in prompt_vec.values()))
+
+    def _doc_divisor(self, name: str) -> float:
+        return self._vectors[name].norm
+
+    def _dot_products(self, prompt: str) -> Tuple[Dict[str, float], float]:
+        """Accumulate prompt . doc over the postings of the prompt's tokens."""
+        prompt_vec, divisor = self._query(prompt)
+        dots: Dict[str, float] = {}
+        postings = self._postings
+        for tok_id, q_weight in prompt_vec.items():
+            for name, d_weight in postings[tok_id].items():
+                dots[name] = dots.get(name, 0.0) + q_weight * d_weight
+        return dots, divisor
+
+    def _cosines(self, prompt: str) -> Dict[str, float]:
+        """Non-zero scores only; skills absent from the result score 0."""
+        dots, q_divisor = self._dot_products(prompt)
+        if not q_divisor:
+            return {}
+        scores: Dict[str, float] = {}
+        for name, dot in dots.items():
+            d_divisor = self._doc_divisor(name)
+            if dot and d_divisor:
+                scores[name] = dot / (q_divisor * d_divisor)
+        return scores
+
+    def _term_bounds(self) -> List[float]:
+        """Per token id, the largest weight / doc divisor in its postings.
+
+        Times the prompt's weight over its divisor, that bounds what the
+        token can add to any skill's score. Rebuilt after mutations.
+        """
+        self._refresh()
+        if self._bounds is None:
+            divisors = {name: self._doc_divisor(name) for name in self._term_counts}
+            self._bounds = [
+                max((w / divisors[n] for n, w in posting.items() if divisors[n]), default=0.0)
+                for posting in self._postings
+            ]
+        return self._bounds
+
+    def similarity(self, a: str, b: str) -> float:
+        """Cosine similarity between two indexed skills."""
+        self._refresh()
+        vec_a, vec_b = self._vectors[a], self._vectors[b]
+        if not vec_a.norm or not vec_b.norm:
             return 0.0
-        return numerator / (norm_a * norm_b)
+        return _merge_dot(vec_a, vec_b) / (vec_a.norm * vec_b.norm)
 
     def score(self, prompt: str) -> List[Tuple[str, float]]:
         """Rank every skill against `prompt`, highest cosine first."""
-        prompt_vec = self._vectorize(_tokenize(prompt))
-        ranked = [
-            (name, self._cosine(prompt_vec, vec))
-            for name, vec in self.skill_vectors.items()
-        ]
+        cosines = self._cosines(prompt)
+        ranked = [(name, cosines.get(name, 0.0)) for name in self._term_counts]
         ranked.sort(key=lambda pair: (-pair[1], pair[0]))
         return ranked
 
-
-def build_index(skills: List[Dict]) -> TriggerIndex:
-    """Build a TF-IDF index from a list of skill dicts (name/description/triggers)."""
-    documents: Dict[str, List[str]] = {
-        skill["name"]: _tokenize(_skill_document(skill))
-        for skill in skills
-        if skill.get("name")
-    }
-
-    n_docs = len(documents)
-    doc_freq: Dict[str, int] = {}
-    for tokens in documents.values():
-        for token in set(tokens):
-            doc_freq[token] = doc_freq.get(token, 0) + 1
-
-    # Smoothed IDF keeps common filler words ("the", "code") from dominating.
-    idf = {
-        token: math.log(n_docs / (1 + freq)) + 1.0
-        for token, freq in doc_freq.items()
-    }
-
-    index = TriggerIndex(idf=idf)
-    index.skill_vectors = {
-        name: index._vectorize(tokens) for name, tokens in documents.items()
-    }
+    def score_top_k(self, prompt: str, k: int) -> List[Tuple[str, float]]:
+        """The first `k` entries of `score(prompt)`, without ranking the rest.
+
+        MaxScore-style early termination: the prompt's tokens are visited in
+        decreasing order of their score upper bound, and every skill met in a
+        posting list is scored exactly (postings are dicts, so the other
+        tokens are direct lookups). Once the k-th best score exceeds what the
+        unvisited tokens could add up to, no unseen skill can enter the top
+        k and the remaining postings are skipped. Zero-score skills only fill
+        in (by name) when fewer than `k` skills match at all.
+        """
+        if k <= 0:
+            return []
+        prompt_vec, q_divisor = self._query(prompt)
+        matched: Dict[str, float] = {}
+        if q_divisor:
+            bounds = self._term_bounds()
+            terms = sorted(
+                prompt_vec, key=lambda tok_id: -prompt_vec[tok_id] * bounds[tok_id]
+            )
+            remaining = [0.0] * (len(terms) + 1)
+            for i in range(len(terms) - 1, -1, -1):
+                tok_id = terms[i]
+                remaining[i] = remaining[i + 1] + prompt_vec[tok_id] * bounds[tok_id] / q_divisor
+            postings = self._postings
+            rank = {tok_id: i for i, tok_id in enumerate(terms)}
+            # Give up on early termination (at a bounded extra cost) once the
+            # lookups spent reach a quarter of exhaustive accumulation.
+            budget = sum(len(postings[tok_id]) for tok_id in terms) // 4
+            kth: List[float] = []  # min-heap of the k best scores so far
+            for i, tok_id in enumerate(terms):
+                # Bounds and exact scores round differently; stay conservative.
+                if len(kth) == k and remaining[i] * (1.0 + 1e-9) < kth[0]:
+                    break
+                # A skill first met here has no weight for earlier tokens.
+                # Prompt order is kept, so sums match _dot_products bit for bit.
+                tail = [
+                    (postings[other_id], q_weight)
+                    for other_id, q_weight in prompt_vec.items()
+                    if rank[other_id] >= i
+                ]
+                for name in postings[tok_id]:
+                    if name in matched:
+                        continue
+                    budget -= len(tail)
+                    if budget < 0:
+                        return self._exhaustive_top_k(prompt, k)
+                    dot = 0.0
+                    for posting, q_weight in tail:
+                        d_weight = posting.get(name)
+                        if d_weight is not None:
+                            dot += q_weight * d_weight
+                    d_divisor = self._doc_divisor(name)
+                    score = dot / (q_divisor * d_divisor) if dot and d_divisor else 0.0
+                    matched[name] = score
+                    if score:
+                        if len(kth) < k:
+                            heapq.heappush(kth, score)
+                        elif score > kth[0]:
+                            heapq.heapreplace(kth, score)
+        return self._top_k(matched, k)
+
+    def _exhaustive_top_k(self, prompt: str, k: int) -> List[Tuple[str, float]]:
+        return self._top_k(self._cosines(prompt), k)
+
+    def _top_k(self, scores: Dict[str, float], k: int) -> List[Tuple[str, float]]:
+        positive = ((name, score) for name, score in scores.items() if score)
+        top = heapq.nsmallest(k, positive, key=lambda pair: (-pair[1], pair[0]))
+        if len(top) < k:
+            # Fewer than k matches means no early termination, so `scores`
+            # covers every skill sharing a token with the prompt.
+            scored = {name for name, _ in top}
+            zeros = (name for name in self._term_counts if name not in scored)
+            top.extend((name, 0.0) for name in heapq.nsmallest(k - len(top), zeros))
+        return top
+
+
+def build_index(
+    skills: List[Dict],
+    artifact: Optional[Path] = None,
+    use_artifact: bool = True,
+    scorer: str = "tfidf",
+) -> TriggerIndex:
+    """Build a TF-IDF index from a list of skill dicts (name/description/triggers).
+
+    If a compiled index (`ask skill compile`) exists at `artifact` (default:
+    `trigger_index.bin` in the skills directory) and was compiled from exactly
+    these skill documents, it is loaded instead of rebuilt.
+
+    `scorer` selects another backend from `ask.utils.eval.scorers.SCORERS`
+    ("bm25", "trigram"); those are always built fresh.
+    """
+    if scorer != "tfidf":
+        from ask.utils.eval.scorers import index_class
+
+        index = index_class(scorer)()
+        for skill in skills:
+            index.add(skill)
+        return index
+    if use_artifact:
+        from ask.utils.eval import index_artifact
+
+        path = artifact if artifact is not None else index_artifact.default_index_path()
+        if os.path.exists(path):
+            loaded = index_artifact.load_index(path, index_artifact.corpus_hash(skills))
+            if loaded is not None:
+                return loaded
+    index = TriggerIndex()
+    for skill in skills:
+        index.add(skill)
     return index
 
 
+# Set while a `shared_evals_cache()` block is active; load_evals goes through it.
+_evals_cache: Optional[EvalsCache] = None
+
+
+@contextmanager
+def shared_evals_cache(enabled: Optional[bool] = None) -> Iterator[EvalsCache]:
+    """Memoize `load_evals` for the duration of the block.
+
+    Parsed evals are keyed by the sha256 of the file, kept in memory for the
+    block (so the audit and the coverage report parse each file once) and
+    persisted next to the catalog cache on exit (so repeat runs over
+    unchanged skills skip YAML entirely). Nested blocks share the outermost
+    cache.
+    """
+    global _evals_cache
+    outer = _evals_cache
+    cache = outer if outer is not None else EvalsCache(enabled)
+    _evals_cache = cache
+    try:
+        yield cache
+    finally:
+        _evals_cache = outer
+        if outer is None:
+            cache.save()
+
+
 def load_evals(skill: Dict) -> Optional[Dict]:
     """Load a skill's tests/evals.yaml, if present.
 
@@ -118,10 +487,21 @@ def load_evals(skill: Dict) -> Optional[Dict]:
     evals_path = Path(path_str) / "tests" / "evals.yaml"
     if not evals_path.exists():
         return None
+    cache = _evals_cache
     try:
-        with open(evals_path, "r", encoding="utf-8") as f:
-            data = yaml.safe_load(f) or {}
-        return data if isinstance(data, dict) else None
+        if cache is None:
+            with open(evals_path, "r", encoding="utf-8") as f:
+                data = safe_load(f) or {}
+            return data if isinstance(data, dict) else None
+        raw = evals_path.read_bytes()
+        digest = hashlib.sha256(raw).hexdigest()
+        entry = cache.get(digest)
+        if entry is not None:
+            return entry["evals"]
+        data = safe_load(raw.decode("utf-8")) or {}
+        evals = data if isinstance(data, dict) else None
+        cache.put(digest, evals)
+        return evals
     except Exception:
         return None
 
@@ -185,20 +565,17 @@ class AuditReport:
         return pairs
 
 
-def run_trigger_audit(
-    skills: List[Dict],
-    margin: float = DEFAULT_COLLISION_MARGIN,
-) -> AuditReport:
-    """Run the offline collision audit over every skill that ships an evals.yaml.
+# Below this many prompts the per-prompt loop beats building sparse matrices.
+SPARSE_MIN_PROMPTS = 512
+# Below this many prompts a process pool costs more to start than it saves.
+PARALLEL_MIN_PROMPTS = 256
+
+AUDIT_ENGINES = ("auto", "python", "sparse")
 
-    For each labeled `should_fire` prompt we check whether the owning skill tops
-    the library ranking, and whether any *other* skill scores within `margin` —
-    the honest signal here is collision between similar skills, not absolute
-    pass/fail.
-    """
-    index = build_index(skills)
-    results: List[PromptResult] = []
 
+def _audit_prompts(skills: List[Dict]) -> List[Tuple[str, str]]:
+    """(owning skill, prompt) for every `should_fire` prompt, in library order."""
+    prompts: List[Tuple[str, str]] = []
     for skill in skills:
         name = skill.get("name")
         if not name:
@@ -207,36 +584,156 @@ def run_trigger_audit(
         if not evals:
             continue
         for prompt in evals.get("should_fire", []) or []:
-            ranked = index.score(prompt)
-            if not ranked:
-                # The audited skill is always in the index, so this is
-                # unreachable today; guard against future refactors that could
-                # build the index from a different skill set.
-                continue
-            score_by_name = dict(ranked)
-            target_score = score_by_name.get(name, 0.0)
-            top_skill, top_score = ranked[0]
-            runner_up_skill, runner_up_score = (
-                ranked[1] if len(ranked) > 1 else (None, 0.0)
-            )
+            prompts.append((name, prompt))
+    return prompts
+
+
+def _score_prompt(
+    index: TriggerIndex, name: str, prompt: str, margin: float
+) -> Optional[PromptResult]:
+    ranked = index.score(prompt)
+    if not ranked:
+        # The audited skill is always in the index, so this is
+        # unreachable today; guard against future refactors that could
+        # build the index from a different skill set.
+        return None
+    score_by_name = dict(ranked)
+    target_score = score_by_name.get(name, 0.0)
+    top_skill, top_score = ranked[0]
+    runner_up_skill, runner_up_score = (
+        ranked[1] if len(ranked) > 1 else (None, 0.0)
+    )
+
+    collisions = [
+        (other, score)
+        for other, score in ranked
+        if other != name and score >= target_score - margin
+    ]
+
+    return PromptResult(
+        skill=name,
+        prompt=prompt,
+        target_score=target_score,
+        top_skill=top_skill,
+        top_score=top_score,
+        runner_up_skill=runner_up_skill,
+        runner_up_score=runner_up_score,
+        collisions=collisions,
+    )
+
+
+# (index, margin) for audit worker processes. Set in the parent right before a
+# fork-based pool starts so children inherit it without pickling; spawn-based
+# pools receive it once per worker through the initializer instead.
+_worker_state: Optional[Tuple[TriggerIndex, float]] = None
+
+
+def _init_audit_worker(index: TriggerIndex, margin: float) -> None:
+    global _worker_state
+    _worker_state = (index, margin)
+
+
+def _audit_shard(shard: List[Tuple[str, str]]) -> List[Optional[PromptResult]]:
+    index, margin = _worker_state
+    return [_score_prompt(index, name, prompt, margin) for name, prompt in shard]
+
+
+def _run_sharded(
+    index: TriggerIndex, prompts: List[Tuple[str, str]], margin: float, workers: int
+) -> Optional[List[Optional[PromptResult]]]:
+    """Score prompts on a process pool; None if a pool cannot be used.
+
+    Prompts are cut into contiguous shards and the shard results concatenated
+    in order, so the output is identical to the serial loop.
+    """
+    global _worker_state
+    # Compute derived weights once here rather than in every worker.
+    index._refresh()
+    n_shards = min(len(prompts), workers * 4)
+    step = -(-len(prompts) // n_shards)
+    shards = [prompts[i:i + step] for i in range(0, len(prompts), step)]
+
+    # fork is only safe (and the default) on Linux; macOS lists it but
+    # CPython deliberately defaults to spawn there.
+    if sys.platform.startswith("linux"):
+        context = multiprocessing.get_context("fork")
+        _worker_state = (index, margin)
+        pool_kwargs = {"mp_context": context}
+    else:
+        pool_kwargs = {"initializer": _init_audit_worker, "initargs": (index, margin)}
+    try:
+        with ProcessPoolExecutor(max_workers=workers, **pool_kwargs) as pool:
+            parts = list(pool.map(_audit_shard, shards))
+    except (OSError, BrokenProcessPool, PicklingError):
+        return None
+    finally:
+        _worker_state = None
+    return [result for part in parts for result in part]
 
-            collisions = [
-                (other, score)
-                for other, score in ranked
-                if other != name and score >= target_score - margin
-            ]
 
-            results.append(
-                PromptResult(
-                    skill=name,
-                    prompt=prompt,
-                    target_score=target_score,
-                    top_skill=top_skill,
-                    top_score=top_score,
-                    runner_up_skill=runner_up_skill,
-                    runner_up_score=runner_up_score,
-                    collisions=collisions,
-                )
-            )
+def run_trigger_audit(
+    skills: List[Dict],
+    margin: float = DEFAULT_COLLISION_MARGIN,
+    engine: str = "auto",
+    workers: Optional[int] = None,
+    scorer: str = "tfidf",
+) -> AuditReport:
+    """Run the offline collision audit over every skill that ships an evals.yaml.
 
+    For each labeled `should_fire` prompt we check whether the owning skill tops
+    the library ranking, and whether any *other* skill scores within `margin` —
+    the honest signal here is collision between similar skills, not absolute
+    pass/fail.
+
+    `engine` picks how prompts are scored: "python" loops over prompts,
+    "sparse" scores them all in one sparse matrix product (needs the optional
+    `audit` extra: numpy + scipy), and "auto" uses "sparse" for large audits
+    when it is installed.
+
+    `workers` > 1 shards the prompts of the Python engine across a process
+    pool (for audits of at least `PARALLEL_MIN_PROMPTS` prompts); results are
+    merged back in prompt order. The sparse engine is already batched and
+    ignores it.
+
+    `scorer` picks the ranking backend (see `ask.utils.eval.scorers`). The
+    sparse engine computes cosines, so non-cosine scorers (BM25) always use
+    the Python engine under "auto".
+    """
+    if engine not in AUDIT_ENGINES:
+        raise ValueError(f"Unknown audit engine {engine!r}; expected one of {AUDIT_ENGINES}")
+    index = build_index(skills, scorer=scorer)
+    with shared_evals_cache():
+        prompts = _audit_prompts(skills)
+    results = _score_prompts(index, prompts, margin, engine, workers)
     return AuditReport(results=results, margin=margin)
+
+
+def _score_prompts(
+    index: TriggerIndex,
+    prompts: List[Tuple[str, str]],
+    margin: float,
+    engine: str = "auto",
+    workers: Optional[int] = None,
+) -> List[PromptResult]:
+    """Score `(owning skill, prompt)` pairs with the requested engine."""
+    if engine == "sparse" and not index.cosine:
+        raise ValueError("The sparse audit engine only supports cosine scorers (tfidf, trigram).")
+    if engine != "python" and index.cosine:
+        from ask.utils.eval import sparse_audit
+
+        if engine == "sparse" and not sparse_audit.HAS_SPARSE:
+            raise ImportError(
+                "The sparse audit engine needs numpy and scipy. "
+                'Install them with: pip install "agent-skill-kit[audit]"'
+            )
+        if sparse_audit.HAS_SPARSE and (
+            engine == "sparse" or len(prompts) >= SPARSE_MIN_PROMPTS
+        ):
+            return sparse_audit.score_prompts(index, prompts, margin)
+
+    scored = None
+    if workers and workers > 1 and len(prompts) >= PARALLEL_MIN_PROMPTS:
+        scored = _run_sharded(index, prompts, margin, workers)
+    if scored is None:
+        scored = [_score_prompt(index, name, prompt, margin) for name, prompt in prompts]
+    return [result for result in scored if result is not None]
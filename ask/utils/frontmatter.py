@@ -0,0 +1,85 @@
+"""Streaming reader for SKILL.md YAML frontmatter.
+
+Listing, update scans and routing only need the small `---` fenced header at
+the top of a SKILL.md, never the instruction body. `read_frontmatter` reads
+line by line until the closing fence (bounded, so a file without one cannot
+pull megabytes into memory) and returns a lightweight header; the body is only
+read if someone explicitly asks for it.
+"""
+
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import yaml
+
+from ask.utils.yaml_loader import load_flat_yaml
+
+FENCE = "---"
+
+# Frontmatter is a handful of lines; anything bigger is not a header.
+MAX_FRONTMATTER_BYTES = 64 * 1024
+_MAX_LINE_BYTES = 8 * 1024
+
+_UNPARSED = object()
+
+
+class FrontmatterHeader:
+    """The `---` fenced header of a markdown file, without its body."""
+
+    __slots__ = ("path", "text", "body_offset", "_data")
+
+    def __init__(self, path: Path, text: str, body_offset: int):
+        self.path = path
+        self.text = text
+        self.body_offset = body_offset
+        self._data = _UNPARSED
+
+    @property
+    def lines(self) -> List[str]:
+        return self.text.splitlines()
+
+    @property
+    def data(self) -> Optional[Dict]:
+        """The header parsed as YAML (cached), or None if it is not a mapping."""
+        if self._data is _UNPARSED:
+            try:
+                parsed = load_flat_yaml(self.text)
+            except yaml.YAMLError:
+                parsed = None
+            self._data = parsed if isinstance(parsed, dict) else None
+        return self._data
+
+    def read_body(self) -> str:
+        """Read the markdown body that follows the closing fence."""
+        with open(self.path, "rb") as f:
+            f.seek(self.body_offset)
+            return f.read().decode("utf-8")
+
+
+def read_frontmatter(path: Path, max_bytes: int = MAX_FRONTMATTER_BYTES) -> Optional[FrontmatterHeader]:
+    """
+    Read only the frontmatter of `path`.
+
+    The first line must be a `---` fence; reading stops at the next line that
+    is exactly `---`. Returns None if the file has no frontmatter, the closing
+    fence is not found within `max_bytes`, or the file cannot be read.
+    """
+    try:
+        with open(path, "rb") as f:
+            first = f.readline(_MAX_LINE_BYTES)
+            if first.strip() != FENCE.encode():
+                return None
+            consumed = len(first)
+            lines = []
+            while consumed < max_bytes:
+                line = f.readline(_MAX_LINE_BYTES)
+                if not line:
+                    return None
+                consumed += len(line)
+                if line.strip() == FENCE.encode():
+                    text = b"".join(lines).decode("utf-8")
+                    return FrontmatterHeader(Path(path), text, consumed)
+                lines.append(line)
+            return None
+    except (OSError, UnicodeDecodeError):
+        return None
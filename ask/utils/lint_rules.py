@@ -0,0 +1,232 @@
+"""Language rules for `ask skill lint` and their single-pass scanner.
+
+Every rule is a case-insensitive regex with a message and a severity. All
+rules are compiled into ONE alternation, so a SKILL.md is scanned once no
+matter how many rules there are, and each violation is reported at the
+line/column of its first occurrence.
+
+Add your own rules in ~/.askconfig.yaml:
+
+    lint:
+      rules:
+        - pattern: '\\bsimply\\b'
+          message: "Contains 'simply' - cut filler words"
+          severity: warning      # or critical (the default)
+
+Entries without a pattern or message are ignored, and so are patterns that
+do not compile on their own or inside the alternation, or that use named
+groups, backreferences (group names and numbers change once the rules are
+combined) or inline global flags like `(?s)` (they would apply to every
+rule). Use a scoped group such as `(?s:...)` instead.
+"""
+
+import re
+import warnings
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ask.utils.config import get_config_value
+
+SEVERITIES = ("critical", "warning")
+
+
+@dataclass(frozen=True)
+class LintRule:
+    pattern: str
+    message: str
+    severity: str = "critical"
+
+
+@dataclass(frozen=True)
+class SchemaIssue:
+    severity: str
+    message: str
+    line: Optional[int] = None
+    col: Optional[int] = None
+
+    def as_tuple(self) -> Tuple[str, str]:
+        """`(severity, message)`, with the position appended when known."""
+        if self.line is None:
+            return self.severity, self.message
+        return self.severity, f"{self.message} (line {self.line}, col {self.col})"
+
+
+VERBOSE_RULES: Tuple[LintRule, ...] = (
+    LintRule(r"\bplease\b", "Contains 'please' - remove polite language"),
+    LintRule(r"\bit is important to\b", "Contains 'it is important to' - simplify"),
+    LintRule(r"\bwe recommend\b", "Contains 'we recommend' - use ✅ MUST instead"),
+    LintRule(r"\byou should\b", "Contains 'you should' - use ✅ MUST instead"),
+    LintRule(r"\bconsider using\b", "Contains 'consider using' - be directive"),
+)
+
+MAX_PARAGRAPH_SENTENCES = 3
+
+# Paragraph breaks and sentence ends, for the long-paragraph check.
+_STRUCTURE_RE = re.compile(r"(?P<para>\n\n)|[.!?]+")
+_LEADING_SPACE_RE = re.compile(r"\s*")
+# A whole-word phrase, `\bword word\b`, with nothing else special in it.
+_PHRASE_RE = re.compile(r"\\b[A-Za-z0-9][A-Za-z0-9 ]*\\b")
+# `\1`-style references (an odd number of backslashes before the digit) and
+# `(?(1)...)` conditionals.
+_BACKREFERENCE_RE = re.compile(r"(?<!\\)(?:\\\\)*\\[1-9]|\(\?\(")
+# Inline global flags such as `(?i)` or `(?s)`: inside the alternation they
+# would apply to every rule (and only warn, not fail, before Python 3.11).
+_GLOBAL_FLAGS_RE = re.compile(r"(?<!\\)(?:\\\\)*\(\?[aiLmsux]+\)")
+
+
+def position(content: str, offset: int) -> Tuple[int, int]:
+    """1-based (line, column) of `offset` in `content`."""
+    line_start = content.rfind("\n", 0, offset) + 1
+    return content.count("\n", 0, offset) + 1, offset - line_start + 1
+
+
+class SchemaScanner:
+    """All language rules compiled into one case-insensitive alternation.
+
+    Each rule is a named group, so a single `finditer` pass tells which rule
+    matched where. Plain whole-word phrases (`\\bwe recommend\\b`) sit
+    behind a lookahead on their first letters, which lets the engine skip
+    most positions without trying every branch.
+
+    Alternation matches never overlap, so a rule matching at the same
+    position as another, or starting inside another's match, would be
+    shadowed. After each hit, rules not found yet are tried on their own at
+    every position the hit covers: a short extra pass per hit, not per rule.
+    """
+
+    def __init__(self, rules: Iterable[LintRule]):
+        self.rules: List[LintRule] = list(rules)
+        self._rule_regexes = [re.compile(rule.pattern, re.IGNORECASE) for rule in self.rules]
+        phrases = [i for i, rule in enumerate(self.rules) if _PHRASE_RE.fullmatch(rule.pattern)]
+        branches = []
+        if phrases:
+            first = sorted({self.rules[i].pattern[2].lower() for i in phrases})
+            group = "|".join(f"(?P<r{i}>{self.rules[i].pattern})" for i in phrases)
+            branches.append(f"(?=[{''.join(first)}])(?:{group})")
+        branches.extend(
+            f"(?P<r{i}>{rule.pattern})" for i, rule in enumerate(self.rules) if i not in phrases
+        )
+        self._regex = re.compile("|".join(branches), re.IGNORECASE) if branches else None
+
+    def scan(self, content: str) -> List[SchemaIssue]:
+        """Rule violations (first occurrence of each, in rule order), then
+        the first paragraph longer than `MAX_PARAGRAPH_SENTENCES` sentences."""
+        issues = self._rule_issues(content)
+        long_paragraph = self._long_paragraph(content)
+        if long_paragraph is not None:
+            line, col = position(content, long_paragraph)
+            issues.append(
+                SchemaIssue(
+                    "warning",
+                    f"Contains paragraph with >{MAX_PARAGRAPH_SENTENCES} sentences "
+                    "- consider breaking up",
+                    line,
+                    col,
+                )
+            )
+        return issues
+
+    def _rule_issues(self, content: str) -> List[SchemaIssue]:
+        if self._regex is None:
+            return []
+        first: Dict[int, int] = {}  # rule id -> offset of first match
+        for match in self._regex.finditer(content):
+            first.setdefault(int(match.lastgroup[1:]), match.start())
+            for pos in range(match.start(), max(match.end(), match.start() + 1)):
+                for rule_id, regex in enumerate(self._rule_regexes):
+                    if rule_id not in first and regex.match(content, pos):
+                        first[rule_id] = pos
+            if len(first) == len(self.rules):
+                break
+        issues = []
+        for rule_id in sorted(first):
+            rule = self.rules[rule_id]
+            line, col = position(content, first[rule_id])
+            issues.append(SchemaIssue(rule.severity, rule.message, line, col))
+        return issues
+
+    @staticmethod
+    def _long_paragraph(content: str) -> Optional[int]:
+        """Start offset of the first over-long paragraph outside a code fence.
+
+        Paragraphs are the chunks between blank lines ("\\n\\n"); sentences
+        are runs of `.`, `!` or `?`.
+        """
+        start, sentences = 0, 0
+        for match in _STRUCTURE_RE.finditer(content):
+            if match.lastgroup == "para":
+                start, sentences = match.end(), 0
+                continue
+            sentences += 1
+            if sentences == MAX_PARAGRAPH_SENTENCES + 1:
+                text_start = _LEADING_SPACE_RE.match(content, start).end()
+                if not content.startswith("```", text_start):
+                    return text_start
+        return None
+
+
+def config_rules() -> List[LintRule]:
+    """Extra rules from `lint.rules` in ~/.askconfig.yaml (see module docs)."""
+    entries = get_config_value("lint.rules") or []
+    if not isinstance(entries, list):
+        return []
+    rules = []
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        pattern, message = entry.get("pattern"), entry.get("message")
+        if not (isinstance(pattern, str) and pattern and isinstance(message, str)):
+            continue
+        if not _valid_pattern(pattern):
+            continue
+        severity = entry.get("severity", "critical")
+        rules.append(LintRule(pattern, message, severity if severity in SEVERITIES else "critical"))
+    return rules
+
+
+def _valid_pattern(pattern: str) -> bool:
+    """Whether `pattern` can safely be one branch of the scanner's alternation."""
+    if _GLOBAL_FLAGS_RE.search(pattern):
+        return False
+    try:
+        # Alone: unbalanced parentheses (`foo)|(bar`) would escape the
+        # rule's group. In place: anything the combination breaks. Older
+        # Pythons only warn on some of these, so warnings count as errors.
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            alone = re.compile(pattern)
+            re.compile(f"(?P<r0>{pattern})|x")
+    except (re.error, DeprecationWarning, FutureWarning):
+        return False
+    return not alone.groupindex and not _BACKREFERENCE_RE.search(pattern)
+
+
+# Built on first use, once per process (config is read from disk).
+_scanner: Optional[SchemaScanner] = None
+
+
+def get_schema_scanner() -> SchemaScanner:
+    """The scanner for the built-in rules plus the configured ones."""
+    global _scanner
+    if _scanner is None:
+        extra = config_rules()
+        try:
+            _scanner = SchemaScanner(VERBOSE_RULES + tuple(extra))
+        except re.error:
+            # Rules valid on their own can still clash once combined: keep
+            # each configured rule only if the scanner still builds with it.
+            rules = list(VERBOSE_RULES)
+            for rule in extra:
+                try:
+                    SchemaScanner(rules + [rule])
+                except re.error:
+                    continue
+                rules.append(rule)
+            _scanner = SchemaScanner(rules)
+    return _scanner
+
+
+def reset_schema_scanner() -> None:
+    """Forget the built scanner so the next use re-reads the config."""
+    global _scanner
+    _scanner = None
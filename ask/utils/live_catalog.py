@@ -0,0 +1,344 @@
+"""Long-lived, self-refreshing skill catalog for `ask mcp serve`.
+
+A one-shot CLI command can afford `get_all_skills()` + `build_index()` per
+invocation; a long-running MCP server answering many calls cannot. The
+`LiveCatalog` loads the library once, then keeps it fresh incrementally:
+
+* On Linux it watches the skills directory, every category directory and
+  every skill directory with inotify (through ctypes — no extra dependency).
+  The inotify descriptor is non-blocking and drained at the start of each
+  call, so there is no watcher thread and an idle server does no work.
+* Elsewhere, or if watches cannot be added (e.g. the inotify watch limit is
+  exhausted), it falls back to polling: at most once per `poll_interval`
+  seconds it re-stamps the library (one scandir per skill, no YAML parsing).
+
+Either way only the skills whose files changed are re-parsed, and they are
+patched into the TF-IDF index one document at a time, so a query against an
+unchanged library costs an index lookup.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from ask.utils.eval.trigger_scorer import TriggerIndex, build_index
+from ask.utils.filesystem import get_skills_dir
+from ask.utils.skill_record import Skill
+from ask.utils.skill_registry import _list_category_dirs, _load_skill_dir, _scan_dir
+
+DEFAULT_POLL_INTERVAL = 1.0
+
+# <sys/inotify.h>
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_ISDIR = 0x40000000
+
+_WATCH_MASK = (
+    _IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO
+    | _IN_CREATE | _IN_DELETE | _IN_DELETE_SELF | _IN_MOVE_SELF | _IN_ONLYDIR
+)
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class _Inotify:
+    """Minimal non-blocking inotify wrapper. Raises OSError if unavailable."""
+
+    def __init__(self):
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._libc = libc
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+    def add_watch(self, path: str) -> int:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), _WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {path}")
+        return wd
+
+    def read_events(self):
+        """Yield (wd, mask, name) for every queued event, without blocking."""
+        while True:
+            try:
+                buf = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return
+            offset = 0
+            while offset < len(buf):
+                wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(buf, offset)
+                offset += _EVENT_HEADER.size
+                name = buf[offset:offset + length].rstrip(b"\0")
+                offset += length
+                yield wd, mask, os.fsdecode(name)
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class LiveCatalog:
+    """A skill catalog that tracks the filesystem incrementally.
+
+    Call sites read through `skills()`, `get()` and `index()`; each applies
+    pending changes first. `version` increments whenever the catalog content
+    changes, so callers can key derived data on it.
+    """
+
+    def __init__(
+        self,
+        skills_dir: Optional[Path] = None,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        use_inotify: bool = True,
+    ):
+        self.skills_dir = Path(skills_dir) if skills_dir is not None else get_skills_dir()
+        self.poll_interval = poll_interval
+        self.version = 0
+        self._records: Dict[str, Skill] = {}
+        self._stamps: Dict[str, List] = {}
+        # name -> skill paths carrying it; the first one wins, as in get_skill().
+        self._paths_by_name: Dict[str, List[str]] = {}
+        # scorer -> index, each built on first use and then patched in place.
+        self._indexes: Dict[str, TriggerIndex] = {}
+        self._lock = threading.RLock()
+        self._last_poll = 0.0
+        self._inotify: Optional[_Inotify] = None
+        self._watches: Dict[int, str] = {}
+        self._watched: Dict[str, int] = {}
+
+        if use_inotify:
+            try:
+                self._inotify = _Inotify()
+            except (OSError, AttributeError):
+                self._inotify = None
+        self._full_sync()
+
+    @property
+    def mode(self) -> str:
+        return "inotify" if self._inotify is not None else "poll"
+
+    def close(self) -> None:
+        with self._lock:
+            if self._inotify is not None:
+                self._inotify.close()
+                self._inotify = None
+            self._watches.clear()
+            self._watched.clear()
+
+    # -- public read API --------------------------------------------------
+
+    def skills(self) -> List[Skill]:
+        with self._lock:
+            self.refresh()
+            return list(self._records.values())
+
+    def get(self, name: str) -> Optional[Skill]:
+        with self._lock:
+            self.refresh()
+            paths = self._paths_by_name.get(name)
+            return self._records[paths[0]] if paths else None
+
+    def fingerprint(self, name: str) -> Optional[str]:
+        """A token that changes whenever `name`'s instruction body may have.
+
+        Built from the file stamps the catalog already tracks, so it costs no
+        I/O. None when the body is not covered by them (a README.md-only
+        skill), in which case callers must not cache it.
+        """
+        with self._lock:
+            self.refresh()
+            paths = self._paths_by_name.get(name)
+            if not paths:
+                return None
+            path = paths[0]
+            stamp = self._stamps.get(path)
+            if stamp is None or stamp[1] is None:  # [yaml, SKILL.md, sidecars]
+                return None
+            return f"{path}:{stamp}"
+
+    def index(self, scorer: str = "tfidf") -> TriggerIndex:
+        """The `scorer` index (TF-IDF by default) for the current catalog.
+
+        Built on first use, then updated in place as skills change.
+        """
+        with self._lock:
+            self.refresh()
+            index = self._indexes.get(scorer)
+            if index is None:
+                index = self._indexes[scorer] = build_index(
+                    [self._records[paths[0]] for paths in self._paths_by_name.values()],
+                    scorer=scorer,
+                )
+            return index
+
+    # -- change detection -------------------------------------------------
+
+    def refresh(self) -> None:
+        """Apply any filesystem changes observed since the last call."""
+        with self._lock:
+            if self._inotify is not None:
+                self._drain_events()
+            elif time.monotonic() - self._last_poll >= self.poll_interval:
+                self._full_sync()
+
+    def _drain_events(self) -> None:
+        root = str(self.skills_dir)
+        touched: Set[str] = set()
+        for wd, mask, name in self._inotify.read_events():
+            if mask & _IN_Q_OVERFLOW:
+                # Events were dropped; only a full resync is trustworthy.
+                self._full_sync()
+                return
+            base = self._watches.get(wd)
+            if base is None:
+                continue
+            if mask & _IN_IGNORED:
+                self._watches.pop(wd, None)
+                if self._watched.get(base) == wd:
+                    del self._watched[base]
+                continue
+            if base == root:
+                if name:
+                    touched.add(os.path.join(base, name))
+            elif base in self._stamps or not name or name == "skill.yaml":
+                # A change inside a skill, or a directory gaining/losing its
+                # skill.yaml: re-examine the watched directory itself.
+                touched.add(base)
+            else:
+                # An entry appeared or vanished inside a category.
+                touched.add(os.path.join(base, name))
+        for path in sorted(touched):
+            self._sync_path(path)
+
+    def _full_sync(self) -> None:
+        self._last_poll = time.monotonic()
+        try:
+            tops = _list_category_dirs(self.skills_dir)
+        except OSError:
+            tops = []
+        if self._inotify is not None:
+            self._watch(str(self.skills_dir))
+        live = set(tops)
+        for path in list(self._stamps):
+            if self._top_of(path) not in live:
+                self._drop(path)
+        for top in tops:
+            self._sync_top(top)
+
+    def _top_of(self, path: str) -> str:
+        rel = os.path.relpath(path, self.skills_dir)
+        return os.path.join(str(self.skills_dir), rel.split(os.sep, 1)[0])
+
+    def _sync_path(self, path: str) -> None:
+        if self._top_of(path) == path:
+            self._sync_top(path)
+        else:
+            self._sync_skill(path)
+
+    def _sync_top(self, top: str) -> None:
+        """Re-list one top-level entry (a category or a flat skill)."""
+        try:
+            listing, child_dirs = _scan_dir(top)
+        except OSError:
+            listing, child_dirs = None, []
+        if os.path.basename(top).startswith("."):
+            listing, child_dirs = None, []
+        keep = {listing.path} if listing is not None else set(child_dirs)
+        for path in list(self._stamps):
+            if (path == top or path.startswith(top + os.sep)) and path not in keep:
+                self._drop(path)
+        if self._inotify is not None and os.path.isdir(top):
+            self._watch(top)
+        if listing is not None:
+            self._apply(listing)
+            return
+        for child in child_dirs:
+            self._sync_skill(child)
+
+    def _sync_skill(self, path: str) -> None:
+        try:
+            listing, _ = _scan_dir(path)
+        except OSError:
+            listing = None
+        if listing is not None and not os.path.basename(path).startswith("."):
+            self._apply(listing)
+            return
+        self._drop(path)
+        if self._inotify is not None and os.path.isdir(path):
+            # Not a skill (yet): watch it so a later skill.yaml is noticed.
+            self._watch(path)
+
+    def _apply(self, listing) -> None:
+        if self._inotify is not None:
+            self._watch(listing.path)
+        if self._stamps.get(listing.path) == listing.stamp:
+            return
+        self._stamps[listing.path] = listing.stamp
+        self._set_record(listing.path, _load_skill_dir(listing))
+        self.version += 1
+
+    def _drop(self, path: str) -> None:
+        had_stamp = self._stamps.pop(path, None) is not None
+        had_record = path in self._records
+        self._set_record(path, None)
+        if had_record or had_stamp:
+            self.version += 1
+
+    def _set_record(self, path: str, skill: Optional[Skill]) -> None:
+        """Replace the record at `path` and patch the name map and index."""
+        old = self._records.pop(path, None)
+        old_name = old.get("name") if old else None
+        if old_name:
+            paths = self._paths_by_name[old_name]
+            paths.remove(path)
+            if not paths:
+                del self._paths_by_name[old_name]
+        new_name = skill.get("name") if skill else None
+        if skill:
+            self._records[path] = skill
+            if new_name:
+                self._paths_by_name.setdefault(new_name, []).append(path)
+        for index in self._indexes.values():
+            for name in {old_name, new_name} - {None}:
+                paths = self._paths_by_name.get(name)
+                if paths:
+                    index.update(self._records[paths[0]])
+                else:
+                    index.remove(name)
+
+    def _watch(self, path: str) -> None:
+        if path in self._watched:
+            return
+        try:
+            wd = self._inotify.add_watch(path)
+        except OSError as exc:
+            if exc.errno in (errno.ENOENT, errno.ENOTDIR):
+                return  # vanished between listing and watching
+            # Out of watches: degrade to polling rather than silently missing
+            # changes.
+            self._inotify.close()
+            self._inotify = None
+            self._watches.clear()
+            self._watched.clear()
+            return
+        self._watches[wd] = path
+        self._watched[path] = wd
@@ -8,10 +8,99 @@ on demand and use it inline; nothing is written to the filesystem.
 
 from __future__ import annotations
 
-from typing import Dict, List, Optional
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional
 
 from ask.utils.skill_registry import get_all_skills, get_skill, get_skill_readme
-from ask.utils.eval.trigger_scorer import build_index
+from ask.utils.eval.trigger_scorer import _TOKEN_RE, build_index
+from ask.utils.live_catalog import LiveCatalog
+
+SEARCH_CACHE_SIZE = 256
+# Entries hold whole instruction bodies, so this one is kept smaller.
+SKILL_CACHE_SIZE = 64
+
+# Set by `enable_live_catalog()` (the MCP server does this at startup). When
+# unset, every call reads skills from disk, which is what one-shot callers and
+# tests want.
+_live_catalog: Optional[LiveCatalog] = None
+
+# Search-result summaries of live-catalog skills by name, valid for one
+# catalog version (rebuilt lazily after any change).
+_summaries: Dict[str, Dict] = {}
+_summaries_version = -1
+
+
+class _LRUCache:
+    """A size-bounded mapping that evicts the least recently used entry."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+# Only used with the live catalog: its version (and per-skill fingerprints)
+# say when an entry went stale. Disk-backed calls have no such signal and are
+# never cached.
+_search_cache = _LRUCache(SEARCH_CACHE_SIZE)
+_skill_cache = _LRUCache(SKILL_CACHE_SIZE)
+
+
+def _reset_caches() -> None:
+    _summaries.clear()
+    _search_cache.clear()
+    _skill_cache.clear()
+
+
+def enable_live_catalog(skills_dir=None, **kwargs) -> LiveCatalog:
+    """Serve payloads from a self-refreshing in-memory catalog.
+
+    Meant for long-running processes: skills are loaded once and re-parsed
+    only when their files change, and the search index is rebuilt only when
+    the catalog does.
+    """
+    global _live_catalog
+    disable_live_catalog()
+    _live_catalog = LiveCatalog(skills_dir, **kwargs)
+    _reset_caches()
+    return _live_catalog
+
+
+def disable_live_catalog() -> None:
+    global _live_catalog
+    if _live_catalog is not None:
+        _live_catalog.close()
+        _live_catalog = None
+    _reset_caches()
 
 
 def _category(skill: Dict) -> str:
@@ -33,41 +122,81 @@ def _summary(skill: Dict) -> Dict:
     }
 
 
+def _live_summary(name: str) -> Optional[Dict]:
+    """`_summary` of the live catalog's skill `name`, memoized per version."""
+    global _summaries_version
+    if _live_catalog.version != _summaries_version:
+        _summaries.clear()
+        _summaries_version = _live_catalog.version
+    summary = _summaries.get(name)
+    if summary is None:
+        skill = _live_catalog.get(name)
+        if not skill:
+            return None
+        summary = _summaries[name] = _summary(skill)
+    return summary
+
+
 def list_skills_payload() -> List[Dict]:
     """Return the catalog of every skill (metadata only, no body)."""
-    skills = sorted(get_all_skills(), key=lambda s: s.get("name") or "")
+    catalog = _live_catalog.skills() if _live_catalog else get_all_skills()
+    skills = sorted(catalog, key=lambda s: s.get("name") or "")
     return [_summary(s) for s in skills]
 
 
-def search_skills_payload(query: str, limit: int = 5) -> List[Dict]:
+def search_skills_payload(query: str, limit: int = 5, scorer: str = "tfidf") -> List[Dict]:
     """Rank skills against a free-text query using the TF-IDF routing index.
 
     Returns the top `limit` matches with a relevance score. The same lexical
     index that powers `ask test` ranks here, so search and the trigger audit
-    agree on what a skill is "about".
+    agree on what a skill is "about". `scorer` selects another backend from
+    `ask.utils.eval.scorers.SCORERS` ("bm25", "trigram").
     """
-    # The index is rebuilt per call (re-reading skills from disk) on purpose:
-    # this backs a long-running MCP server where skills can change underneath
-    # it, and always-fresh results beat the staleness risk of a cached index.
-    # Build cost is small (token counting over a few dozen short docs).
+    # Under the MCP server the live catalog keeps the index in step with the
+    # filesystem, rebuilding it only when a skill changed, and summaries are
+    # reused until the catalog changes: a query costs its top-k retrieval,
+    # not a pass over the library, and a repeated query costs a cache lookup.
+    # Without it the index is rebuilt per call so results are never stale.
+    if _live_catalog is not None:
+        index = _live_catalog.index(scorer)
+        # Every scorer ranks on the lowercased [a-z0-9]+ words alone, so
+        # queries differing only in case, spacing or punctuation are one key.
+        key = (
+            " ".join(_TOKEN_RE.findall(query.lower())),
+            limit,
+            scorer,
+            _live_catalog.version,
+        )
+        cached = _search_cache.get(key)
+        if cached is None:
+            cached = _search(index, query, limit, _live_summary)
+            _search_cache.put(key, cached)
+        return [dict(entry) for entry in cached]
+
     skills = get_all_skills()
     if not skills:
         return []
-    index = build_index(skills)
+    index = build_index(skills, scorer=scorer)
     by_name = {s.get("name"): s for s in skills}
-    ranked = index.score(query)
+
+    def summary_of(name: str) -> Optional[Dict]:
+        skill = by_name.get(name)
+        return _summary(skill) if skill else None
+
+    return _search(index, query, limit, summary_of)
+
+
+def _search(index, query: str, limit: int, summary_of) -> List[Dict]:
     results: List[Dict] = []
-    for name, score in ranked:
+    for name, score in index.score_top_k(query, limit):
         if score <= 0:
+            break
+        summary = summary_of(name)
+        if not summary:
             continue
-        skill = by_name.get(name)
-        if not skill:
-            continue
-        entry = _summary(skill)
+        entry = dict(summary)
         entry["score"] = round(score, 4)
         results.append(entry)
-        if len(results) >= limit:
-            break
     return results
 
 
@@ -76,9 +205,37 @@ def get_skill_payload(name: str) -> Optional[Dict]:
 
     Returns None if no skill matches `name`.
     """
-    skill = get_skill(name)
+    if _live_catalog is None:
+        return _skill_payload(get_skill(name))
+    fingerprint = _live_catalog.fingerprint(name)
+    if fingerprint is None:
+        return _skill_payload(_live_catalog.get(name))
+    key = (name, fingerprint)
+    payload = _skill_cache.get(key)
+    if payload is None:
+        payload = _skill_payload(_live_catalog.get(name))
+        if payload is None:
+            return None
+        _skill_cache.put(key, payload)
+    return dict(payload)
+
+
+def _skill_payload(skill: Optional[Dict]) -> Optional[Dict]:
     if not skill:
         return None
     payload = _summary(skill)
     payload["content"] = get_skill_readme(skill) or ""
     return payload
+
+
+def cache_stats_payload() -> Dict:
+    """Hit/miss counters and sizes of the provider's query caches.
+
+    The caches are only active under the live catalog (`ask mcp serve`).
+    """
+    return {
+        "live_catalog": _live_catalog is not None,
+        "catalog_version": _live_catalog.version if _live_catalog is not None else None,
+        "search_skills": _search_cache.stats(),
+        "get_skill": _skill_cache.stats(),
+    }
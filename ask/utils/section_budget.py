@@ -0,0 +1,148 @@
+"""Section-level token budget of a SKILL.md (`ask skill profile SKILL_NAME`).
+
+`analyze_skill` answers "is this skill over budget?"; this module answers
+"which part put it there?". A SKILL.md is read line by line and cut into
+chunks:
+
+    frontmatter  the leading `---` YAML block
+    section      a Markdown heading, or a top-level block tag such as
+                 `<critical_constraints>` ... `</critical_constraints>`, with
+                 the text that follows it
+    code         a fenced code block (``` or ~~~), titled by its language
+
+Each chunk gets its token count and the cumulative prefix cost: what an
+agent pays to read the file up to and including it. A chunk's status is the
+budget status of that prefix, so the first non-"ok" chunk is the one that
+pushed the skill over its limit.
+
+Counts go through the token-count cache, which is keyed by content hash, so
+after editing one section only that section is re-tokenized.
+"""
+
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from ask.utils.token_analyzer import _token_limits, count_tokens, shared_token_cache
+
+_HEADING_RE = re.compile(r"#{1,6}\s+\S")
+_OPEN_TAG_RE = re.compile(r"<([A-Za-z][\w-]*)>\s*$")
+_FENCE_RE = re.compile(r"\s*(`{3,}|~{3,})\s*([^`\s]*)")
+
+
+@dataclass(frozen=True)
+class SkillSection:
+    kind: str  # "frontmatter", "section" or "code"
+    title: str
+    line: int  # 1-based line the chunk starts on
+    tokens: int
+    cumulative: int
+    status: str  # "ok", "warning" or "error", for the cumulative cost
+
+
+def iter_chunks(lines: Iterable[str]) -> Iterator[Tuple[str, str, int, str]]:
+    """Yield `(kind, title, line, text)` chunks as soon as each one ends.
+
+    Headings inside a block tag do not start a new section (the tag block is
+    the section); code fences always get their own chunk. Text after a fence
+    or a closing tag continues under the enclosing section's title.
+    Whitespace-only chunks are skipped.
+    """
+    heading = ""  # title of the last Markdown heading
+    open_tag: Optional[str] = None
+    fence: Optional[str] = None
+    in_frontmatter = False
+    kind, title, start, buf = "section", "", 1, []
+
+    def flush():
+        text = "".join(buf)
+        buf.clear()
+        return (kind, title, start, text) if text.strip() else None
+
+    for lineno, line in enumerate(lines, 1):
+        stripped = line.strip()
+        boundary = None
+        if in_frontmatter:
+            buf.append(line)
+            if stripped == "---":
+                in_frontmatter = False
+                boundary = "after"
+        elif fence is not None:
+            buf.append(line)
+            if stripped.startswith(fence) and not stripped.strip(fence[0]):
+                fence = None
+                boundary = "after"
+        elif lineno == 1 and stripped == "---":
+            in_frontmatter = True
+            kind, title, start = "frontmatter", "frontmatter", lineno
+            buf.append(line)
+        else:
+            fence_match = _FENCE_RE.match(line)
+            tag_match = _OPEN_TAG_RE.match(line) if open_tag is None else None
+            if fence_match:
+                boundary = ("code", fence_match.group(2) or "code")
+                fence = fence_match.group(1)
+            elif tag_match:
+                open_tag = tag_match.group(1)
+                boundary = ("section", f"<{open_tag}>")
+            elif open_tag is None and _HEADING_RE.match(line):
+                heading = stripped
+                boundary = ("section", heading)
+            elif open_tag is not None and stripped == f"</{open_tag}>":
+                open_tag = None
+                buf.append(line)
+                boundary = "after"
+            else:
+                buf.append(line)
+
+            if isinstance(boundary, tuple):
+                chunk = flush()
+                if chunk:
+                    yield chunk
+                (kind, title), start = boundary, lineno
+                buf.append(line)
+                boundary = None
+
+        if boundary == "after":
+            chunk = flush()
+            if chunk:
+                yield chunk
+            kind, start = "section", lineno + 1
+            title = f"<{open_tag}>" if open_tag is not None else heading
+
+    chunk = flush()
+    if chunk:
+        yield chunk
+
+
+def iter_section_budget(
+    lines: Iterable[str], limits: Tuple[int, int] = (500, 700)
+) -> Iterator[SkillSection]:
+    """Token count, prefix cost and budget status of each chunk, streamed.
+
+    `limits` is the (recommended, hard) token budget, as in `analyze_skill`.
+    """
+    limit_ok, limit_warn = limits
+    cumulative = 0
+    for kind, title, line, text in iter_chunks(lines):
+        tokens = count_tokens(text)
+        cumulative += tokens
+        if cumulative <= limit_ok:
+            status = "ok"
+        elif cumulative <= limit_warn:
+            status = "warning"
+        else:
+            status = "error"
+        yield SkillSection(kind, title, line, tokens, cumulative, status)
+
+
+def analyze_sections(skill_path: Path) -> List[SkillSection]:
+    """Section-level budget of a SKILL.md, against the skill's own limits.
+
+    Per-chunk counts can differ slightly in sum from `analyze_skill`'s
+    whole-file count (blank lines between chunks, merges across boundaries).
+    """
+    limits = _token_limits(skill_path.parent.name)
+    with shared_token_cache(), open(skill_path, encoding="utf-8") as lines:
+        return list(iter_section_budget(lines, limits))
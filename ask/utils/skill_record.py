@@ -0,0 +1,146 @@
+"""Compact in-memory record for a parsed skill.
+
+The registry used to hand out one free-form dict per skill. `Skill` keeps the
+well-known fields in `__slots__` (no per-instance `__dict__`, no hash lookup
+for attribute reads) and interns the short strings that repeat across a
+catalog (category, version, agent and tag names), so a catalog of thousands of
+skills shares one copy of "claude" instead of thousands.
+
+It is also a full `MutableMapping` over the historic dict keys — `name`,
+`description`, `_path`, `_instruction_file`, `_scripts`, ... — so adapters and
+commands that do `skill.get("_path")` or `{**skill}` keep working unchanged.
+Unknown `skill.yaml` keys live in an overflow dict and behave the same way.
+
+Attribute access (`skill.name`, `skill.path`) is for reads and yields None for
+absent fields; writes should go through the mapping interface so key presence
+stays accurate.
+"""
+
+import sys
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, Optional
+
+# (mapping key, slot name), in iteration order.
+_FIELDS = (
+    ("name", "name"),
+    ("version", "version"),
+    ("description", "description"),
+    ("category", "category"),
+    ("agents", "agents"),
+    ("tags", "tags"),
+    ("triggers", "triggers"),
+    ("depends_on", "depends_on"),
+    ("_path", "path"),
+    ("_instruction_file", "instruction_file"),
+    ("_reference", "reference"),
+    ("_examples", "examples"),
+    ("_scripts", "scripts"),
+)
+_KEY_SLOT = {key: (slot, 1 << i) for i, (key, slot) in enumerate(_FIELDS)}
+
+_INTERNED_SCALARS = frozenset(("category", "version"))
+_INTERNED_LISTS = frozenset(("agents", "tags"))
+
+
+def _intern(key: str, value: Any) -> Any:
+    if key in _INTERNED_SCALARS and isinstance(value, str):
+        return sys.intern(value)
+    if key in _INTERNED_LISTS and isinstance(value, list):
+        return [sys.intern(v) if isinstance(v, str) else v for v in value]
+    return value
+
+
+class Skill(MutableMapping):
+    """A parsed skill: slotted fields plus a dict-compatible view."""
+
+    __slots__ = tuple(slot for _, slot in _FIELDS) + ("extra", "_present")
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None):
+        for _, slot in _FIELDS:
+            setattr(self, slot, None)
+        self.extra: Optional[Dict[str, Any]] = None
+        self._present = 0
+        if data:
+            for key, value in data.items():
+                self[key] = value
+
+    @classmethod
+    def from_dict(cls, data: Any) -> Optional["Skill"]:
+        """Build a Skill from parsed YAML, or None if it is not a mapping."""
+        if isinstance(data, cls):
+            return data
+        if not isinstance(data, dict):
+            return None
+        return cls(data)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """A plain dict copy (for JSON caches and payloads)."""
+        return dict(self.items())
+
+    def __reduce__(self):
+        return (Skill, (self.to_dict(),))
+
+    def __getitem__(self, key: str) -> Any:
+        field = _KEY_SLOT.get(key)
+        if field is not None:
+            slot, bit = field
+            if self._present & bit:
+                return getattr(self, slot)
+            raise KeyError(key)
+        if self.extra is not None and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        # Overridden so misses do not pay for a KeyError round trip.
+        field = _KEY_SLOT.get(key)
+        if field is not None:
+            slot, bit = field
+            return getattr(self, slot) if self._present & bit else default
+        if self.extra is not None:
+            return self.extra.get(key, default)
+        return default
+
+    def __contains__(self, key: object) -> bool:
+        field = _KEY_SLOT.get(key)
+        if field is not None:
+            return bool(self._present & field[1])
+        return self.extra is not None and key in self.extra
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        field = _KEY_SLOT.get(key)
+        if field is not None:
+            slot, bit = field
+            setattr(self, slot, _intern(key, value))
+            self._present |= bit
+            return
+        if self.extra is None:
+            self.extra = {}
+        self.extra[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        field = _KEY_SLOT.get(key)
+        if field is not None:
+            slot, bit = field
+            if not self._present & bit:
+                raise KeyError(key)
+            setattr(self, slot, None)
+            self._present &= ~bit
+            return
+        if self.extra is None or key not in self.extra:
+            raise KeyError(key)
+        del self.extra[key]
+
+    def __iter__(self) -> Iterator[str]:
+        present = self._present
+        for key, (_slot, bit) in _KEY_SLOT.items():
+            if present & bit:
+                yield key
+        if self.extra:
+            yield from self.extra
+
+    def __len__(self) -> int:
+        return bin(self._present).count("1") + (len(self.extra) if self.extra else 0)
+
+    def __repr__(self) -> str:
+        return f"Skill({self.to_dict()!r})"
@@ -1,39 +1,241 @@
 """Skill registry utilities for discovering and parsing skills."""
 
+import os
 from pathlib import Path
-from typing import List, Dict, Optional
-
-import yaml
+from typing import List, Dict, NamedTuple, Optional, Tuple
 
+from ask.utils.cache import (
+    CatalogCache,
+    file_stamp,
+    load_name_index,
+    save_name_index,
+    stat_or_none,
+)
+from ask.utils.concurrency import parallel_map
+from ask.utils.config import get_config_value
 from ask.utils.filesystem import get_skills_dir
+from ask.utils.frontmatter import read_frontmatter
+from ask.utils.skill_record import Skill
+from ask.utils.yaml_loader import load_flat_yaml
+
+# Below this many skills, thread start-up costs more than the I/O it overlaps.
+PARALLEL_MIN_SKILLS = 64
+PARALLEL_MIN_CATEGORIES = 8
+# Uncached skills needed before parsing moves to a process pool (YAML parsing
+# is CPU-bound and holds the GIL, so only processes actually scale it).
+PROCESS_POOL_MIN_SKILLS = 256
+DEFAULT_MAX_WORKERS = 8
+
+# Per-process name -> skill path index, keyed by skills directory. Mirrored to
+# disk next to the catalog cache so a fresh process can skip the full scan too.
+_NAME_INDEX: Dict[str, Dict[str, str]] = {}
+# Per-process names `get_skill` found in no skill, keyed by skills directory,
+# with the `_tree_stamp` they were looked up against.
+_MISSED_NAMES: Dict[str, Tuple[List, set]] = {}
 
 
 def _parse_skill_md_frontmatter(skill_md_path: Path) -> Optional[Dict]:
     """
     Parse YAML frontmatter from a SKILL.md file.
     
+    Only the header is read (see `ask.utils.frontmatter`); the instruction
+    body is left on disk until `get_skill_readme` asks for it.
+    
     Returns the frontmatter as a dict, or None if parsing fails.
     """
+    header = read_frontmatter(skill_md_path)
+    return header.data if header is not None else None
+
+
+# Sidecar bits recorded in SkillDirListing.sidecars (and in cache stamps).
+_HAS_README = 1
+_HAS_REFERENCE = 2
+_HAS_EXAMPLES = 4
+_HAS_SCRIPTS = 8
+
+_SIDECAR_FILES = {
+    "README.md": _HAS_README,
+    "reference.md": _HAS_REFERENCE,
+    "examples.md": _HAS_EXAMPLES,
+}
+
+
+class SkillDirListing(NamedTuple):
+    """
+    Everything discovery learns from a single `os.scandir` of a skill directory.
+    
+    Plain data (no DirEntry objects) so it can be pickled to a process pool.
+    """
+    path: str
+    yaml_stamp: List[int]
+    md_stamp: Optional[List[int]]
+    sidecars: int
+    
+    @property
+    def stamp(self) -> List:
+        """Cache stamp covering every input of `_load_skill_dir`."""
+        return [self.yaml_stamp, self.md_stamp, self.sidecars]
+
+
+def _entry_stamp(entry: os.DirEntry) -> Optional[List[int]]:
     try:
-        content = skill_md_path.read_text(encoding="utf-8")
-        if not content.startswith("---"):
-            return None
-        
-        # Find closing ---
-        end_idx = content.find("---", 3)
-        if end_idx == -1:
+        return file_stamp(entry.stat())
+    except OSError:
+        return None
+
+
+def _scan_dir(path: str) -> Tuple[Optional[SkillDirListing], List[str]]:
+    """
+    Read a directory once and classify it.
+    
+    Returns (listing, child_dirs): `listing` is set when the directory holds a
+    skill.yaml, and `child_dirs` are its visible subdirectories (used when it
+    turns out to be a category). Only skill.yaml and SKILL.md are stat'ed, for
+    their cache stamps; every other flag comes straight from the DirEntry list.
+    """
+    yaml_stamp = None
+    md_stamp = None
+    sidecars = 0
+    child_dirs = []
+    with os.scandir(path) as it:
+        for entry in it:
+            name = entry.name
+            if name == "skill.yaml":
+                yaml_stamp = _entry_stamp(entry)
+            elif name == "SKILL.md":
+                md_stamp = _entry_stamp(entry)
+            elif name in _SIDECAR_FILES:
+                sidecars |= _SIDECAR_FILES[name]
+            elif not name.startswith("."):
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    continue
+                if is_dir:
+                    if name == "scripts":
+                        sidecars |= _HAS_SCRIPTS
+                    child_dirs.append(entry.path)
+    if yaml_stamp is None:
+        return None, child_dirs
+    return SkillDirListing(path, yaml_stamp, md_stamp, sidecars), child_dirs
+
+
+def _load_skill_dir(listing: SkillDirListing) -> Optional[Skill]:
+    """
+    Parse one skill directory (skill.yaml, SKILL.md frontmatter, sidecars).
+    
+    Sidecar detection reuses the flags gathered by `_scan_dir`, so this only
+    touches the filesystem to read skill.yaml and the SKILL.md frontmatter.
+    
+    Returns the skill dict, or None if the directory is not a valid skill.
+    """
+    try:
+        s_dir = listing.path
+        skill = Skill.from_dict(parse_skill(Path(os.path.join(s_dir, "skill.yaml"))))
+        if not skill:
             return None
-        
-        frontmatter_text = content[3:end_idx].strip()
-        return yaml.safe_load(frontmatter_text)
+        skill["_path"] = s_dir
+        # Detect instruction file (prefer SKILL.md)
+        if listing.md_stamp is not None:
+            skill_md = os.path.join(s_dir, "SKILL.md")
+            skill["_instruction_file"] = skill_md
+            frontmatter = _parse_skill_md_frontmatter(Path(skill_md))
+            if frontmatter:
+                if "triggers" in frontmatter:
+                    skill["triggers"] = frontmatter["triggers"]
+                if "description" in frontmatter and not skill.get("description"):
+                    skill["description"] = frontmatter["description"]
+        elif listing.sidecars & _HAS_README:
+            skill["_instruction_file"] = os.path.join(s_dir, "README.md")
+            
+        # Detect sidecars
+        if listing.sidecars & _HAS_REFERENCE:
+            skill["_reference"] = os.path.join(s_dir, "reference.md")
+        if listing.sidecars & _HAS_EXAMPLES:
+            skill["_examples"] = os.path.join(s_dir, "examples.md")
+        if listing.sidecars & _HAS_SCRIPTS:
+            skill["_scripts"] = os.path.join(s_dir, "scripts")
+            
+        return skill
     except Exception:
         return None
 
-def get_all_skills(base_path: Optional[Path] = None) -> List[Dict]:
+
+def _scan_category(category_dir: str) -> List[SkillDirListing]:
+    """
+    List the skills inside one top-level entry of the skills directory.
+    
+    Returns listings in directory order. A top-level entry with its own
+    skill.yaml is a skill itself (flat layouts, common in remote git
+    repositories); otherwise it is a category of skills.
+    """
+    found = []
+    try:
+        listing, child_dirs = _scan_dir(category_dir)
+    except (PermissionError, OSError):
+        return found
+    if listing is not None:
+        return [listing]
+    
+    for skill_dir in child_dirs:
+        try:
+            listing, _ = _scan_dir(skill_dir)
+        except (PermissionError, OSError):
+            continue
+        if listing is not None:
+            found.append(listing)
+    return found
+
+
+def _list_category_dirs(skills_dir: Path) -> List[str]:
+    category_dirs = []
+    with os.scandir(skills_dir) as it:
+        for entry in it:
+            if entry.name.startswith("."):
+                continue
+            try:
+                if entry.is_dir():
+                    category_dirs.append(entry.path)
+            except OSError:
+                continue
+    return category_dirs
+
+
+def _resolve_workers(workers: Optional[int]) -> int:
+    """
+    Worker count for concurrent discovery.
+    
+    Explicit argument wins, then `registry.workers` in ~/.askconfig.yaml,
+    then a small CPU-bound default. 0 or 1 means serial.
+    """
+    if workers is None:
+        workers = get_config_value("registry.workers")
+    if workers is None:
+        return min(DEFAULT_MAX_WORKERS, os.cpu_count() or 1)
+    try:
+        return max(int(workers), 1)
+    except (TypeError, ValueError):
+        return 1
+
+
+def get_all_skills(
+    base_path: Optional[Path] = None,
+    use_cache: bool = True,
+    workers: Optional[int] = None,
+) -> List[Skill]:
     """
     Discover and parse all skills in the given directory (defaults to local skills directory).
     
-    Returns a list of skill dictionaries with their metadata.
+    Parsed records are served from the on-disk catalog cache (see
+    `ask.utils.cache.CatalogCache`) when none of their files changed, so only
+    new or edited skills pay for YAML parsing.
+    
+    Each skill directory is read with a single `os.scandir`; sidecar flags and
+    cache stamps are derived from that listing. Libraries with many categories
+    are scanned on a thread pool, and big batches of uncached skills are parsed
+    in a process pool. Output order is identical in every mode.
+    
+    Returns a list of `Skill` records (dict-compatible) with their metadata.
     """
     skills_dir = base_path if base_path is not None else get_skills_dir()
     skills = []
@@ -41,82 +243,135 @@ def get_all_skills(base_path: Optional[Path] = None) -> List[Dict]:
     if not skills_dir.exists():
         return skills
     
-    # Walk through category directories or skill directories
-    for category_dir in skills_dir.iterdir():
-        if not category_dir.is_dir() or category_dir.name.startswith("."):
-            continue
-            
-        def _parse_and_add(s_dir):
-            try:
-                skill_yaml = s_dir / "skill.yaml"
-                if not skill_yaml.exists():
-                    return
-                skill = parse_skill(skill_yaml)
-                if skill:
-                    skill["_path"] = str(s_dir)
-                    # Detect instruction file (prefer SKILL.md)
-                    skill_md = s_dir / "SKILL.md"
-                    readme_md = s_dir / "README.md"
-                    if skill_md.exists():
-                        skill["_instruction_file"] = str(skill_md)
-                        frontmatter = _parse_skill_md_frontmatter(skill_md)
-                        if frontmatter:
-                            if "triggers" in frontmatter:
-                                skill["triggers"] = frontmatter["triggers"]
-                            if "description" in frontmatter and not skill.get("description"):
-                                skill["description"] = frontmatter["description"]
-                    elif readme_md.exists():
-                        skill["_instruction_file"] = str(readme_md)
-                        
-                    # Detect sidecars
-                    ref_md = s_dir / "reference.md"
-                    if ref_md.exists():
-                        skill["_reference"] = str(ref_md)
-                        
-                    ex_md = s_dir / "examples.md"
-                    if ex_md.exists():
-                        skill["_examples"] = str(ex_md)
-                        
-                    # Detect scripts
-                    scripts_dir = s_dir / "scripts"
-                    if scripts_dir.exists() and scripts_dir.is_dir():
-                        skill["_scripts"] = str(scripts_dir)
-                        
-                    skills.append(skill)
-            except Exception:
-                pass
-
-        if (category_dir / "skill.yaml").exists():
-            # This directory is a skill itself
-            _parse_and_add(category_dir)
+    workers = _resolve_workers(workers)
+    cache = CatalogCache(skills_dir, enabled=None if use_cache else False)
+    
+    category_dirs = _list_category_dirs(skills_dir)
+    if workers > 1 and len(category_dirs) >= PARALLEL_MIN_CATEGORIES:
+        listed = parallel_map(_scan_category, category_dirs, workers)
+    else:
+        listed = [_scan_category(d) for d in category_dirs]
+    candidates = [listing for group in listed for listing in group]
+    
+    records: List[Optional[Skill]] = [None] * len(candidates)
+    dirty = []
+    for i, listing in enumerate(candidates):
+        entry = cache.get(listing.path, listing.stamp)
+        if entry is not None:
+            records[i] = Skill.from_dict(entry["skill"])
         else:
-            # Assume it is a category directory containing skills
-            try:
-                for skill_dir in category_dir.iterdir():
-                    try:
-                        if not skill_dir.is_dir() or skill_dir.name.startswith("."):
-                            continue
-                        _parse_and_add(skill_dir)
-                    except (PermissionError, OSError):
-                        continue
-            except (PermissionError, OSError):
-                continue
+            dirty.append(i)
     
+    dirty_listings = [candidates[i] for i in dirty]
+    if workers > 1 and len(dirty_listings) >= PARALLEL_MIN_SKILLS:
+        parsed = parallel_map(
+            _load_skill_dir,
+            dirty_listings,
+            workers,
+            use_processes=len(dirty_listings) >= PROCESS_POOL_MIN_SKILLS,
+        )
+    else:
+        parsed = [_load_skill_dir(listing) for listing in dirty_listings]
+    for i, skill in zip(dirty, parsed):
+        records[i] = skill
+        cache.put(candidates[i].path, candidates[i].stamp, skill.to_dict() if skill else None)
+    
+    skills = [skill for skill in records if skill]
+    cache.save()
+    _update_name_index(skills_dir, skills, persist=use_cache)
     return skills
 
 
-def get_skill(name: str) -> Optional[Dict]:
+def _update_name_index(skills_dir: Path, skills: List[Dict], persist: bool = True) -> None:
+    """
+    Record name -> path for a full scan (first occurrence wins, like get_skill).
+    
+    With `persist=False` (a `use_cache=False` scan) neither copy of the index
+    is written; a changed library still invalidates remembered misses.
+    """
+    names: Dict[str, str] = {}
+    for skill in skills:
+        name = skill.get("name")
+        if isinstance(name, str):
+            names.setdefault(name, skill["_path"])
+    key = str(skills_dir)
+    if key not in _NAME_INDEX:
+        # Seed from disk so a fresh process only rewrites an index that changed.
+        _NAME_INDEX[key] = load_name_index(skills_dir)
+    if _NAME_INDEX[key] == names:
+        return
+    _MISSED_NAMES.pop(key, None)
+    if persist:
+        _NAME_INDEX[key] = names
+        save_name_index(skills_dir, names)
+
+
+def _tree_stamp(skills_dir: Path) -> Optional[List]:
+    """
+    Which skill.yaml files exist under `skills_dir`, with their stat stamps.
+    
+    Covers everything a skill's name comes from: a skill added, removed,
+    moved or renamed changes it. Costs one scandir per top-level entry and a
+    stat per candidate skill.yaml, with no parsing. None if unreadable.
+    """
+    stamp = []
+    try:
+        for category_dir in sorted(_list_category_dirs(skills_dir)):
+            dirs = [category_dir]
+            with os.scandir(category_dir) as it:
+                dirs.extend(sorted(entry.path for entry in it if entry.is_dir()))
+            for d in dirs:
+                stamp.append([d, file_stamp(stat_or_none(os.path.join(d, "skill.yaml")))])
+    except OSError:
+        return None
+    return stamp
+
+
+def _load_indexed_skill(skill_path: str) -> Optional[Skill]:
+    try:
+        listing, _ = _scan_dir(skill_path)
+    except (PermissionError, OSError):
+        return None
+    return _load_skill_dir(listing) if listing is not None else None
+
+
+def get_skill(name: str, base_path: Optional[Path] = None) -> Optional[Skill]:
     """
     Get a specific skill by name.
     
-    Searches through all categories to find a skill with the matching name.
+    Looks the name up in the name -> path index and parses only that skill.
+    Unknown names and stale index entries (a skill renamed or moved) fall
+    back to a full scan, which also refreshes the index. A name the scan did
+    not find either is remembered against `_tree_stamp`, so asking again for
+    it skips the scan until a skill.yaml is added, removed or edited.
     """
-    all_skills = get_all_skills()
+    skills_dir = base_path if base_path is not None else get_skills_dir()
+    key = str(skills_dir)
+    if key not in _NAME_INDEX:
+        _NAME_INDEX[key] = load_name_index(skills_dir)
+    
+    indexed_path = _NAME_INDEX[key].get(name)
+    if indexed_path:
+        skill = _load_indexed_skill(indexed_path)
+        if skill and skill.get("name") == name:
+            return skill
+    
+    stamp = _tree_stamp(skills_dir)
+    missed = _MISSED_NAMES.get(key)
+    if stamp is not None and missed is not None and missed[0] == stamp and name in missed[1]:
+        return None
+    
+    all_skills = get_all_skills(skills_dir)
     
     for skill in all_skills:
         if skill.get("name") == name:
             return skill
     
+    if stamp is not None:
+        missed = _MISSED_NAMES.get(key)
+        if missed is None or missed[0] != stamp:
+            missed = _MISSED_NAMES[key] = (stamp, set())
+        missed[1].add(name)
     return None
 
 
@@ -126,7 +381,7 @@ def parse_skill(skill_yaml_path: Path) -> Optional[Dict]:
     """
     try:
         with open(skill_yaml_path, "r", encoding="utf-8") as f:
-            return yaml.safe_load(f)
+            return load_flat_yaml(f.read())
     except Exception:
         return None
 
@@ -163,7 +418,7 @@ def resolve_dependencies(skill_name: str, resolved: List[str] = None, seen: List
     if seen is None:
         seen = []
     
-    # Use provided map or fallback to slow lookup
+    # Use provided map or fall back to the indexed per-skill lookup
     if skill_map:
         skill = skill_map.get(skill_name)
     else:
@@ -1,18 +1,176 @@
 """Token analysis utilities for skill optimization."""
 
-import re
+import base64
+import hashlib
+import os
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 
-# Try to import tiktoken, fallback to estimation if not available or offline
-try:
-    import tiktoken
-    _encoder = tiktoken.get_encoding("cl100k_base")
-    HAS_TIKTOKEN = True
-except (ImportError, Exception):
-    # Fallback if not installed or if network error prevents downloading encoding
-    _encoder = None
-    HAS_TIKTOKEN = False
+from ask.utils.cache import TokenCountCache
+from ask.utils.concurrency import parallel_map
+from ask.utils.config import get_config_value
+from ask.utils.lint_rules import get_schema_scanner
+
+ENCODING_NAME = "cl100k_base"
+
+# The cl100k_base definition, copied from `cl100k_base()` in tiktoken's
+# `tiktoken_ext/openai_public.py` (source URL, sha256 of the ranks file, split
+# pattern, special tokens), for building the encoding from a local ranks file
+# (see `_encoding_from_dir`). That constructor cannot be reused as is: it
+# always loads the ranks through tiktoken's own cache or a download.
+# tests/test_token_analyzer.py pins these against the installed tiktoken.
+_CL100K_URL = "https://openaipublic.blob.core.windows.net/encodings/cl100k_base.tiktoken"
+_CL100K_SHA256 = "223921b76ee99bde995b7ff738513eef100fb51d18c93597a113bcffe865b2a7"
+_CL100K_PATTERN = (
+    r"""'(?i:[sdmt]|ll|ve|re)|[^\r\n\p{L}\p{N}]?+\p{L}++|\p{N}{1,3}+| ?[^\s\p{L}\p{N}]++[\r\n]*+"""
+    r"""|\s++$|\s*[\r\n]|\s+(?!\S)|\s"""
+)
+_CL100K_SPECIAL_TOKENS = {
+    "<|endoftext|>": 100257,
+    "<|fim_prefix|>": 100258,
+    "<|fim_middle|>": 100259,
+    "<|fim_suffix|>": 100260,
+    "<|endofprompt|>": 100276,
+}
+
+# Below this many skills, schema checks run inline: a process pool's start-up
+# costs more than checking a small library serially.
+PARALLEL_MIN_SKILLS = 256
+
+# The tiktoken encoder is loaded on first use, not at import: loading reads
+# (and, without a local copy, downloads) the BPE ranks, which commands that
+# never count tokens should not pay for. `None` once loading has failed.
+_UNLOADED = object()
+_encoder = _UNLOADED
+_encoder_lock = threading.Lock()
+_vocab_dir: Optional[str] = None
+
+# Set while a `shared_token_cache()` block is active; count_tokens goes through it.
+_token_cache: Optional[TokenCountCache] = None
+
+
+def set_vocab_dir(path: Optional[Union[str, Path]]) -> None:
+    """Load the BPE ranks from `path` (a tiktoken cache directory) from now on.
+
+    Lets `count_tokens` work offline: point it at a directory populated by
+    a previous online run (tiktoken's `TIKTOKEN_CACHE_DIR`), or holding a
+    copy of `cl100k_base.tiktoken`. Takes precedence over
+    `ASK_TIKTOKEN_CACHE_DIR` and `tokens.vocab_dir` in ~/.askconfig.yaml.
+    Resets the loaded encoder; the process environment is left untouched.
+    """
+    global _encoder, _vocab_dir
+    with _encoder_lock:
+        _vocab_dir = str(path) if path is not None else None
+        _encoder = _UNLOADED
+
+
+def _resolve_vocab_dir() -> Optional[str]:
+    if _vocab_dir is not None:
+        return _vocab_dir
+    return os.environ.get("ASK_TIKTOKEN_CACHE_DIR") or get_config_value("tokens.vocab_dir")
+
+
+def get_encoder():
+    """The process-wide tiktoken encoder, or None if tiktoken is unavailable.
+
+    Loaded on first call. A missing package or an encoding that cannot be
+    loaded (e.g. offline without a cached vocabulary) is remembered, so the
+    estimate fallback costs nothing on later calls.
+    """
+    global _encoder
+    if _encoder is not _UNLOADED:
+        return _encoder
+    with _encoder_lock:
+        if _encoder is _UNLOADED:
+            _encoder = _load_encoder(_resolve_vocab_dir())
+    return _encoder
+
+
+def vocab_dir_problem() -> Optional[str]:
+    """Why the configured vocab dir gave no encoder, or None if it did.
+
+    Also None when no vocab dir is configured: only an explicit directory
+    that cannot be used is worth telling the user about, since counts then
+    silently drop to the `len // 4` estimate.
+    """
+    vocab_dir = _resolve_vocab_dir()
+    if not vocab_dir or get_encoder() is not None:
+        return None
+    path = Path(os.path.expanduser(str(vocab_dir)))
+    try:
+        import tiktoken  # noqa: F401
+    except ImportError:
+        return "tiktoken is not installed"
+    if not path.is_dir():
+        return f"vocab dir {path} does not exist"
+    return f"no {ENCODING_NAME} ranks file with the expected checksum in {path}"
+
+
+def _load_encoder(vocab_dir: Optional[str]):
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        if vocab_dir:
+            return _encoding_from_dir(tiktoken, Path(os.path.expanduser(str(vocab_dir))))
+        return tiktoken.get_encoding(ENCODING_NAME)
+    except Exception:
+        # Network errors while downloading, a corrupt cache file, ...
+        return None
+
+
+def _encoding_from_dir(tiktoken, vocab_dir: Path):
+    """Build cl100k_base from the ranks file in `vocab_dir`, or None.
+
+    Built directly rather than through `tiktoken.get_encoding`, which would
+    need TIKTOKEN_CACHE_DIR set for the whole process (and its children) and
+    memoizes the first encoding it loads, whatever directory that came from.
+    """
+    # tiktoken's cache names files by the sha1 of the source URL; a plain
+    # copy of the ranks file is accepted too.
+    cached = hashlib.sha1(_CL100K_URL.encode()).hexdigest()
+    for candidate in (vocab_dir / cached, vocab_dir / f"{ENCODING_NAME}.tiktoken"):
+        if not candidate.is_file():
+            continue
+        data = candidate.read_bytes()
+        if hashlib.sha256(data).hexdigest() != _CL100K_SHA256:
+            continue
+        ranks = {}
+        for line in data.splitlines():
+            if line:
+                token, rank = line.split()
+                ranks[base64.b64decode(token)] = int(rank)
+        return tiktoken.Encoding(
+            name=ENCODING_NAME,
+            pat_str=_CL100K_PATTERN,
+            mergeable_ranks=ranks,
+            special_tokens=_CL100K_SPECIAL_TOKENS,
+        )
+    return None
+
+
+@contextmanager
+def shared_token_cache(enabled: Optional[bool] = None) -> Iterator[TokenCountCache]:
+    """Memoize `count_tokens` for the duration of the block.
+
+    Counts are keyed by the encoding name and the sha256 of the text, and
+    persisted under the ask cache directory on exit, so unchanged skills are
+    never re-tokenized across `ask skill lint` / `ask skill profile` runs.
+    Nested blocks share the outermost cache.
+    """
+    global _token_cache
+    outer = _token_cache
+    cache = outer if outer is not None else TokenCountCache(enabled)
+    _token_cache = cache
+    try:
+        yield cache
+    finally:
+        _token_cache = outer
+        if outer is None:
+            cache.save()
 
 
 def count_tokens(text: str) -> int:
@@ -20,55 +178,64 @@ def count_tokens(text: str) -> int:
     Count tokens in text using tiktoken (cl100k_base encoding).
     
     Falls back to word-based estimation if tiktoken is not installed.
+    Inside a `shared_token_cache()` block, exact counts are memoized.
     """
-    if HAS_TIKTOKEN and _encoder:
-        return len(_encoder.encode(text))
+    encoder = get_encoder()
+    if encoder is not None:
+        cache = _token_cache
+        if cache is None:
+            return len(encoder.encode(text))
+        key = TokenCountCache.key(ENCODING_NAME, text)
+        tokens = cache.get(key)
+        if tokens is None:
+            tokens = len(encoder.encode(text))
+            cache.put(key, tokens)
+        return tokens
     # Fallback: rough estimation (1 token ≈ 4 chars for English)
     return len(text) // 4
 
 
-def analyze_skill(skill_path: Path) -> Dict:
-    """
-    Analyze a SKILL.md file for token count and schema compliance.
-    
-    Returns dict with:
-        - name: skill name
-        - path: file path
-        - tokens: token count
-        - bytes: file size
-        - status: 'ok', 'warning', or 'error'
-        - issues: list of schema violations
+def count_tokens_batch(texts: List[str], workers: int = 1) -> List[int]:
+    """`count_tokens` over many texts, in order.
+
+    Texts missing from the active `shared_token_cache()` are tokenized in a
+    single `encode_batch` call, which spreads them over `workers` native
+    threads.
     """
-    if not skill_path.exists():
-        return {"error": f"File not found: {skill_path}"}
-    
-    content = skill_path.read_text(encoding="utf-8")
-    tokens = count_tokens(content)
-    
-    # Determine status based on token count
-    skill_name = skill_path.parent.name
-    
+    encoder = get_encoder()
+    if encoder is None:
+        return [len(text) // 4 for text in texts]
+    cache = _token_cache
+    keys = [TokenCountCache.key(ENCODING_NAME, text) for text in texts] if cache else None
+    counts: List[Optional[int]] = [cache.get(key) for key in keys] if cache else [None] * len(texts)
+    missing = [i for i, count in enumerate(counts) if count is None]
+    if missing:
+        encoded = encoder.encode_batch([texts[i] for i in missing], num_threads=max(workers, 1))
+        for i, tokens in zip(missing, encoded):
+            counts[i] = len(tokens)
+            if cache:
+                cache.put(keys[i], counts[i])
+    return counts
+
+
+def _token_limits(skill_name: str) -> Tuple[int, int]:
+    """(recommended, hard) token limits for a skill."""
     # Skills with higher allowances
     if skill_name == "ask-smart-booking-test":
-        limit_ok = 2000
-        limit_warn = 2200
-    elif skill_name == "ask-skill-creator":
-        limit_ok = 1000
-        limit_warn = 1200
-    else:
-        limit_ok = 500
-        limit_warn = 700
+        return 2000, 2200
+    if skill_name == "ask-skill-creator":
+        return 1000, 1200
+    return 500, 700
+
 
+def _analysis(skill_path: Path, content: str, tokens: int, issues: List[Tuple[str, str]]) -> Dict:
+    limit_ok, limit_warn = _token_limits(skill_path.parent.name)
     if tokens <= limit_ok:
         status = "ok"
     elif tokens <= limit_warn:
         status = "warning"
     else:
         status = "error"
-    
-    # Check for schema compliance
-    issues = _check_schema_compliance(content)
-    
     return {
         "name": skill_path.parent.name,
         "path": str(skill_path),
@@ -79,12 +246,67 @@ def analyze_skill(skill_path: Path) -> Dict:
     }
 
 
+def analyze_skill(skill_path: Path) -> Dict:
+    """
+    Analyze a SKILL.md file for token count and schema compliance.
+    
+    Returns dict with:
+        - name: skill name
+        - path: file path
+        - tokens: token count
+        - bytes: file size
+        - status: 'ok', 'warning', or 'error'
+        - issues: list of schema violations
+    """
+    if not skill_path.exists():
+        return {"error": f"File not found: {skill_path}"}
+    
+    content = skill_path.read_text(encoding="utf-8")
+    return _analysis(skill_path, content, count_tokens(content), _check_schema_compliance(content))
+
+
+def _read_skill(skill_path: Path) -> Optional[str]:
+    try:
+        return skill_path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return None
+
+
+def analyze_skills(skill_paths: List[Path], workers: int = 1) -> List[Dict]:
+    """`analyze_skill` over many files, in order, as one batch.
+
+    Files are read on a thread pool, every uncached file is tokenized in one
+    `encode_batch` call, and schema checks of large libraries run on a
+    process pool. With `workers` <= 1 everything runs inline.
+    """
+    # Built here so forked workers inherit it instead of re-reading config.
+    get_schema_scanner()
+    contents = parallel_map(_read_skill, skill_paths, workers)
+    found = [i for i, content in enumerate(contents) if content is not None]
+    texts = [contents[i] for i in found]
+    tokens = count_tokens_batch(texts, workers)
+    issues = parallel_map(
+        _check_schema_compliance,
+        texts,
+        workers,
+        use_processes=len(texts) >= PARALLEL_MIN_SKILLS,
+    )
+    analyses: List[Dict] = [{"error": f"File not found: {path}"} for path in skill_paths]
+    for i, text, count, text_issues in zip(found, texts, tokens, issues):
+        analyses[i] = _analysis(skill_paths[i], text, count, text_issues)
+    return analyses
+
+
 def _check_schema_compliance(content: str) -> List[Tuple[str, str]]:
     """
     Check SKILL.md content for schema violations.
     
-    Returns list of (severity, message) tuples.
+    Returns list of (severity, message) tuples; messages of language issues
+    end with their "(line L, col C)" position.
     Severity: 'critical' (blocks strict mode), 'warning' (informational)
+    
+    Language rules (built-in plus `lint.rules` from ~/.askconfig.yaml) are
+    matched in a single pass; see `ask.utils.lint_rules`.
     """
     issues = []
     
@@ -92,42 +314,27 @@ def _check_schema_compliance(content: str) -> List[Tuple[str, str]]:
     if "<critical_constraints>" not in content:
         issues.append(("critical", "Missing <critical_constraints> block"))
     
-    # Check for polite/verbose language patterns (critical)
-    verbose_patterns = [
-        (r"\bplease\b", "Contains 'please' - remove polite language"),
-        (r"\bit is important to\b", "Contains 'it is important to' - simplify"),
-        (r"\bwe recommend\b", "Contains 'we recommend' - use ✅ MUST instead"),
-        (r"\byou should\b", "Contains 'you should' - use ✅ MUST instead"),
-        (r"\bconsider using\b", "Contains 'consider using' - be directive"),
-    ]
-    
-    for pattern, message in verbose_patterns:
-        if re.search(pattern, content, re.IGNORECASE):
-            issues.append(("critical", message))
-    
-    # Check for long paragraphs (informational only, does not block)
-    paragraphs = content.split("\n\n")
-    for para in paragraphs:
-        sentences = len(re.findall(r"[.!?]+", para))
-        if sentences > 3 and not para.strip().startswith("```"):
-            issues.append(("warning", "Contains paragraph with >3 sentences - consider breaking up"))
-            break
-    
+    issues.extend(issue.as_tuple() for issue in get_schema_scanner().scan(content))
     return issues
 
 
-def generate_report(skills_dir: Path) -> Tuple[str, Dict]:
+def generate_report(skills_dir: Path, workers: int = 1) -> Tuple[str, Dict]:
     """
     Generate a token analysis report for all skills.
     
+    `workers` > 1 reads, tokenizes and checks the skills concurrently (see
+    `analyze_skills`); the report is the same either way.
+    
     Returns:
         - Formatted report string
         - Summary dict with totals
     """
     results = []
+    skill_mds = list(skills_dir.rglob("SKILL.md"))
     
-    for skill_md in skills_dir.rglob("SKILL.md"):
-        analysis = analyze_skill(skill_md)
+    with shared_token_cache():
+        analyses = analyze_skills(skill_mds, workers)
+    for skill_md, analysis in zip(skill_mds, analyses):
         if "error" not in analysis:
             category = skill_md.parent.parent.name
             analysis["category"] = category
@@ -178,19 +385,24 @@ def generate_report(skills_dir: Path) -> Tuple[str, Dict]:
     return "\n".join(lines), summary
 
 
-def lint_skill(skill_path: Path, strict: bool = False) -> Tuple[bool, List[str]]:
+def lint_skill(
+    skill_path: Path, strict: bool = False, analysis: Optional[Dict] = None
+) -> Tuple[bool, List[str]]:
     """
     Lint a single skill file.
     
     Args:
         skill_path: Path to SKILL.md
         strict: If True, critical issues and token warnings are treated as errors
+        analysis: `analyze_skill(skill_path)`, if the caller already has it
         
     Returns:
         - passed: bool
         - messages: list of issues
     """
-    analysis = analyze_skill(skill_path)
+    if analysis is None:
+        with shared_token_cache():
+            analysis = analyze_skill(skill_path)
     
     if "error" in analysis:
         return False, [analysis["error"]]
@@ -199,18 +411,7 @@ def lint_skill(skill_path: Path, strict: bool = False) -> Tuple[bool, List[str]]
     passed = True
     
     # Token count check
-    # Token count check
-    skill_name = skill_path.parent.name
-    
-    if skill_name == "ask-smart-booking-test":
-        limit_ok = 2000
-        limit_warn = 2200
-    elif skill_name == "ask-skill-creator":
-        limit_ok = 1000
-        limit_warn = 1200
-    else:
-        limit_ok = 500
-        limit_warn = 700
+    limit_ok, limit_warn = _token_limits(skill_path.parent.name)
 
     if analysis["status"] == "error":
         messages.append(f"❌ Token count {analysis['tokens']} exceeds limit ({limit_warn})")
@@ -0,0 +1,186 @@
+"""Fast YAML loading for the small, fixed-shape documents ASK parses in bulk.
+
+Two layers:
+
+`safe_load`
+    `yaml.safe_load` semantics, but on libyaml's `CSafeLoader` when PyYAML was
+    built with it (roughly an order of magnitude faster than the pure-Python
+    loader). Falls back to `SafeLoader` transparently.
+
+`load_flat_yaml`
+    A restricted parser for the flat subset that `skill.yaml` files and SKILL.md
+    frontmatter actually use: top-level `key: scalar`, `key: [a, "b"]` and
+    `key:` followed by `- item` lines. Every plain scalar is run through PyYAML's
+    own implicit resolver, and anything outside the subset (nested mappings,
+    block scalars, anchors, numbers, booleans, dates, comments after values...)
+    makes it hand the whole document to `safe_load`. The result is therefore
+    always identical to `yaml.safe_load`; the fast path only decides *who*
+    parses. Set `ASK_YAML_FASTPATH=0` to always use the full loader.
+"""
+
+import os
+import re
+from typing import Any, List, Optional
+
+import yaml
+from yaml.nodes import ScalarNode
+from yaml.resolver import Resolver
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+
+    HAS_LIBYAML = True
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader
+
+    HAS_LIBYAML = False
+
+_KEY_RE = re.compile(r"([A-Za-z_][A-Za-z0-9_-]*):(?:[ ]+(.*))?$")
+_ITEM_RE = re.compile(r"([ ]*)-(?:[ ]+(.*))?$")
+
+# Characters that start something other than a plain scalar.
+_INDICATORS = set("-?:,[]{}#&*!|>'\"%@`")
+
+_STR_TAG = "tag:yaml.org,2002:str"
+_resolver = Resolver()
+
+
+class _Unsupported(Exception):
+    """Raised inside the fast path; the caller falls back to full YAML."""
+
+
+def safe_load(stream: Any) -> Any:
+    """Drop-in `yaml.safe_load` that prefers the libyaml C loader."""
+    return yaml.load(stream, Loader=SafeLoader)
+
+
+def fastpath_enabled() -> bool:
+    return os.environ.get("ASK_YAML_FASTPATH", "").strip().lower() not in ("0", "false", "no")
+
+
+def load_flat_yaml(text: str) -> Any:
+    """Parse a small flat YAML document, falling back to `safe_load` when needed."""
+    if fastpath_enabled():
+        try:
+            return _parse_flat(text)
+        except _Unsupported:
+            pass
+    return safe_load(text)
+
+
+def _plain(value: str, flow: bool = False) -> str:
+    """Validate a plain scalar and return it, or bail out of the fast path."""
+    if not value or value[0] in _INDICATORS or "\t" in value:
+        raise _Unsupported
+    if ": " in value or " #" in value or value.endswith(":"):
+        raise _Unsupported
+    if flow and any(c in value for c in ",[]{}"):
+        raise _Unsupported
+    if _resolver.resolve(ScalarNode, value, (True, False)) != _STR_TAG:
+        raise _Unsupported
+    return value
+
+
+def _scalar(value: str, flow: bool = False) -> str:
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        inner = value[1:-1]
+        if "\\" in inner or '"' in inner:
+            raise _Unsupported
+        return inner
+    if len(value) >= 2 and value[0] == value[-1] == "'":
+        inner = value[1:-1]
+        if "'" in inner.replace("''", ""):
+            raise _Unsupported
+        return inner.replace("''", "'")
+    return _plain(value, flow=flow)
+
+
+def _split_flow(inner: str) -> List[str]:
+    """Split the inside of `[...]` on commas that are not inside quotes."""
+    items, current, quote = [], [], None
+    for ch in inner:
+        if quote:
+            current.append(ch)
+            if ch == quote:
+                quote = None
+        elif ch in "\"'":
+            quote = ch
+            current.append(ch)
+        elif ch == ",":
+            items.append("".join(current))
+            current = []
+        else:
+            current.append(ch)
+    if quote:
+        raise _Unsupported
+    tail = "".join(current)
+    # A trailing comma is fine; an empty slot between commas is not.
+    if tail.strip():
+        items.append(tail)
+    if any(not item.strip() for item in items):
+        raise _Unsupported
+    return items
+
+
+def _flow_list(value: str) -> List[str]:
+    if not value.endswith("]"):
+        raise _Unsupported
+    inner = value[1:-1]
+    if not inner.strip():
+        return []
+    return [_scalar(item, flow=True) for item in _split_flow(inner)]
+
+
+def _parse_flat(text: str) -> Optional[dict]:
+    if "\t" in text:
+        raise _Unsupported
+    result: dict = {}
+    list_key = None
+    list_items: Optional[List[str]] = None
+    list_indent = None
+
+    for raw in text.splitlines():
+        line = raw.rstrip()
+        stripped = line.lstrip()
+        if not stripped or stripped.startswith("#"):
+            continue
+
+        item = _ITEM_RE.match(line)
+        if item:
+            if list_key is None or item.group(2) is None:
+                raise _Unsupported
+            # A deeper "- x" would be a plain-scalar continuation, not an item.
+            if list_indent is None:
+                list_indent = len(item.group(1))
+            elif len(item.group(1)) != list_indent:
+                raise _Unsupported
+            list_items.append(_scalar(item.group(2)))
+            continue
+        if line[0] == " ":
+            # Indented content that is not a list item: nested or multi-line.
+            raise _Unsupported
+
+        if list_key is not None:
+            result[list_key] = list_items if list_items else None
+            list_key, list_items, list_indent = None, None, None
+
+        match = _KEY_RE.match(line)
+        if not match or line.startswith(("---", "...")):
+            raise _Unsupported
+        key, value = match.group(1), match.group(2)
+        if _resolver.resolve(ScalarNode, key, (True, False)) != _STR_TAG:
+            raise _Unsupported
+
+        if value is None or not value.strip():
+            list_key, list_items = key, []
+        elif value.startswith("["):
+            result[key] = _flow_list(value)
+        else:
+            result[key] = _scalar(value)
+
+    if list_key is not None:
+        result[list_key] = list_items if list_items else None
+
+    # An empty document is None in YAML, not {}.
+    return result or None
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Compare the trigger-audit engines on a synthetic library.
+
+Generates `--skills` skills and `--prompts` eval prompts from a fixed-seed
+vocabulary, scores them with the pure-Python loop and (if numpy/scipy are
+installed) the sparse batch engine, optionally also the loop sharded over
+`--jobs` processes, and checks that the engines agree.
+
+Usage:
+    python scripts/bench_audit.py [--skills N] [--prompts N] [--seed N] [--jobs N]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from ask.utils.eval import sparse_audit  # noqa: E402
+from ask.utils.eval.trigger_scorer import (  # noqa: E402
+    DEFAULT_COLLISION_MARGIN,
+    _run_sharded,
+    _score_prompt,
+    build_index,
+)
+
+
+def synth(n_skills, n_prompts, seed):
+    rng = random.Random(seed)
+    vocab = [f"w{i}" for i in range(max(200, n_skills * 4))]
+    skills = [
+        {
+            "name": f"skill-{i:05d}",
+            "description": " ".join(rng.choices(vocab, k=12)),
+            "triggers": [" ".join(rng.choices(vocab, k=3)) for _ in range(3)],
+        }
+        for i in range(n_skills)
+    ]
+    prompts = []
+    for _ in range(n_prompts):
+        owner = rng.choice(skills)
+        words = owner["description"].split()[:4] + rng.choices(vocab, k=3)
+        prompts.append((owner["name"], " ".join(words)))
+    return skills, prompts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--skills", type=int, default=500)
+    parser.add_argument("--prompts", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--jobs", type=int, default=0, help="also time the sharded loop")
+    args = parser.parse_args()
+
+    skills, prompts = synth(args.skills, args.prompts, args.seed)
+    index = build_index(skills)
+    margin = DEFAULT_COLLISION_MARGIN
+    print(f"{len(skills)} skills, {len(prompts)} prompts\n")
+
+    start = time.perf_counter()
+    expected = [_score_prompt(index, name, prompt, margin) for name, prompt in prompts]
+    base = time.perf_counter() - start
+    print(f"python   {base:8.3f} s")
+
+    if args.jobs > 1:
+        start = time.perf_counter()
+        sharded = _run_sharded(index, prompts, margin, args.jobs)
+        took = time.perf_counter() - start
+        assert sharded == expected, "sharded audit disagrees with the serial loop"
+        print(f"python/{args.jobs:<2d}{took:8.3f} s   {base / took:5.1f}x")
+
+    if not sparse_audit.HAS_SPARSE:
+        print("sparse   unavailable (pip install \"agent-skill-kit[audit]\")")
+        return
+    start = time.perf_counter()
+    got = sparse_audit.score_prompts(index, prompts, margin)
+    took = time.perf_counter() - start
+    print(f"sparse   {took:8.3f} s   {base / took:5.1f}x")
+
+    agree = sum(
+        (a.top_skill, a.runner_up_skill) == (b.top_skill, b.runner_up_skill)
+        and len(a.collisions) == len(b.collisions)
+        for a, b in zip(expected, got)
+    )
+    print(f"\n{agree}/{len(prompts)} results identical (differences are float ties)")
+
+
+if __name__ == "__main__":
+    main()
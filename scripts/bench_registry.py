@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""Count filesystem calls made by skill discovery, before and after scandir.
+
+"before" replays the original pathlib walker (iterdir + one exists()/is_dir()
+probe per sidecar); "after" is the current `get_all_skills`. Both run with the
+catalog cache disabled so YAML parsing is included, then "after (cached)" shows
+a warm-cache run. Calls are counted by wrapping the `os` functions pathlib goes
+through, plus `DirEntry.stat()` on entries handed out by `os.scandir`.
+
+Usage:
+    python scripts/bench_registry.py [skills_dir] [--repeat N]
+"""
+
+import argparse
+import builtins
+import io
+import os
+import sys
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from ask.utils import skill_registry  # noqa: E402
+
+
+class _CountingEntry:
+    """DirEntry proxy that counts stat() calls (the only ones that hit disk)."""
+
+    def __init__(self, entry, counts):
+        self._entry = entry
+        self._counts = counts
+
+    def stat(self, *args, **kwargs):
+        self._counts["DirEntry.stat"] += 1
+        return self._entry.stat(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._entry, name)
+
+    def __fspath__(self):
+        return self._entry.path
+
+
+class _CountingScandir:
+    def __init__(self, it, counts):
+        self._it = it
+        self._counts = counts
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return _CountingEntry(next(self._it), self._counts)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._it.close()
+
+    def close(self):
+        self._it.close()
+
+
+@contextmanager
+def count_calls():
+    counts = Counter()
+    real = {
+        "stat": os.stat,
+        "lstat": os.lstat,
+        "listdir": os.listdir,
+        "scandir": os.scandir,
+        "open": builtins.open,
+        "io_open": io.open,
+    }
+
+    def wrap(key, fn):
+        def counted(*args, **kwargs):
+            counts[key] += 1
+            return fn(*args, **kwargs)
+        return counted
+
+    os.stat = wrap("stat", real["stat"])
+    os.lstat = wrap("lstat", real["lstat"])
+    os.listdir = wrap("listdir", real["listdir"])
+    os.scandir = lambda *a, **k: (
+        counts.update(["scandir"]) or _CountingScandir(real["scandir"](*a, **k), counts)
+    )
+    builtins.open = wrap("open", real["open"])
+    io.open = wrap("open", real["io_open"])
+    try:
+        yield counts
+    finally:
+        os.stat = real["stat"]
+        os.lstat = real["lstat"]
+        os.listdir = real["listdir"]
+        os.scandir = real["scandir"]
+        builtins.open = real["open"]
+        io.open = real["io_open"]
+
+
+def legacy_get_all_skills(skills_dir: Path):
+    """The pre-scandir discovery walk, kept verbatim for comparison."""
+    skills = []
+    for category_dir in skills_dir.iterdir():
+        if not category_dir.is_dir() or category_dir.name.startswith("."):
+            continue
+
+        def _parse_and_add(s_dir):
+            skill_yaml = s_dir / "skill.yaml"
+            if not skill_yaml.exists():
+                return
+            skill = skill_registry.parse_skill(skill_yaml)
+            if skill:
+                skill["_path"] = str(s_dir)
+                skill_md = s_dir / "SKILL.md"
+                readme_md = s_dir / "README.md"
+                if skill_md.exists():
+                    skill["_instruction_file"] = str(skill_md)
+                    skill_registry._parse_skill_md_frontmatter(skill_md)
+                elif readme_md.exists():
+                    skill["_instruction_file"] = str(readme_md)
+                if (s_dir / "reference.md").exists():
+                    skill["_reference"] = str(s_dir / "reference.md")
+                if (s_dir / "examples.md").exists():
+                    skill["_examples"] = str(s_dir / "examples.md")
+                scripts_dir = s_dir / "scripts"
+                if scripts_dir.exists() and scripts_dir.is_dir():
+                    skill["_scripts"] = str(scripts_dir)
+                skills.append(skill)
+
+        if (category_dir / "skill.yaml").exists():
+            _parse_and_add(category_dir)
+        else:
+            for skill_dir in category_dir.iterdir():
+                if not skill_dir.is_dir() or skill_dir.name.startswith("."):
+                    continue
+                _parse_and_add(skill_dir)
+    return skills
+
+
+def measure(label, fn, repeat):
+    with count_calls() as counts:
+        found = fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    elapsed_ms = (time.perf_counter() - start) * 1000 / repeat
+    total = sum(counts.values())
+    n = max(len(found), 1)
+    detail = ", ".join(f"{k}={v}" for k, v in sorted(counts.items()))
+    print(f"{label:16} {len(found):5} skills  {total:6} calls  {total / n:5.1f}/skill  {elapsed_ms:8.2f} ms   ({detail})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("skills_dir", nargs="?", default=str(PROJECT_ROOT / "skills"))
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    skills_dir = Path(args.skills_dir)
+
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        os.environ["ASK_CACHE_DIR"] = cache_dir
+        measure("before", lambda: legacy_get_all_skills(skills_dir), args.repeat)
+        measure(
+            "after",
+            lambda: skill_registry.get_all_skills(skills_dir, use_cache=False, workers=1),
+            args.repeat,
+        )
+        skill_registry.get_all_skills(skills_dir, workers=1)  # warm the cache
+        measure(
+            "after (cached)",
+            lambda: skill_registry.get_all_skills(skills_dir, workers=1),
+            args.repeat,
+        )
+
+
+if __name__ == "__main__":
+    main()
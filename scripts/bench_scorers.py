@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Compare the ranking backends on the bundled skills' evals.
+
+For each scorer, reports routing accuracy on every `should_fire` prompt
+(owner ranked first), how many prompts are contested (another skill within
+the collision margin), index build time, and search throughput in
+queries/second through `score_top_k` (the `search_skills` path).
+
+Usage:
+    python scripts/bench_scorers.py [--skills-dir DIR] [--repeat N] [--limit N]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from ask.utils.eval.scorers import SCORERS  # noqa: E402
+from ask.utils.eval.trigger_scorer import (  # noqa: E402
+    DEFAULT_COLLISION_MARGIN,
+    _audit_prompts,
+    _score_prompt,
+    build_index,
+)
+from ask.utils.skill_registry import get_all_skills  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--skills-dir", type=Path, default=PROJECT_ROOT / "skills")
+    parser.add_argument("--repeat", type=int, default=200, help="passes over the prompts for q/s")
+    parser.add_argument("--limit", type=int, default=5, help="top-k size for the q/s run")
+    args = parser.parse_args()
+
+    skills = get_all_skills(base_path=args.skills_dir)
+    prompts = _audit_prompts(skills)
+    if not prompts:
+        print(f"No evals found under {args.skills_dir}")
+        return
+    print(f"{len(skills)} skills, {len(prompts)} prompts\n")
+    print(f"{'scorer':8s} {'accuracy':>9s} {'contested':>10s} {'build ms':>9s} {'q/s':>10s}")
+
+    for scorer in SCORERS:
+        start = time.perf_counter()
+        index = build_index(skills, use_artifact=False, scorer=scorer)
+        index.packed_vectors()  # include weighting in the build time
+        build_ms = (time.perf_counter() - start) * 1000
+
+        results = [
+            _score_prompt(index, name, prompt, DEFAULT_COLLISION_MARGIN)
+            for name, prompt in prompts
+        ]
+        hits = sum(r.is_hit for r in results)
+        contested = sum(r.is_hit and r.has_collision for r in results)
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for _, prompt in prompts:
+                index.score_top_k(prompt, args.limit)
+        qps = args.repeat * len(prompts) / (time.perf_counter() - start)
+
+        print(
+            f"{scorer:8s} {hits / len(prompts):9.1%} {contested:10d} "
+            f"{build_ms:9.1f} {qps:10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
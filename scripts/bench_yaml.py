@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Microbenchmark YAML loaders on the bundled skill metadata.
+
+Parses every `skill.yaml` and SKILL.md frontmatter under `skills/` with:
+
+    pure-python   yaml.safe_load (SafeLoader)
+    libyaml       yaml.load(..., CSafeLoader)          [if PyYAML has libyaml]
+    fast path     ask.utils.yaml_loader.load_flat_yaml (falls back per document)
+
+and checks that every loader returns identical data.
+
+Usage:
+    python scripts/bench_yaml.py [skills_dir] [--repeat N]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import yaml
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from ask.utils import yaml_loader  # noqa: E402
+from ask.utils.frontmatter import read_frontmatter  # noqa: E402
+
+
+def collect(skills_dir: Path):
+    docs = [p.read_text(encoding="utf-8") for p in sorted(skills_dir.rglob("skill.yaml"))]
+    for skill_md in sorted(skills_dir.rglob("SKILL.md")):
+        header = read_frontmatter(skill_md)
+        if header is not None:
+            docs.append(header.text)
+    return docs
+
+
+def bench(label, loader, docs, repeat, baseline=None):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        results = [loader(d) for d in docs]
+    per_doc_us = (time.perf_counter() - start) * 1e6 / (repeat * len(docs))
+    line = f"{label:14} {per_doc_us:9.1f} µs/doc"
+    if baseline:
+        line += f"   {baseline / per_doc_us:5.1f}x"
+    print(line)
+    return per_doc_us, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("skills_dir", nargs="?", default=str(PROJECT_ROOT / "skills"))
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    docs = collect(Path(args.skills_dir))
+    fast_hits = 0
+    for d in docs:
+        try:
+            yaml_loader._parse_flat(d)
+            fast_hits += 1
+        except yaml_loader._Unsupported:
+            pass
+    print(f"{len(docs)} documents, {fast_hits} handled by the fast path "
+          f"({len(docs) - fast_hits} fall back to YAML)\n")
+
+    base, expected = bench("pure-python", yaml.safe_load, docs, args.repeat)
+    if yaml_loader.HAS_LIBYAML:
+        _, got = bench("libyaml", yaml_loader.safe_load, docs, args.repeat, base)
+        assert got == expected, "CSafeLoader disagrees with SafeLoader"
+    else:
+        print("libyaml        unavailable (PyYAML built without it)")
+    _, got = bench("fast path", yaml_loader.load_flat_yaml, docs, args.repeat, base)
+    assert got == expected, "fast path disagrees with SafeLoader"
+
+
+if __name__ == "__main__":
+    main()
@@ -20,3 +20,11 @@ def tmp_skills_dir(tmp_path, monkeypatch):
     monkeypatch.setattr("ask.utils.skill_registry.get_skills_dir", mock_get_skills_dir)
     return skills_dir
 
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path, monkeypatch):
+    """Keep on-disk caches out of the real ~/.agents/cache during tests."""
+    cache_dir = tmp_path / "ask-cache"
+    monkeypatch.setenv("ASK_CACHE_DIR", str(cache_dir))
+    monkeypatch.delenv("ASK_NO_CACHE", raising=False)
+    return cache_dir
@@ -102,3 +102,40 @@ def test_install_resources(tmp_path):
     result = adapter.install_resources(skill, target_dir)
     assert result["conflict"] is False
     assert (target_dir / "scripts" / "helper.py").exists()
+
+def test_list_installed_skills_reads_frontmatter_version(tmp_path):
+    """Versions come from the frontmatter header only; the body is irrelevant."""
+    adapter = MockAdapter(tmp_path)
+    
+    versioned = tmp_path / "versioned"
+    versioned.mkdir()
+    (versioned / "SKILL.md").write_text(
+        "---\nname: versioned\nversion: 1.2.3\n---\nversion: 9.9.9 in the body\n", encoding="utf-8"
+    )
+    unfenced = tmp_path / "unfenced"
+    unfenced.mkdir()
+    (unfenced / "SKILL.md").write_text("# No frontmatter\nversion: 2.0.0\n", encoding="utf-8")
+    
+    installed = adapter.list_installed_skills()
+    assert installed == {"versioned": "1.2.3", "unfenced": "0.0.0"}
+
+
+def test_version_found_past_the_frontmatter_read_cap(tmp_path):
+    """A header with no closing fence within the cap is scanned to the end."""
+    from ask.utils.frontmatter import MAX_FRONTMATTER_BYTES
+
+    adapter = MockAdapter(tmp_path)
+    padding = "description: " + "x" * 100 + "\n"
+    oversized = tmp_path / "oversized"
+    oversized.mkdir()
+    (oversized / "SKILL.md").write_text(
+        "---\n" + padding * (MAX_FRONTMATTER_BYTES // len(padding) + 1)
+        + "version: 3.1.4\n---\nversion: 9.9.9 in the body\n",
+        encoding="utf-8",
+    )
+    unclosed = tmp_path / "unclosed"
+    unclosed.mkdir()
+    (unclosed / "SKILL.md").write_text("---\nname: unclosed\nversion: 0.4.2\n", encoding="utf-8")
+
+    installed = adapter.list_installed_skills()
+    assert installed == {"oversized": "3.1.4", "unclosed": "0.4.2"}
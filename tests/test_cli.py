@@ -1,3 +1,5 @@
+import pytest
+
 from ask.cli import main
 
 def test_cli_version(runner):
@@ -13,3 +15,125 @@ def test_remove_help(runner):
     result = runner.invoke(main, ["remove", "--help"])
     assert result.exit_code == 0
     assert "Remove a skill" in result.output
+
+
+def test_skill_compile_writes_trigger_index(runner, tmp_skills_dir, tmp_path, monkeypatch):
+    from ask.utils.eval import index_artifact
+    from ask.utils.eval.trigger_scorer import build_index
+    from ask.utils.skill_registry import get_all_skills
+
+    skill_dir = tmp_skills_dir / "coding" / "alpha"
+    skill_dir.mkdir(parents=True)
+    (skill_dir / "skill.yaml").write_text(
+        "name: alpha\ndescription: Review python code.\n", encoding="utf-8"
+    )
+    monkeypatch.setattr("ask.commands.skill.get_skills_dir", lambda: tmp_skills_dir)
+
+    # The manifest may go anywhere; the index goes where build_index reads it.
+    manifest = tmp_path / "dist" / "manifest.json"
+    result = runner.invoke(main, ["skill", "compile", "-o", str(manifest)])
+    assert result.exit_code == 0, result.output
+    assert manifest.exists()
+    assert (tmp_skills_dir / "trigger_index.bin").exists()
+    assert not (manifest.parent / "trigger_index.bin").exists()
+
+    loads = []
+    real_decode = index_artifact._decode
+    monkeypatch.setattr(
+        index_artifact, "_decode", lambda *a: loads.append(real_decode(*a)) or loads[-1]
+    )
+    assert build_index(get_all_skills()).score("python")[0][0] == "alpha"
+    assert loads and loads[-1] is not None
+
+
+def test_test_matrix_reports_similar_pairs(runner, tmp_skills_dir):
+    import json
+
+    for name, description in [
+        ("alpha", "Review python code for bugs."),
+        ("beta", "Review python code for style."),
+        ("gamma", "Deploy containers to kubernetes."),
+    ]:
+        skill_dir = tmp_skills_dir / "coding" / name
+        skill_dir.mkdir(parents=True)
+        (skill_dir / "skill.yaml").write_text(
+            f"name: {name}\ndescription: {description}\n", encoding="utf-8"
+        )
+
+    result = runner.invoke(main, ["test", "--matrix", "--json"])
+    assert result.exit_code == 0, result.output
+    payload = json.loads(result.output)
+    assert payload["method"] == "exact"
+    assert payload["pairs"][0]["skills"] == ["alpha", "beta"]
+    assert payload["scorer"] == "tfidf"
+
+    result = runner.invoke(main, ["test", "--matrix", "--scorer", "bm25"])
+    assert result.exit_code == 0, result.output
+    assert "cosine between BM25-weighted skill documents" in result.output
+    assert "TF-IDF" not in result.output
+
+
+def test_test_audit_banner_names_the_scorer(runner, tmp_skills_dir):
+    skill_dir = tmp_skills_dir / "coding" / "alpha"
+    (skill_dir / "tests").mkdir(parents=True)
+    (skill_dir / "skill.yaml").write_text(
+        "name: alpha\ndescription: Review python code.\n", encoding="utf-8"
+    )
+    (skill_dir / "tests" / "evals.yaml").write_text(
+        "should_fire:\n  - review my python code\n", encoding="utf-8"
+    )
+
+    result = runner.invoke(main, ["test", "--scorer", "bm25"])
+    assert result.exit_code == 0, result.output
+    assert "Lexical pre-screen (BM25)" in result.output
+    assert "TF-IDF" not in result.output
+
+
+def test_skill_lint_rejects_unusable_vocab_dir(runner, tmp_skills_dir, tmp_path, monkeypatch):
+    pytest.importorskip("tiktoken")
+    from ask.utils import token_analyzer
+
+    monkeypatch.setattr("ask.commands.skill.get_skills_dir", lambda: tmp_skills_dir)
+    try:
+        result = runner.invoke(main, ["skill", "lint", "--vocab-dir", str(tmp_path / "missing")])
+        assert result.exit_code == 1
+        assert "does not exist" in " ".join(result.output.split())
+
+        # Configured rather than passed: warn, then carry on with estimates.
+        token_analyzer.set_vocab_dir(None)
+        monkeypatch.setattr(
+            token_analyzer,
+            "get_config_value",
+            lambda key: str(tmp_path) if key == "tokens.vocab_dir" else None,
+        )
+        result = runner.invoke(main, ["skill", "profile", "--json"])
+        assert result.exit_code == 0, result.output
+        assert "Warning:" in result.stderr and "estimated" in " ".join(result.stderr.split())
+        assert "Warning" not in result.stdout
+    finally:
+        token_analyzer.set_vocab_dir(None)
+
+
+def test_skill_profile_sections(runner, tmp_skills_dir, monkeypatch):
+    import json
+
+    skill_dir = tmp_skills_dir / "coding" / "alpha"
+    skill_dir.mkdir(parents=True)
+    (skill_dir / "SKILL.md").write_text(
+        "---\nname: alpha\n---\n\n# Alpha\nIntro.\n\n```bash\nask run\n```\n",
+        encoding="utf-8",
+    )
+    monkeypatch.setattr("ask.commands.skill.get_skills_dir", lambda: tmp_skills_dir)
+
+    result = runner.invoke(main, ["skill", "profile", "alpha", "--json"])
+    assert result.exit_code == 0, result.output
+    payload = json.loads(result.output)
+    assert [(s["kind"], s["title"]) for s in payload["sections"]] == [
+        ("frontmatter", "frontmatter"),
+        ("section", "# Alpha"),
+        ("code", "bash"),
+    ]
+    assert payload["tokens"] == payload["sections"][-1]["cumulative"]
+
+    result = runner.invoke(main, ["skill", "profile", "missing"])
+    assert result.exit_code == 1
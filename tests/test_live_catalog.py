@@ -0,0 +1,157 @@
+"""Tests for the self-refreshing catalog behind `ask mcp serve`."""
+
+import shutil
+import sys
+
+import pytest
+
+from ask.utils import provider
+from ask.utils.live_catalog import LiveCatalog
+
+MODES = ["poll"] + (["inotify"] if sys.platform.startswith("linux") else [])
+
+
+def _write_skill(root, category, name, description="Does things."):
+    skill_dir = root / category / name
+    skill_dir.mkdir(parents=True, exist_ok=True)
+    (skill_dir / "skill.yaml").write_text(
+        f"name: {name}\nversion: 1.0.0\ndescription: {description}\n", encoding="utf-8"
+    )
+    return skill_dir
+
+
+def _catalog(root, mode):
+    catalog = LiveCatalog(root, poll_interval=0, use_inotify=(mode == "inotify"))
+    if mode == "inotify" and catalog.mode != "inotify":
+        catalog.close()
+        pytest.skip("inotify unavailable here")
+    return catalog
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_live_catalog_tracks_create_edit_delete(tmp_path, mode):
+    root = tmp_path / "skills"
+    _write_skill(root, "coding", "alpha")
+    catalog = _catalog(root, mode)
+    try:
+        assert [s["name"] for s in catalog.skills()] == ["alpha"]
+        v0 = catalog.version
+
+        # New skill in a brand-new category.
+        _write_skill(root, "tooling", "beta", "Builds docker images.")
+        assert catalog.get("beta") is not None
+        assert catalog.version > v0
+
+        # Edit changes the record and the search index.
+        _write_skill(root, "coding", "alpha", "Reviews python code for subtle bugs.")
+        assert "subtle" in catalog.get("alpha")["description"]
+        assert catalog.index().score("subtle bugs")[0][0] == "alpha"
+
+        # Delete.
+        shutil.rmtree(root / "tooling" / "beta")
+        assert catalog.get("beta") is None
+        assert sorted(s["name"] for s in catalog.skills()) == ["alpha"]
+    finally:
+        catalog.close()
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_live_catalog_notices_late_skill_yaml(tmp_path, mode):
+    """A directory created first and given a skill.yaml later is picked up."""
+    root = tmp_path / "skills"
+    _write_skill(root, "coding", "alpha")
+    catalog = _catalog(root, mode)
+    try:
+        late = root / "coding" / "late"
+        late.mkdir()
+        assert catalog.get("late") is None
+        (late / "skill.yaml").write_text("name: late\n", encoding="utf-8")
+        assert catalog.get("late") is not None
+    finally:
+        catalog.close()
+
+
+def test_live_catalog_patches_index_in_place(tmp_path, monkeypatch):
+    root = tmp_path / "skills"
+    _write_skill(root, "coding", "alpha")
+    catalog = LiveCatalog(root, poll_interval=0, use_inotify=False)
+    first = catalog.index()
+    monkeypatch.setattr(
+        "ask.utils.live_catalog.build_index", lambda *a: pytest.fail("full rebuild")
+    )
+    _write_skill(root, "coding", "gamma", "Something new entirely.")
+    assert catalog.index() is first
+    assert catalog.index().score("something new")[0][0] == "gamma"
+    shutil.rmtree(root / "coding" / "gamma")
+    assert "gamma" not in catalog.index()
+
+
+def test_provider_serves_from_live_catalog(tmp_path, monkeypatch):
+    root = tmp_path / "skills"
+    _write_skill(root, "tooling", "ask-docker-expert", "Optimize Docker images.")
+    monkeypatch.setattr(provider, "get_all_skills", lambda *a, **k: pytest.fail("disk scan"))
+    provider.enable_live_catalog(root, poll_interval=0, use_inotify=False)
+    try:
+        assert [s["name"] for s in provider.list_skills_payload()] == ["ask-docker-expert"]
+        assert provider.search_skills_payload("docker images")[0]["name"] == "ask-docker-expert"
+        assert provider.get_skill_payload("ask-docker-expert")["category"] == "tooling"
+    finally:
+        provider.disable_live_catalog()
+
+
+def test_search_summaries_are_reused_until_the_catalog_changes(tmp_path, monkeypatch):
+    root = tmp_path / "skills"
+    _write_skill(root, "tooling", "ask-docker-expert", "Optimize Docker images.")
+    built = []
+    real_summary = provider._summary
+    monkeypatch.setattr(provider, "_summary", lambda s: built.append(s["name"]) or real_summary(s))
+    provider.enable_live_catalog(root, poll_interval=0, use_inotify=False)
+    try:
+        for _ in range(3):
+            assert provider.search_skills_payload("docker")[0]["name"] == "ask-docker-expert"
+        assert built == ["ask-docker-expert"]
+
+        _write_skill(root, "tooling", "ask-docker-expert", "Optimize Docker builds.")
+        top = provider.search_skills_payload("docker")[0]
+        assert top["description"] == "Optimize Docker builds."
+        assert built == ["ask-docker-expert"] * 2
+    finally:
+        provider.disable_live_catalog()
+
+
+def test_provider_caches_repeated_queries(tmp_path, monkeypatch):
+    root = tmp_path / "skills"
+    skill_dir = _write_skill(root, "tooling", "ask-docker-expert", "Optimize Docker images.")
+    (skill_dir / "SKILL.md").write_text("Use multi-stage builds.", encoding="utf-8")
+    provider.enable_live_catalog(root, poll_interval=0, use_inotify=False)
+    try:
+        real_search, real_readme = provider._search, provider.get_skill_readme
+        first = provider.search_skills_payload("Docker images")
+        monkeypatch.setattr(provider, "_search", lambda *a: pytest.fail("re-scored"))
+        assert provider.search_skills_payload("  docker IMAGES! ") == first
+        assert provider.get_skill_payload("ask-docker-expert")["content"] == "Use multi-stage builds."
+        monkeypatch.setattr(provider, "get_skill_readme", lambda s: pytest.fail("disk read"))
+        assert provider.get_skill_payload("ask-docker-expert")["content"] == "Use multi-stage builds."
+
+        stats = provider.cache_stats_payload()
+        assert stats["search_skills"]["hits"] == 1 and stats["search_skills"]["misses"] == 1
+        assert stats["get_skill"]["hits"] == 1 and stats["get_skill"]["misses"] == 1
+
+        # Editing the body changes the skill's fingerprint: a miss, fresh content.
+        monkeypatch.setattr(provider, "_search", real_search)
+        monkeypatch.setattr(provider, "get_skill_readme", real_readme)
+        (skill_dir / "SKILL.md").write_text("Use distroless images.", encoding="utf-8")
+        assert provider.get_skill_payload("ask-docker-expert")["content"] == "Use distroless images."
+    finally:
+        provider.disable_live_catalog()
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = provider._LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats() == {"size": 2, "maxsize": 2, "hits": 3, "misses": 1}
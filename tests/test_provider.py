@@ -57,6 +57,12 @@ def test_search_ranks_relevant_skill_first(fake_skills):
     assert results[0]["score"] > 0
 
 
+@pytest.mark.parametrize("scorer", ["bm25", "trigram"])
+def test_search_with_alternative_scorer(fake_skills, scorer):
+    results = provider.search_skills_payload("optimize my dockerfile build", scorer=scorer)
+    assert results[0]["name"] == "ask-docker-expert"
+
+
 def test_search_respects_limit(fake_skills):
     results = provider.search_skills_payload("fastapi pydantic async", limit=1)
     assert len(results) <= 1
@@ -87,3 +87,253 @@ def test_get_skill_readme(tmp_skills_dir):
     skill2 = get_skill("s2")
     content2 = get_skill_readme(skill2)
     assert content2 == "# S2 Instructions"
+
+def _age(*paths):
+    """Backdate files past the racy-timestamp window so they are cacheable."""
+    import os
+    import time
+    past = time.time() - 60
+    for p in paths:
+        os.utime(p, (past, past))
+
+def test_get_all_skills_uses_catalog_cache(tmp_skills_dir, monkeypatch):
+    """Unchanged skills are served from the catalog cache without re-parsing."""
+    from ask.utils import skill_registry
+    
+    skill_dir = tmp_skills_dir / "coding" / "cached-skill"
+    skill_dir.mkdir(parents=True)
+    (skill_dir / "skill.yaml").write_text("name: cached-skill\nversion: 1.0.0", encoding="utf-8")
+    (skill_dir / "SKILL.md").write_text("---\ntriggers: [cache me]\n---\nBody", encoding="utf-8")
+    _age(skill_dir / "skill.yaml", skill_dir / "SKILL.md", skill_dir)
+    
+    first = get_all_skills()
+    
+    calls = []
+    real_load = skill_registry._load_skill_dir
+    monkeypatch.setattr(
+        skill_registry, "_load_skill_dir", lambda d: calls.append(d) or real_load(d)
+    )
+    second = get_all_skills()
+    assert second == first
+    assert second[0]["triggers"] == ["cache me"]
+    assert calls == []
+
+def test_catalog_cache_invalidates_edited_skill(tmp_skills_dir):
+    """Editing skill.yaml must be picked up on the next scan."""
+    skill_dir = tmp_skills_dir / "coding" / "edited-skill"
+    skill_dir.mkdir(parents=True)
+    skill_yaml = skill_dir / "skill.yaml"
+    skill_yaml.write_text("name: edited-skill\nversion: 1.0.0", encoding="utf-8")
+    _age(skill_yaml, skill_dir)
+    assert get_all_skills()[0]["version"] == "1.0.0"
+    
+    skill_yaml.write_text("name: edited-skill\nversion: 1.0.1", encoding="utf-8")
+    assert get_all_skills()[0]["version"] == "1.0.1"
+    
+    # A new sidecar bumps the directory mtime and is detected too.
+    (skill_dir / "reference.md").write_text("ref", encoding="utf-8")
+    assert get_all_skills()[0]["_reference"] == str(skill_dir / "reference.md")
+
+def test_catalog_cache_can_be_disabled(tmp_skills_dir, isolated_cache_dir, monkeypatch):
+    skill_dir = tmp_skills_dir / "coding" / "plain-skill"
+    skill_dir.mkdir(parents=True)
+    (skill_dir / "skill.yaml").write_text("name: plain-skill", encoding="utf-8")
+    _age(skill_dir / "skill.yaml", skill_dir)
+    
+    monkeypatch.setenv("ASK_NO_CACHE", "1")
+    assert get_all_skills()[0]["name"] == "plain-skill"
+    assert not (isolated_cache_dir / "catalog").exists()
+
+def test_parallel_discovery_matches_serial_order(tmp_skills_dir, monkeypatch):
+    """Thread/process pool discovery must return exactly the serial result."""
+    from ask.utils import skill_registry
+    
+    for cat in ("alpha", "beta", "gamma"):
+        for i in range(6):
+            d = tmp_skills_dir / cat / f"{cat}-skill-{i}"
+            d.mkdir(parents=True)
+            (d / "skill.yaml").write_text(f"name: {cat}-skill-{i}\nversion: 1.0.{i}", encoding="utf-8")
+            (d / "SKILL.md").write_text(f"---\ntriggers: [{cat} {i}]\n---\n", encoding="utf-8")
+    
+    serial = get_all_skills(use_cache=False, workers=1)
+    
+    monkeypatch.setattr(skill_registry, "PARALLEL_MIN_SKILLS", 2)
+    monkeypatch.setattr(skill_registry, "PARALLEL_MIN_CATEGORIES", 2)
+    monkeypatch.setattr(skill_registry, "PROCESS_POOL_MIN_SKILLS", 4)
+    parallel = get_all_skills(use_cache=False, workers=4)
+    
+    assert len(serial) == 18
+    assert parallel == serial
+
+def test_workers_read_from_config(tmp_path, monkeypatch):
+    from ask.utils import config, skill_registry
+    
+    cfg = tmp_path / ".askconfig.yaml"
+    cfg.write_text("registry:\n  workers: 3\n", encoding="utf-8")
+    monkeypatch.setattr(config, "CONFIG_PATH", cfg)
+    assert skill_registry._resolve_workers(None) == 3
+    assert skill_registry._resolve_workers(1) == 1
+
+def test_sidecars_detected_from_single_listing(tmp_skills_dir):
+    """Sidecar flags come from one scandir; flat (category-less) skills work too."""
+    flat = tmp_skills_dir / "flat-skill"
+    flat.mkdir()
+    (flat / "skill.yaml").write_text("name: flat-skill", encoding="utf-8")
+    (flat / "README.md").write_text("# Flat", encoding="utf-8")
+    (flat / "examples.md").write_text("ex", encoding="utf-8")
+    (flat / "scripts").mkdir()
+    
+    nested = tmp_skills_dir / "coding" / "nested-skill"
+    nested.mkdir(parents=True)
+    (nested / "skill.yaml").write_text("name: nested-skill", encoding="utf-8")
+    (nested / "scripts").write_text("not a directory", encoding="utf-8")
+    (tmp_skills_dir / "coding" / ".hidden").mkdir()
+    
+    by_name = {s["name"]: s for s in get_all_skills()}
+    assert set(by_name) == {"flat-skill", "nested-skill"}
+    assert by_name["flat-skill"]["_instruction_file"] == str(flat / "README.md")
+    assert by_name["flat-skill"]["_examples"] == str(flat / "examples.md")
+    assert by_name["flat-skill"]["_scripts"] == str(flat / "scripts")
+    assert "_scripts" not in by_name["nested-skill"]
+    assert "_instruction_file" not in by_name["nested-skill"]
+
+def test_get_skill_uses_name_index(tmp_skills_dir, monkeypatch):
+    """Once indexed, get_skill parses only the requested skill."""
+    from ask.utils import skill_registry
+    
+    for name in ("idx-a", "idx-b"):
+        d = tmp_skills_dir / "coding" / name
+        d.mkdir(parents=True)
+        (d / "skill.yaml").write_text(f"name: {name}", encoding="utf-8")
+    get_all_skills()
+    
+    # A fresh process only has the persisted copy of the index.
+    monkeypatch.setattr(skill_registry, "_NAME_INDEX", {})
+    
+    def no_full_scan(*a, **k):
+        raise AssertionError("get_skill fell back to a full scan")
+    
+    monkeypatch.setattr(skill_registry, "get_all_skills", no_full_scan)
+    skill = get_skill("idx-b")
+    assert skill["_path"] == str(tmp_skills_dir / "coding" / "idx-b")
+
+def test_unchanged_name_index_is_not_rewritten(tmp_skills_dir, monkeypatch):
+    """A fresh process re-saves the name index only when it changed."""
+    from ask.utils import skill_registry
+    
+    d = tmp_skills_dir / "coding" / "idx-a"
+    d.mkdir(parents=True)
+    (d / "skill.yaml").write_text("name: idx-a", encoding="utf-8")
+    get_all_skills()
+    
+    saves = []
+    monkeypatch.setattr(skill_registry, "_NAME_INDEX", {})
+    monkeypatch.setattr(skill_registry, "save_name_index", lambda *a: saves.append(a))
+    get_all_skills()
+    assert saves == []
+    
+    (d.parent / "idx-b").mkdir()
+    (d.parent / "idx-b" / "skill.yaml").write_text("name: idx-b", encoding="utf-8")
+    get_all_skills()
+    assert len(saves) == 1
+
+def test_uncached_scan_does_not_write_name_index(tmp_skills_dir, monkeypatch):
+    from ask.utils import skill_registry
+    
+    d = tmp_skills_dir / "coding" / "idx-a"
+    d.mkdir(parents=True)
+    (d / "skill.yaml").write_text("name: idx-a", encoding="utf-8")
+    saves = []
+    monkeypatch.setattr(skill_registry, "_NAME_INDEX", {})
+    monkeypatch.setattr(skill_registry, "save_name_index", lambda *a: saves.append(a))
+    get_all_skills(use_cache=False)
+    assert saves == []
+    assert skill_registry._NAME_INDEX[str(tmp_skills_dir)] == {}
+
+def test_unknown_name_does_not_rescan_until_tree_changes(tmp_skills_dir, monkeypatch):
+    from ask.utils import skill_registry
+    
+    d = tmp_skills_dir / "coding" / "idx-a"
+    d.mkdir(parents=True)
+    (d / "skill.yaml").write_text("name: idx-a", encoding="utf-8")
+    monkeypatch.setattr(skill_registry, "_MISSED_NAMES", {})
+    assert get_skill("missing") is None
+    
+    scans = []
+    real_scan = skill_registry.get_all_skills
+    monkeypatch.setattr(
+        skill_registry, "get_all_skills", lambda *a, **k: scans.append(1) or real_scan(*a, **k)
+    )
+    assert get_skill("missing") is None
+    assert scans == []
+    
+    # A new skill directory is seen...
+    (d.parent / "missing").mkdir()
+    (d.parent / "missing" / "skill.yaml").write_text("name: missing", encoding="utf-8")
+    assert get_skill("missing")["_path"] == str(d.parent / "missing")
+    assert get_skill("other") is None
+    assert len(scans) == 2
+    
+    # ...and so is a skill renamed in place.
+    (d / "skill.yaml").write_text("name: other", encoding="utf-8")
+    assert get_skill("other")["_path"] == str(d)
+
+def test_get_skill_recovers_from_stale_index(tmp_skills_dir):
+    d = tmp_skills_dir / "coding" / "old-name"
+    d.mkdir(parents=True)
+    (d / "skill.yaml").write_text("name: old-name", encoding="utf-8")
+    assert get_skill("old-name") is not None
+    
+    (d / "skill.yaml").write_text("name: new-name", encoding="utf-8")
+    assert get_skill("old-name") is None
+    assert get_skill("new-name")["_path"] == str(d)
+
+def test_read_frontmatter_stops_at_closing_fence(tmp_path):
+    from ask.utils.frontmatter import read_frontmatter
+    
+    md = tmp_path / "SKILL.md"
+    md.write_text("---\nname: x\ntriggers: [a, b]\n---\n# Body\n", encoding="utf-8")
+    header = read_frontmatter(md)
+    assert header.data == {"name": "x", "triggers": ["a", "b"]}
+    assert header.read_body() == "# Body\n"
+    
+    unterminated = tmp_path / "open.md"
+    unterminated.write_text("---\nname: x\n" + "filler: y\n" * 10000, encoding="utf-8")
+    assert read_frontmatter(unterminated) is None
+    
+    plain = tmp_path / "plain.md"
+    plain.write_text("# Just markdown\n", encoding="utf-8")
+    assert read_frontmatter(plain) is None
+
+def test_skill_record_is_dict_compatible():
+    import pickle
+    from ask.utils.skill_record import Skill
+    
+    data = {"name": "rec", "agents": ["claude"], "custom": 1, "_path": "/x/rec"}
+    skill = Skill.from_dict(data)
+    
+    assert skill == data
+    assert {**skill} == data
+    assert skill.name == "rec" and skill.path == "/x/rec"
+    assert skill.get("description", "") == ""
+    assert "_scripts" not in skill and "custom" in skill
+    assert pickle.loads(pickle.dumps(skill)) == data
+    assert not hasattr(skill, "__dict__")
+    
+    other = Skill.from_dict({"name": "other", "agents": ["clau" + "de"]})
+    assert other["agents"][0] is skill["agents"][0]  # interned
+    
+    del skill["custom"]
+    skill["_scripts"] = "/x/rec/scripts"
+    assert set(skill) == {"name", "agents", "_path", "_scripts"}
+    assert Skill.from_dict(["not", "a", "mapping"]) is None
+
+def test_get_all_skills_returns_skill_records(tmp_skills_dir):
+    from ask.utils.skill_record import Skill
+    
+    d = tmp_skills_dir / "coding" / "rec-skill"
+    d.mkdir(parents=True)
+    (d / "skill.yaml").write_text("name: rec-skill\nagents: [claude]", encoding="utf-8")
+    skill = get_all_skills()[0]
+    assert isinstance(skill, Skill)
+    assert skill.path == str(d)
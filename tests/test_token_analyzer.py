@@ -5,7 +5,9 @@ from pathlib import Path
 
 from ask.utils.token_analyzer import (
     count_tokens,
+    count_tokens_batch,
     analyze_skill,
+    analyze_skills,
     _check_schema_compliance,
     lint_skill,
     generate_report,
@@ -32,6 +34,300 @@ class TestCountTokens:
         assert long > short
 
 
+class TestEncoderLoading:
+    """Tests for the lazily loaded tiktoken encoder."""
+
+    def test_import_does_not_load_tiktoken(self):
+        """Importing the module must not import tiktoken or load BPE ranks."""
+        import subprocess
+        import sys
+
+        code = "import sys, ask.utils.token_analyzer; print('tiktoken' in sys.modules)"
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+        assert out.stdout.strip() == "False"
+
+    def test_loaded_once_from_configured_vocab_dir(self, tmp_path, monkeypatch):
+        """The encoder is loaded on first use only, from the configured dir."""
+        from ask.utils import token_analyzer
+
+        calls = []
+        monkeypatch.setattr(token_analyzer, "_load_encoder", lambda d: calls.append(d))
+        token_analyzer.set_vocab_dir(tmp_path)
+        try:
+            assert calls == []
+            assert count_tokens("12345678") == 2  # estimate fallback
+            assert count_tokens("1234") == 1
+            assert calls == [str(tmp_path)]
+        finally:
+            token_analyzer.set_vocab_dir(None)
+
+    def test_vocab_dir_from_env(self, tmp_path, monkeypatch):
+        from ask.utils import token_analyzer
+
+        monkeypatch.setenv("ASK_TIKTOKEN_CACHE_DIR", str(tmp_path))
+        assert token_analyzer._resolve_vocab_dir() == str(tmp_path)
+
+    def test_vocab_dir_does_not_touch_environment(self, tmp_path, monkeypatch):
+        import os
+
+        from ask.utils import token_analyzer
+
+        monkeypatch.delenv("TIKTOKEN_CACHE_DIR", raising=False)
+        assert token_analyzer._load_encoder(str(tmp_path / "missing")) is None
+        assert "TIKTOKEN_CACHE_DIR" not in os.environ
+
+    def test_encoding_built_from_each_vocab_dir(self, tmp_path, monkeypatch):
+        """Every directory yields its own encoding (no process-wide memo)."""
+        import base64
+        import hashlib
+
+        pytest.importorskip("tiktoken")
+        from ask.utils import token_analyzer
+
+        def write_ranks(directory, merge):
+            ranks = [bytes([b]) for b in range(256)] + [merge]
+            data = b"".join(
+                base64.b64encode(tok) + b" %d\n" % rank for rank, tok in enumerate(ranks)
+            )
+            directory.mkdir()
+            (directory / "cl100k_base.tiktoken").write_bytes(data)
+            return hashlib.sha256(data).hexdigest()
+
+        with_ab = write_ranks(tmp_path / "ab", b"ab")
+        with_cd = write_ranks(tmp_path / "cd", b"cd")
+        monkeypatch.setattr(token_analyzer, "_CL100K_SHA256", with_ab)
+        assert len(token_analyzer._load_encoder(str(tmp_path / "ab")).encode("ab")) == 1
+        # A ranks file that fails the checksum is not used.
+        assert token_analyzer._load_encoder(str(tmp_path / "cd")) is None
+        monkeypatch.setattr(token_analyzer, "_CL100K_SHA256", with_cd)
+        encoder = token_analyzer._load_encoder(str(tmp_path / "cd"))
+        assert len(encoder.encode("ab")) == 2
+        assert len(encoder.encode("cd")) == 1
+
+    def test_cl100k_definition_matches_tiktoken(self, monkeypatch):
+        """The copied cl100k_base constants still match tiktoken's own."""
+        openai_public = pytest.importorskip("tiktoken_ext.openai_public")
+        from ask.utils import token_analyzer
+
+        loads = []
+        monkeypatch.setattr(
+            openai_public,
+            "load_tiktoken_bpe",
+            lambda url, expected_hash=None: loads.append((url, expected_hash)) or {},
+        )
+        spec = openai_public.cl100k_base()
+        assert loads == [(token_analyzer._CL100K_URL, token_analyzer._CL100K_SHA256)]
+        assert spec["pat_str"] == token_analyzer._CL100K_PATTERN
+        assert spec["special_tokens"] == token_analyzer._CL100K_SPECIAL_TOKENS
+
+    def test_unusable_vocab_dir_is_reported(self, tmp_path, monkeypatch):
+        pytest.importorskip("tiktoken")
+        from ask.utils import token_analyzer
+
+        monkeypatch.delenv("ASK_TIKTOKEN_CACHE_DIR", raising=False)
+        monkeypatch.setattr(token_analyzer, "get_config_value", lambda key: None)
+        monkeypatch.setattr(token_analyzer, "_load_encoder", lambda d: None if d else object())
+        try:
+            token_analyzer.set_vocab_dir(None)
+            assert token_analyzer.vocab_dir_problem() is None
+            token_analyzer.set_vocab_dir(tmp_path / "missing")
+            assert "does not exist" in token_analyzer.vocab_dir_problem()
+            token_analyzer.set_vocab_dir(tmp_path)
+            assert "ranks file" in token_analyzer.vocab_dir_problem()
+        finally:
+            token_analyzer.set_vocab_dir(None)
+
+
+class _CountingEncoder:
+    def __init__(self):
+        self.calls = 0
+        self.batches = []
+
+    def encode(self, text):
+        self.calls += 1
+        return text.split()
+
+    def encode_batch(self, texts, num_threads=8):
+        self.calls += len(texts)
+        self.batches.append((len(texts), num_threads))
+        return [text.split() for text in texts]
+
+
+@pytest.fixture
+def encoder(monkeypatch):
+    """Install a `_CountingEncoder` as the process-wide encoder."""
+    from ask.utils import token_analyzer
+
+    fake = _CountingEncoder()
+    monkeypatch.setattr(token_analyzer, "_encoder", fake)
+    return fake
+
+
+class TestTokenCountCache:
+    """Tests for the persistent, content-hash keyed token count cache."""
+
+    def _skill(self, root, text):
+        skill_dir = root / "coding" / "some-skill"
+        skill_dir.mkdir(parents=True, exist_ok=True)
+        (skill_dir / "SKILL.md").write_text(text)
+        return skill_dir / "SKILL.md"
+
+    def test_unchanged_skill_not_retokenized_across_runs(self, tmp_path, encoder):
+        skill_md = self._skill(tmp_path, "<critical_constraints>a b c</critical_constraints>")
+
+        _, first = generate_report(tmp_path)
+        assert encoder.calls == 1
+        # A later lint (new process, same cache dir) reuses the stored count.
+        lint_skill(skill_md)
+        _, second = generate_report(tmp_path)
+        assert encoder.calls == 1
+        assert second["total_tokens"] == first["total_tokens"] == 3
+
+    def test_changed_content_is_retokenized(self, tmp_path, encoder):
+        skill_md = self._skill(tmp_path, "one two")
+        lint_skill(skill_md)
+        skill_md.write_text("one two three")
+        lint_skill(skill_md)
+        assert encoder.calls == 2
+        assert analyze_skill(skill_md)["tokens"] == 3
+
+    def test_counts_outside_a_block_are_not_cached(self, encoder):
+        count_tokens("a b")
+        count_tokens("a b")
+        assert encoder.calls == 2
+
+    def test_disabled_by_env(self, tmp_path, encoder, monkeypatch):
+        monkeypatch.setenv("ASK_NO_CACHE", "1")
+        skill_md = self._skill(tmp_path, "one two")
+        lint_skill(skill_md)
+        lint_skill(skill_md)
+        assert encoder.calls == 2
+
+    def test_fallback_estimate_is_not_cached(self, tmp_path, monkeypatch):
+        from ask.utils import token_analyzer
+        from ask.utils.cache import TokenCountCache
+
+        monkeypatch.setattr(token_analyzer, "_encoder", None)
+        with token_analyzer.shared_token_cache() as cache:
+            assert count_tokens("12345678") == 2
+        assert cache.entries == {}
+        assert not TokenCountCache().path.exists()
+
+
+class TestBatchAnalysis:
+    """Tests for the batched report pipeline."""
+
+    def _library(self, root, n):
+        paths = []
+        for i in range(n):
+            skill_dir = root / "coding" / f"skill-{i}"
+            skill_dir.mkdir(parents=True)
+            text = "<critical_constraints>x</critical_constraints>\n" + "word " * (i * 200)
+            if i % 2:
+                text += "\nPlease be brief."
+            (skill_dir / "SKILL.md").write_text(text)
+            paths.append(skill_dir / "SKILL.md")
+        return paths
+
+    def test_one_encode_batch_for_uncached_texts(self, tmp_path, encoder):
+        from ask.utils.token_analyzer import shared_token_cache
+
+        with shared_token_cache():
+            assert count_tokens_batch(["a b", "c", "a b"], workers=3) == [2, 1, 2]
+            assert encoder.batches == [(3, 3)]
+            assert count_tokens_batch(["a b", "d e f"]) == [2, 3]
+        assert encoder.batches == [(3, 3), (1, 1)]
+
+    def test_fallback_estimate(self, monkeypatch):
+        from ask.utils import token_analyzer
+
+        monkeypatch.setattr(token_analyzer, "_encoder", None)
+        assert count_tokens_batch(["12345678", ""]) == [2, 0]
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_matches_analyze_skill(self, tmp_path, encoder, monkeypatch, workers):
+        from ask.utils import token_analyzer
+
+        # Exercise the process pool for schema checks even on a tiny library.
+        monkeypatch.setattr(token_analyzer, "PARALLEL_MIN_SKILLS", 1)
+        paths = self._library(tmp_path, 5)
+        missing = tmp_path / "coding" / "gone" / "SKILL.md"
+        batch = analyze_skills(paths + [missing], workers=workers)
+        assert batch[:-1] == [analyze_skill(p) for p in paths]
+        assert batch[-1] == analyze_skill(missing)
+        assert [a["status"] for a in batch[:-1]] == ["ok", "ok", "ok", "warning", "error"]
+
+    def test_report_independent_of_workers(self, tmp_path, encoder):
+        self._library(tmp_path, 4)
+        serial = generate_report(tmp_path)
+        assert generate_report(tmp_path, workers=4) == serial
+
+
+class TestSectionBudget:
+    """Tests for the section-level token budget."""
+
+    SKILL = (
+        "---\n"
+        "name: demo\n"
+        "---\n"
+        "\n"
+        "<critical_constraints>\n"
+        "# not a section inside a tag\n"
+        "</critical_constraints>\n"
+        "\n"
+        "# Usage\n"
+        "Run it.\n"
+        "```bash\n"
+        "# a comment, not a heading\n"
+        "```\n"
+        "After the code.\n"
+        "## Notes\n"
+        "Done.\n"
+    )
+
+    def test_chunks(self):
+        from ask.utils.section_budget import iter_chunks
+
+        chunks = [(kind, title, line) for kind, title, line, _ in iter_chunks(self.SKILL.splitlines(True))]
+        assert chunks == [
+            ("frontmatter", "frontmatter", 1),
+            ("section", "<critical_constraints>", 5),
+            ("section", "# Usage", 9),
+            ("code", "bash", 11),
+            ("section", "# Usage", 14),
+            ("section", "## Notes", 15),
+        ]
+        text = "".join(chunk[3] for chunk in iter_chunks(self.SKILL.splitlines(True)))
+        assert text == self.SKILL.replace("\n\n", "\n")
+
+    def test_prefix_cost_and_status(self, encoder):
+        from ask.utils.section_budget import iter_section_budget
+
+        lines = ["# A\n", "w " * 3 + "\n", "# B\n", "w " * 3 + "\n", "# C\n", "w " * 3 + "\n"]
+        sections = list(iter_section_budget(lines, limits=(5, 9)))
+        assert [s.tokens for s in sections] == [5, 5, 5]
+        assert [s.cumulative for s in sections] == [5, 10, 15]
+        assert [s.status for s in sections] == ["ok", "error", "error"]
+
+    def test_only_edited_section_is_retokenized(self, tmp_path, encoder):
+        from ask.utils.section_budget import analyze_sections
+
+        skill_dir = tmp_path / "demo"
+        skill_dir.mkdir()
+        skill_md = skill_dir / "SKILL.md"
+        skill_md.write_text(self.SKILL)
+
+        first = analyze_sections(skill_md)
+        assert encoder.calls == len(first) == 6
+        assert analyze_sections(skill_md) == first
+        assert encoder.calls == 6
+
+        skill_md.write_text(self.SKILL.replace("Done.", "Done, with more words."))
+        edited = analyze_sections(skill_md)
+        assert encoder.calls == 7
+        assert edited[-1].tokens == first[-1].tokens + 3
+
+
 class TestSchemaCompliance:
     """Tests for _check_schema_compliance function."""
     
@@ -70,6 +366,131 @@ class TestSchemaCompliance:
             issues = _check_schema_compliance(content)
             assert len(issues) > 0, f"Should flag: {phrase}"
 
+    def test_reports_first_occurrence_position(self):
+        """Language issues carry the line/column of their first occurrence."""
+        content = "<critical_constraints>x</critical_constraints>\nDo it.\n  PLEASE run; please stop"
+        messages = [msg for _, msg in _check_schema_compliance(content)]
+        assert messages == ["Contains 'please' - remove polite language (line 3, col 3)"]
+
+    def test_long_paragraph_position_and_fences(self):
+        """Only the first long paragraph outside a code fence is reported."""
+        fenced = "```\na. b. c. d.\n```"
+        content = f"<critical_constraints>x</critical_constraints>\n\n{fenced}\n\n  One. Two. Three. Four."
+        issues = _check_schema_compliance(content)
+        assert issues == [
+            ("warning", "Contains paragraph with >3 sentences - consider breaking up (line 7, col 3)")
+        ]
+
+
+class TestLintRules:
+    """Tests for the single-pass scanner and configurable rules."""
+
+    @pytest.fixture(autouse=True)
+    def fresh_scanner(self):
+        from ask.utils.lint_rules import reset_schema_scanner
+
+        reset_schema_scanner()
+        yield
+        reset_schema_scanner()
+
+    def test_rules_reported_in_rule_order(self):
+        from ask.utils.lint_rules import VERBOSE_RULES, SchemaScanner
+
+        scanner = SchemaScanner(VERBOSE_RULES)
+        issues = scanner.scan("Consider using X.\nYou should. We recommend it, please")
+        assert [i.message.split(" - ")[0] for i in issues] == [
+            "Contains 'please'",
+            "Contains 'we recommend'",
+            "Contains 'you should'",
+            "Contains 'consider using'",
+        ]
+        assert [(i.line, i.col) for i in issues] == [(2, 30), (2, 13), (2, 1), (1, 1)]
+
+    def test_whole_words_only(self):
+        from ask.utils.lint_rules import VERBOSE_RULES, SchemaScanner
+
+        assert SchemaScanner(VERBOSE_RULES).scan("pleased to help; you shoulder it") == []
+
+    def test_configured_rules(self, monkeypatch):
+        from ask.utils import lint_rules
+
+        configured = [
+            {"pattern": r"\bsimply\b", "message": "Contains 'simply'", "severity": "warning"},
+            {"pattern": r"etc\.$", "message": "Trailing 'etc.'"},
+            {"pattern": "(unclosed", "message": "ignored: does not compile"},
+            {"pattern": "no message"},
+            "not a mapping",
+        ]
+        monkeypatch.setattr(
+            lint_rules, "get_config_value", lambda key: configured if key == "lint.rules" else None
+        )
+        content = "<critical_constraints>x</critical_constraints>\nSimply run it, etc."
+        assert _check_schema_compliance(content) == [
+            ("warning", "Contains 'simply' (line 2, col 1)"),
+            ("critical", "Trailing 'etc.' (line 2, col 16)"),
+        ]
+
+    def test_overlapping_rules_are_all_reported(self):
+        from ask.utils.lint_rules import VERBOSE_RULES, LintRule, SchemaScanner
+
+        scanner = SchemaScanner(
+            VERBOSE_RULES
+            + (
+                LintRule(r"\bplease note\b", "same start as 'please'"),
+                LintRule(r"should consider", "inside 'you should'"),
+            )
+        )
+        issues = scanner.scan("Please note. You should consider X.")
+        assert [(i.message, i.col) for i in issues if not i.message.startswith("Contains")] == [
+            ("same start as 'please'", 1),
+            ("inside 'you should'", 18),
+        ]
+
+    def test_rules_that_break_the_alternation_are_dropped(self, monkeypatch):
+        from ask.utils import lint_rules
+
+        configured = [
+            {"pattern": r"(?P<w>\w+) (?P=w)", "message": "own named group"},
+            {"pattern": "(?P<w>foo)", "message": "same group name"},
+            {"pattern": "foo)|(bar", "message": "escapes its group"},
+            {"pattern": r"\b(\w+) \1\b", "message": "numbered backreference"},
+            {"pattern": "(?i)foo", "message": "global flag mid-pattern"},
+            {"pattern": "foo(?s)", "message": "trailing global flag"},
+            {"pattern": "(?x) b a r", "message": "verbose flag"},
+            {"pattern": r"\bbar\b", "message": "kept"},
+        ]
+        monkeypatch.setattr(
+            lint_rules, "get_config_value", lambda key: configured if key == "lint.rules" else None
+        )
+        scanner = lint_rules.get_schema_scanner()
+        assert [r.message for r in scanner.rules[len(lint_rules.VERBOSE_RULES):]] == ["kept"]
+        assert [i.message for i in scanner.scan("foo foo bar")] == ["kept"]
+
+    def test_scoped_flags_are_allowed(self):
+        from ask.utils.lint_rules import _valid_pattern
+
+        assert _valid_pattern(r"(?s:foo.bar)")
+        assert _valid_pattern(r"\(\?i\)")  # escaped: a literal "(?i)"
+        assert not _valid_pattern("(?s)foo.bar")
+
+    def test_clashing_rules_do_not_crash_the_build(self, monkeypatch):
+        from ask.utils import lint_rules
+
+        # Each is valid alone, but both define a group named "r0" in place.
+        clashing = [lint_rules.LintRule("a", "a"), lint_rules.LintRule("b", "b")]
+        monkeypatch.setattr(lint_rules, "config_rules", lambda: clashing)
+        real = lint_rules.SchemaScanner
+
+        def fragile(rules):
+            rules = list(rules)
+            if len([r for r in rules if r.pattern in ("a", "b")]) > 1:
+                raise lint_rules.re.error("redefinition of group name")
+            return real(rules)
+
+        monkeypatch.setattr(lint_rules, "SchemaScanner", fragile)
+        scanner = lint_rules.get_schema_scanner()
+        assert [r.message for r in scanner.rules[len(lint_rules.VERBOSE_RULES):]] == ["a"]
+
 
 class TestAnalyzeSkill:
     """Tests for analyze_skill function."""
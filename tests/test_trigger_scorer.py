@@ -1,5 +1,7 @@
 """Tests for the offline trigger/collision audit (Layer 1 of `ask test`)."""
 
+import math
+
 import pytest
 
 from ask.utils.eval.trigger_scorer import (
@@ -103,3 +105,543 @@ def test_buckets_partition_results(monkeypatch, skills):
 
 def test_default_margin_is_sane():
     assert 0 < DEFAULT_COLLISION_MARGIN < 1
+
+
+def _assert_same_ranking(got, expected):
+    # Token ids depend on insertion history, so sums may differ in the last ulp.
+    assert [n for n, _ in got] == [n for n, _ in expected]
+    assert [s for _, s in got] == pytest.approx([s for _, s in expected])
+
+
+def test_incremental_updates_match_full_rebuild(skills):
+    index = build_index(skills[:1])
+    index.add(skills[1])
+    index.add(skills[2])
+    prompt = "fix a broken laravel docker container build"
+    _assert_same_ranking(index.score(prompt), build_index(skills).score(prompt))
+
+    edited = {**skills[2], "description": "Harden Laravel deployments in Docker."}
+    index.update(edited)
+    expected = build_index([skills[0], skills[1], edited])
+    _assert_same_ranking(index.score(prompt), expected.score(prompt))
+    assert index.idf == pytest.approx(expected.idf)
+
+    assert index.remove("laravel-mechanic")
+    assert not index.remove("laravel-mechanic")
+    expected = build_index([skills[0], edited])
+    _assert_same_ranking(index.score(prompt), expected.score(prompt))
+    vectors, expected_vectors = index.skill_vectors, expected.skill_vectors
+    assert vectors.keys() == expected_vectors.keys()
+    for name, vector in expected_vectors.items():
+        assert vectors[name] == pytest.approx(vector)
+    assert len(index) == 2
+
+
+def test_update_recomputes_only_affected_documents(skills, monkeypatch):
+    from ask.utils.eval import trigger_scorer
+
+    index = build_index(skills)
+    index._term_bounds()
+    repacked = []
+    real_packed = trigger_scorer.PackedVector
+
+    def spy(ids, weights, norm):
+        repacked.append(ids)
+        return real_packed(ids, weights, norm)
+
+    monkeypatch.setattr(trigger_scorer, "PackedVector", spy)
+    index.update({**skills[2], "triggers": ["dockerfile", "docker compose"]})
+    index.score("docker")
+    # Only the edited document; the laravel skills share no re-weighted
+    # token, so they are left alone.
+    assert len(repacked) == 1
+
+
+def test_score_top_k_matches_full_ranking(skills):
+    index = build_index(skills)
+    for prompt in ["fix laravel error", "dockerfile", "xyzzy", "laravel docker"]:
+        full = index.score(prompt)
+        for k in (0, 1, 2, 5):
+            assert index.score_top_k(prompt, k) == full[:k]
+
+
+def test_score_only_visits_matching_postings(skills):
+    index = build_index(skills)
+    dots, _norm = index._dot_products("multi-stage dockerfile")
+    assert set(dots) == {"docker-expert"}
+    ranked = dict(index.score("multi-stage dockerfile"))
+    assert ranked["laravel-architect"] == ranked["laravel-mechanic"] == 0.0
+
+
+def test_sparse_engine_matches_python_engine(monkeypatch, skills):
+    pytest.importorskip("numpy")
+    pytest.importorskip("scipy")
+    prompts = {
+        "laravel-architect": ["scaffold a new laravel api", "laravel migration"],
+        "laravel-mechanic": ["fix my broken laravel eloquent query", "zzz"],
+        "docker-expert": ["multi-stage container build for laravel"],
+    }
+    monkeypatch.setattr(
+        "ask.utils.eval.trigger_scorer.load_evals",
+        lambda skill: {"should_fire": prompts[skill["name"]]},
+    )
+    expected = run_trigger_audit(skills, engine="python").results
+    got = run_trigger_audit(skills, engine="sparse").results
+    assert len(got) == len(expected) == 5
+    for a, b in zip(expected, got):
+        assert (a.skill, a.prompt, a.top_skill, a.runner_up_skill) == (
+            b.skill, b.prompt, b.top_skill, b.runner_up_skill
+        )
+        assert b.target_score == pytest.approx(a.target_score)
+        assert b.top_score == pytest.approx(a.top_score)
+        assert [n for n, _ in b.collisions] == [n for n, _ in a.collisions]
+
+
+def test_unknown_audit_engine_rejected(skills):
+    with pytest.raises(ValueError):
+        run_trigger_audit(skills, engine="gpu")
+
+
+def test_similarity_merge_join_matches_dict_cosine(skills):
+    index = build_index(skills)
+    vectors = index.skill_vectors
+    a, b = vectors["laravel-architect"], vectors["laravel-mechanic"]
+    dot = sum(w * b[t] for t, w in a.items() if t in b)
+    norms = math.sqrt(sum(w * w for w in a.values())) * math.sqrt(sum(w * w for w in b.values()))
+    assert index.similarity("laravel-architect", "laravel-mechanic") == pytest.approx(dot / norms)
+    assert index.similarity("laravel-architect", "docker-expert") < 0.1
+    assert index.similarity("docker-expert", "docker-expert") == pytest.approx(1.0)
+
+
+def test_packed_vectors_are_sorted_by_token_id(skills):
+    for vec in build_index(skills).packed_vectors().values():
+        assert list(vec.ids) == sorted(vec.ids)
+        assert len(vec.ids) == len(vec.weights)
+
+
+def test_sharded_audit_matches_serial(monkeypatch, skills):
+    from ask.utils.eval import trigger_scorer
+
+    prompts = ["fix laravel error", "dockerfile build", "scaffold laravel", "zzz"]
+    monkeypatch.setattr(trigger_scorer, "PARALLEL_MIN_PROMPTS", 1)
+    monkeypatch.setattr(
+        trigger_scorer, "load_evals", lambda skill: {"should_fire": prompts}
+    )
+    serial = run_trigger_audit(skills, engine="python")
+    sharded = run_trigger_audit(skills, engine="python", workers=3)
+    assert sharded.results == serial.results
+    assert [(r.skill, r.prompt) for r in sharded.results] == [
+        (s["name"], p) for s in skills for p in prompts
+    ]
+
+
+def test_sharded_audit_falls_back_to_serial(monkeypatch, skills):
+    from ask.utils.eval import trigger_scorer
+
+    monkeypatch.setattr(trigger_scorer, "PARALLEL_MIN_PROMPTS", 1)
+    monkeypatch.setattr(
+        trigger_scorer, "load_evals", lambda skill: {"should_fire": ["dockerfile"]}
+    )
+
+    def no_pool(*args, **kwargs):
+        raise OSError("no semaphores in this sandbox")
+
+    monkeypatch.setattr(trigger_scorer, "ProcessPoolExecutor", no_pool)
+    report = run_trigger_audit(skills, engine="python", workers=4)
+    assert len(report.results) == 3
+
+
+@pytest.mark.parametrize("platform, forked", [("linux", True), ("darwin", False), ("win32", False)])
+def test_sharded_audit_forks_only_on_linux(monkeypatch, skills, platform, forked):
+    from ask.utils.eval import trigger_scorer
+
+    monkeypatch.setattr(trigger_scorer, "PARALLEL_MIN_PROMPTS", 1)
+    monkeypatch.setattr(
+        trigger_scorer, "load_evals", lambda skill: {"should_fire": ["dockerfile"]}
+    )
+    monkeypatch.setattr(trigger_scorer.sys, "platform", platform)
+    pools = []
+
+    def recording_pool(*args, **kwargs):
+        pools.append(kwargs)
+        raise OSError("not starting one in a test")
+
+    monkeypatch.setattr(trigger_scorer, "ProcessPoolExecutor", recording_pool)
+    run_trigger_audit(skills, engine="python", workers=2)
+    assert ("mp_context" in pools[0]) is forked
+    assert ("initializer" in pools[0]) is not forked
+
+
+def test_compiled_index_round_trips(tmp_path, skills):
+    from ask.utils.eval.index_artifact import corpus_hash, load_index, save_index
+
+    built = build_index(skills, use_artifact=False)
+    path = tmp_path / "trigger_index.bin"
+    save_index(built, path, corpus_hash(skills))
+
+    loaded = load_index(path, corpus_hash(skills))
+    assert loaded is not None
+    for prompt in ["fix laravel error", "dockerfile build", "zzz"]:
+        assert loaded.score(prompt) == built.score(prompt)
+    assert loaded.idf == built.idf
+    # A loaded index stays incrementally updatable.
+    loaded.remove("docker-expert")
+    _assert_same_ranking(loaded.score("laravel"), build_index(skills[:2], use_artifact=False).score("laravel"))
+
+
+def test_build_index_uses_artifact_only_when_hash_matches(tmp_path, skills, monkeypatch):
+    from ask.utils.eval import index_artifact
+
+    path = tmp_path / "trigger_index.bin"
+    index_artifact.save_index(
+        build_index(skills, use_artifact=False), path, index_artifact.corpus_hash(skills)
+    )
+    loads = []
+    real_decode = index_artifact._decode
+    monkeypatch.setattr(
+        index_artifact, "_decode", lambda *a: loads.append(real_decode(*a)) or loads[-1]
+    )
+
+    assert build_index(skills, artifact=path).score("docker")[0][0] == "docker-expert"
+    assert loads[-1] is not None
+
+    edited = [*skills[:2], {**skills[2], "description": "Kubernetes helm charts."}]
+    index = build_index(edited, artifact=path)
+    assert loads[-1] is None  # stale artifact ignored
+    assert index.score("helm charts")[0][0] == "docker-expert"
+
+
+def test_corrupt_artifact_falls_back_to_rebuild(tmp_path, skills):
+    from ask.utils.eval.index_artifact import corpus_hash, load_index, save_index
+
+    path = tmp_path / "trigger_index.bin"
+    save_index(build_index(skills, use_artifact=False), path, corpus_hash(skills))
+    path.write_bytes(path.read_bytes()[:200])
+    assert load_index(path, corpus_hash(skills)) is None
+    assert build_index(skills, artifact=path).score("docker")[0][0] == "docker-expert"
+
+
+@pytest.mark.parametrize("section, payload", [(3, b"7"), (10, b"\xff")])
+def test_corrupt_body_behind_valid_header_falls_back(tmp_path, skills, section, payload):
+    """A non-list names section (TypeError) or postings pointing past the
+    last skill (IndexError) read as "no artifact", not a crash."""
+    from ask.utils.eval import index_artifact
+
+    path = tmp_path / "trigger_index.bin"
+    digest = index_artifact.corpus_hash(skills)
+    index_artifact.save_index(build_index(skills, use_artifact=False), path, digest)
+    data = bytearray(path.read_bytes())
+    header = index_artifact._HEADER.size
+    reader = index_artifact._Reader(memoryview(bytes(data)), header + (-header % 8))
+    for _ in range(section):
+        reader.section()
+    start = reader.offset + 8
+    blob = reader.section()
+    # Same length, so every later section still lines up.
+    data[start:start + len(blob)] = payload * len(blob)
+    path.write_bytes(bytes(data))
+
+    assert index_artifact.load_index(path, digest) is None
+    assert build_index(skills, artifact=path).score("docker")[0][0] == "docker-expert"
+
+
+def test_evals_cache_parses_each_file_once(tmp_path, monkeypatch):
+    from ask.utils.eval import trigger_scorer
+    from ask.utils.eval.trigger_scorer import load_evals, shared_evals_cache
+
+    skill_dir = tmp_path / "alpha"
+    (skill_dir / "tests").mkdir(parents=True)
+    evals_file = skill_dir / "tests" / "evals.yaml"
+    evals_file.write_text('should_fire:\n  - "fix it"\n', encoding="utf-8")
+    skill = {"name": "alpha", "_path": str(skill_dir)}
+
+    parses = []
+    real_safe_load = trigger_scorer.safe_load
+    monkeypatch.setattr(
+        trigger_scorer, "safe_load", lambda s: parses.append(1) or real_safe_load(s)
+    )
+
+    with shared_evals_cache():
+        assert load_evals(skill) == {"should_fire": ["fix it"]}
+        assert load_evals(skill) == {"should_fire": ["fix it"]}
+    assert len(parses) == 1
+
+    # A later run hits the persisted cache.
+    with shared_evals_cache() as cache:
+        assert load_evals(skill) == {"should_fire": ["fix it"]}
+        assert cache.hits == 1
+    assert len(parses) == 1
+
+    # Changed content is a new key.
+    evals_file.write_text('should_fire:\n  - "fix it now"\n', encoding="utf-8")
+    with shared_evals_cache():
+        assert load_evals(skill) == {"should_fire": ["fix it now"]}
+    assert len(parses) == 2
+
+
+def test_evals_cache_respects_no_cache(tmp_path, monkeypatch, isolated_cache_dir):
+    from ask.utils.eval.trigger_scorer import load_evals, shared_evals_cache
+
+    monkeypatch.setenv("ASK_NO_CACHE", "1")
+    skill_dir = tmp_path / "alpha"
+    (skill_dir / "tests").mkdir(parents=True)
+    (skill_dir / "tests" / "evals.yaml").write_text("should_fire: [x]\n", encoding="utf-8")
+    with shared_evals_cache():
+        assert load_evals({"_path": str(skill_dir)}) == {"should_fire": ["x"]}
+    assert not (isolated_cache_dir / "catalog" / "evals.json").exists()
+
+
+def _git_skills_repo(tmp_path, specs):
+    """A git repo with one skill dir (evals included) per (name, description, prompts)."""
+    import subprocess
+
+    root = tmp_path / "repo"
+    skills = []
+    for name, description, prompts in specs:
+        skill_dir = root / name
+        (skill_dir / "tests").mkdir(parents=True)
+        (skill_dir / "skill.yaml").write_text(f"name: {name}\n", encoding="utf-8")
+        lines = "".join(f'  - "{p}"\n' for p in prompts)
+        (skill_dir / "tests" / "evals.yaml").write_text(f"should_fire:\n{lines}", encoding="utf-8")
+        skills.append({"name": name, "description": description, "_path": str(skill_dir)})
+
+    def git(*args):
+        subprocess.run(
+            ["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+            cwd=root, check=True, capture_output=True,
+        )
+
+    git("init", "-q")
+    git("add", ".")
+    git("commit", "-q", "-m", "skills")
+    return root, skills, git
+
+
+def test_changed_since_rescores_only_affected_prompts(tmp_path):
+    from ask.utils.eval.incremental import run_incremental_audit
+
+    root, skills, git = _git_skills_repo(
+        tmp_path,
+        [
+            ("docker-expert", "Docker containers compose images", ["build a docker image"]),
+            ("k8s-expert", "Kubernetes pods helm charts", ["deploy helm charts"]),
+            ("sql-expert", "Postgres queries indexes tuning", ["tune postgres queries"]),
+        ],
+    )
+    first = run_incremental_audit(skills, root, "HEAD")
+    assert first.full and first.reason == "no previous audit state"
+    assert first.report.results == run_trigger_audit(skills).results
+
+    # Nothing changed: everything is reused.
+    again = run_incremental_audit(skills, root, "HEAD")
+    assert not again.full and again.rescored == 0 and again.reused == 3
+
+    # Reword docker-expert with tokens no other skill or prompt uses.
+    (root / "docker-expert" / "skill.yaml").write_text("name: docker-expert\n# edited\n")
+    skills[0]["description"] = "Docker containers compose images registries"
+    outcome = run_incremental_audit(skills, root, "HEAD")
+    assert not outcome.full
+    assert outcome.changed_skills == ["docker-expert"]
+    assert outcome.rescored == 1 and outcome.reused == 2
+    assert outcome.report.results == run_trigger_audit(skills).results
+
+
+def test_changed_since_falls_back_to_full_audit_on_rename(tmp_path):
+    from ask.utils.eval.incremental import run_incremental_audit
+
+    root, skills, _ = _git_skills_repo(
+        tmp_path,
+        [("alpha", "alpha things", ["alpha things"]), ("beta", "beta stuff", ["beta stuff"])],
+    )
+    run_incremental_audit(skills, root, "HEAD")
+    skills[1]["name"] = "gamma"
+    outcome = run_incremental_audit(skills, root, "HEAD")
+    assert outcome.full and "renamed" in outcome.reason
+
+
+def test_changed_since_rejects_unknown_ref(tmp_path):
+    from ask.utils.eval.incremental import run_incremental_audit
+
+    root, skills, _ = _git_skills_repo(tmp_path, [("alpha", "alpha", ["alpha"])])
+    with pytest.raises(RuntimeError):
+        run_incremental_audit(skills, root, "no-such-branch")
+
+
+def _brute_force_pairs(index):
+    names = sorted(index.packed_vectors())
+    pairs = [
+        (index.similarity(a, b), a, b)
+        for i, a in enumerate(names)
+        for b in names[i + 1:]
+    ]
+    return sorted((p for p in pairs if p[0] > 0), key=lambda p: (-p[0], p[1], p[2]))
+
+
+def test_similarity_matrix_exact_matches_brute_force(skills):
+    from ask.utils.eval.similarity_matrix import top_similar_pairs
+
+    index = build_index(skills)
+    expected = _brute_force_pairs(index)
+    got = top_similar_pairs(index, k=10, method="exact")
+    assert [(p.a, p.b) for p in got] == [(a, b) for _, a, b in expected]
+    assert [p.score for p in got] == pytest.approx([s for s, _, _ in expected])
+    assert top_similar_pairs(index, k=1, method="exact")[0].a == expected[0][1]
+
+    docker = top_similar_pairs(index, k=10, skill="docker-expert")
+    assert all("docker-expert" in (p.a, p.b) for p in docker)
+
+
+def test_similarity_matrix_lsh_finds_near_duplicates():
+    import random
+
+    from ask.utils.eval.similarity_matrix import top_similar_pairs
+
+    rng = random.Random(3)
+    vocab = [f"w{i}" for i in range(3000)]
+    skills = [
+        {"name": f"skill-{i:04d}", "description": " ".join(rng.sample(vocab, 12))}
+        for i in range(300)
+    ]
+    # Forks from another remote with a word or two changed.
+    for i in (7, 42, 199):
+        words = skills[i]["description"].split()
+        skills.append({"name": f"fork-{i}", "description": " ".join(words[:-1] + ["forked"])})
+    index = build_index(skills, use_artifact=False)
+
+    exact = top_similar_pairs(index, k=3, method="exact")
+    lsh = top_similar_pairs(index, k=3, method="lsh")
+    assert {(p.a, p.b) for p in exact} == {
+        ("fork-7", "skill-0007"), ("fork-42", "skill-0042"), ("fork-199", "skill-0199"),
+    }
+    assert lsh == exact
+
+
+
+def test_minhash_signatures_estimate_jaccard():
+    """Independent hashes: equal signature slots track the real overlap."""
+    from ask.utils.eval.similarity_matrix import MINHASH_PERMUTATIONS, _minhash_signatures
+
+    skills = []
+    for p in range(20):
+        words = [f"p{p}w{i}" for i in range(90)]
+        skills.append({"name": f"a{p:02d}", "description": " ".join(words[:60])})
+        skills.append({"name": f"b{p:02d}", "description": " ".join(words[30:])})
+    index = build_index(skills, use_artifact=False)
+    names = sorted(index.packed_vectors())
+    signatures = dict(zip(names, _minhash_signatures(index, names)))
+
+    estimates = [
+        sum(x == y for x, y in zip(signatures[f"a{p:02d}"], signatures[f"b{p:02d}"]))
+        / MINHASH_PERMUTATIONS
+        for p in range(20)
+    ]
+    # Jaccard of each pair is 30 / 90.
+    assert sum(estimates) / len(estimates) == pytest.approx(1 / 3, abs=0.04)
+
+
+def test_similarity_matrix_lsh_skips_crowded_buckets(monkeypatch):
+    """Skills sharing only common words must not be scored pair by pair."""
+    import itertools
+
+    from ask.utils.eval import similarity_matrix
+
+    common = ["review", "python", "code", "tests"]
+    combos = list(itertools.combinations(common, 3))
+    skills = [
+        {"name": f"skill-{i:03d}", "description": " ".join(combos[i % len(combos)])}
+        for i in range(300)
+    ]
+    skills += [
+        {"name": "fork-a", "description": "kubernetes helm chart rollout canary"},
+        {"name": "fork-b", "description": "kubernetes helm chart rollout bluegreen"},
+    ]
+    index = build_index(skills, use_artifact=False)
+    scored = []
+    real = index.similarity
+    monkeypatch.setattr(index, "similarity", lambda a, b: scored.append((a, b)) or real(a, b))
+
+    top = similarity_matrix.top_similar_pairs(index, k=1, method="lsh")
+    assert [(p.a, p.b) for p in top] == [("fork-a", "fork-b")]
+    # Each of the four description groups (75 skills) exceeds LSH_MAX_BUCKET.
+    assert len(scored) < 100
+
+@pytest.mark.parametrize("scorer", ["bm25", "trigram"])
+def test_alternative_scorers_rank_relevant_skill_first(skills, scorer):
+    index = build_index(skills, scorer=scorer)
+    assert index.score("optimize my dockerfile build")[0][0] == "docker-expert"
+    assert index.score("debug broken eloquent queries")[0][0] == "laravel-mechanic"
+    top = index.score_top_k("docker container", 2)
+    assert top == index.score("docker container")[:2]
+    assert all(0.0 <= score <= 1.0 for _, score in index.score("docker container"))
+
+
+def test_trigram_scorer_tolerates_word_variants(skills):
+    tfidf = build_index(skills)
+    trigram = build_index(skills, scorer="trigram")
+    # "containerized" shares no whole word with any skill.
+    assert dict(tfidf.score("containerized"))["docker-expert"] == 0.0
+    assert trigram.score("containerized")[0][0] == "docker-expert"
+
+
+@pytest.mark.parametrize("scorer", ["bm25", "trigram"])
+def test_alternative_scorers_update_incrementally(skills, scorer):
+    index = build_index(skills[:2], scorer=scorer)
+    index.score("laravel")
+    index.add(skills[2])
+    index.remove("laravel-mechanic")
+    index.add(skills[1])
+    fresh = build_index(skills, scorer=scorer)
+    for prompt in ("docker compose", "fix laravel error", "scaffold api"):
+        _assert_same_ranking(index.score(prompt), fresh.score(prompt))
+
+
+def test_bm25_audit_uses_python_engine(monkeypatch, skills):
+    from ask.utils.eval import trigger_scorer
+
+    monkeypatch.setattr(
+        "ask.utils.eval.trigger_scorer.load_evals",
+        lambda s: {"should_fire": ["docker compose build"]} if s["name"] == "docker-expert" else None,
+    )
+    monkeypatch.setattr(trigger_scorer, "SPARSE_MIN_PROMPTS", 0)
+    report = run_trigger_audit(skills, scorer="bm25")
+    assert report.results[0].top_skill == "docker-expert"
+    with pytest.raises(ValueError):
+        run_trigger_audit(skills, scorer="bm25", engine="sparse")
+    with pytest.raises(ValueError):
+        build_index(skills, scorer="word2vec")
+
+
+@pytest.mark.parametrize("scorer", ["tfidf", "bm25", "trigram"])
+def test_score_top_k_early_termination_matches_full_ranking(scorer):
+    import random
+
+    rng = random.Random(11)
+    vocab = [f"term{i}" for i in range(400)]
+    common = ["and", "the", "with", "code"]
+    skills = [
+        {
+            "name": f"skill-{i:03d}",
+            "description": " ".join(rng.sample(vocab, 8) + rng.sample(common, 3)),
+        }
+        for i in range(300)
+    ]
+    index = build_index(skills, use_artifact=False, scorer=scorer)
+    for _ in range(40):
+        prompt = " ".join(rng.sample(vocab, 3) + rng.sample(common, 2))
+        for k in (1, 5, 20):
+            assert index.score_top_k(prompt, k) == index.score(prompt)[:k]
+
+
+def test_score_top_k_skips_common_token_postings(monkeypatch):
+    skills = [{"name": f"skill-{i:03d}", "description": f"and the code w{i}"} for i in range(200)]
+    skills.append({"name": "zebra", "description": "zebra stripes and the code"})
+    index = build_index(skills, use_artifact=False)
+    index._term_bounds()
+
+    scored = []
+    real = index._doc_divisor
+    monkeypatch.setattr(index, "_doc_divisor", lambda name: scored.append(name) or real(name))
+    assert index.score_top_k("zebra stripes and the", 1)[0][0] == "zebra"
+    # Only the skill holding the rare tokens was scored; the 200 skills in
+    # the "and"/"the" postings were ruled out by their upper bound.
+    assert scored == ["zebra"]
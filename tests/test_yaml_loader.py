@@ -0,0 +1,67 @@
+"""Tests for the fast YAML loading path used by the skill registry."""
+
+import pytest
+import yaml
+
+from ask.utils.filesystem import get_skills_dir
+from ask.utils.frontmatter import read_frontmatter
+from ask.utils.yaml_loader import _Unsupported, _parse_flat, load_flat_yaml, safe_load
+
+
+def _bundled_documents():
+    skills_dir = get_skills_dir()
+    for skill_yaml in sorted(skills_dir.rglob("skill.yaml")):
+        yield skill_yaml.read_text(encoding="utf-8")
+    for skill_md in sorted(skills_dir.rglob("SKILL.md")):
+        header = read_frontmatter(skill_md)
+        if header is not None:
+            yield header.text
+
+
+def test_bundled_documents_match_pyyaml():
+    """The fast path (with its fallbacks) must agree with yaml.safe_load on every bundled file."""
+    docs = list(_bundled_documents())
+    assert docs
+    for text in docs:
+        assert load_flat_yaml(text) == yaml.safe_load(text)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "name: x\nversion: 1.0.0\ntags:\n  - a\n  - b\n",
+        "triggers: [\"debug this\", 'it''s broken', plain words]\n",
+        "agents:\n- claude\n- gemini\nname: y\n",
+        "# comment only\nname: z\n\n",
+        "empty_list:\nname: z\n",
+        "triggers: [a, b,]\n",
+        "description: C# and F# tooling\n",
+    ],
+)
+def test_fast_path_handles_flat_subset(text):
+    assert _parse_flat(text) == yaml.safe_load(text)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "version: 1.0\n",                       # float
+        "enabled: yes\n",                       # YAML 1.1 bool
+        "released: 2024-01-01\n",               # timestamp
+        "description: >\n  folded\n  text\n",   # block scalar
+        "inputs:\n  topic:\n    required: true\n",  # nested mapping
+        "name: x # trailing comment\n",
+        "note: \"escaped \\\" quote\"\n",
+        "tags:\n  - a\n    - b\n",              # continuation, not an item
+        "anchor: &a value\n",
+    ],
+)
+def test_fast_path_defers_everything_else(text):
+    with pytest.raises(_Unsupported):
+        _parse_flat(text)
+    assert load_flat_yaml(text) == yaml.safe_load(text)
+
+
+def test_safe_load_matches_pyyaml():
+    text = "should_fire:\n  - \"a prompt\"\nnested: {a: 1}\n"
+    assert safe_load(text) == yaml.safe_load(text)